@@ -0,0 +1,50 @@
+"""Column scans of ColumnStore against walking entities and tags.
+
+    python -m benchmarks.bench_columnar [nbEntities]
+"""
+import sys
+from timeit import timeit
+
+from haystackparser.columnar import ColumnStore
+from haystackparser.kinds import Number, Ref
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+
+def walkNumbers(ontology, name, unit):
+    return [entity[name].kind.value for entity in ontology.entities
+            if name in entity and isinstance(entity[name].kind, Number)
+            and entity[name].kind.unit and entity[name].kind.unit.symbol == unit]
+
+
+def total(values):
+    # NumPy arrays sum in C, array('d') through the builtin sum
+    return values.sum() if hasattr(values, 'sum') else sum(values)
+
+
+def walkRefs(ontology, name, ref):
+    return [entity for entity in ontology.entities
+            if name in entity and entity[name].kind == ref]
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ontology = parse(trio_corpus(nbEntities), 'scanner', lazy=True)
+    # decode the scanned tags once, for both sides
+    walkNumbers(ontology, 'curVal', '°C')
+    walkRefs(ontology, 'equipRef', Ref('@equip1'))
+    print(f'{nbEntities} entities, store built in '
+          f'{timeit(lambda: ColumnStore.of(ontology), number=1):.3f} s')
+    store = ColumnStore.of(ontology)
+    for name, scan in (
+            ('curVal in °C', lambda: store['curVal'].numbers('°C')),
+            ('sum curVal', lambda: total(store['curVal'].numbers())),
+            ('equipRef == @equip1',
+             lambda: store.select('equipRef', Ref('@equip1'))),
+            ('walk curVal in °C', lambda: walkNumbers(ontology, 'curVal', '°C')),
+            ('walk equipRef == @equip1',
+             lambda: walkRefs(ontology, 'equipRef', Ref('@equip1')))):
+        elapsed = timeit(scan, number=5) / 5
+        print(f'{name:>26}: {len(scan()) if name != "sum curVal" else 1:7}'
+              f' results in {elapsed * 1000:8.2f} ms')
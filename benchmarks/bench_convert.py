@@ -0,0 +1,44 @@
+"""Unit conversion of energy readings: Number.to one by one, convert on a
+list and on a NumPy array, a Grid column of mixed kWh/MWh/BTU, then
+sorting and summing mixed unit Numbers.
+
+    python -m benchmarks.bench_convert [nbValues]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.kinds import Number
+from haystackparser.ontology import Grid
+from haystackparser.unitDb import convert
+
+
+def measure(label: str, function) -> None:
+    start = perf_counter()
+    function()
+    print(f'{label:>28}: {perf_counter() - start:7.3f} s')
+
+
+if __name__ == '__main__':
+    nbValues = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    values = [float(idx % 1000) for idx in range(nbValues)]
+    numbers = [Number(value, 'kWh') for value in values]
+    print(f'{nbValues} values')
+    measure('Number.to', lambda: [number.to('MWh') for number in numbers])
+    measure('convert list', lambda: convert(values, 'kWh', 'MWh'))
+
+    units = ('kWh', 'MWh', 'BTU')
+    mixed = [Number(value, units[idx % 3]) for idx, value in enumerate(values)]
+    sample = mixed[:200000]
+    measure(f'sorted {len(sample)} mixed', lambda: sorted(sample))
+    measure('sum mixed', lambda: sum(mixed))
+    try:
+        import numpy as np
+    except ImportError:
+        sys.exit()
+    array = np.array(values)
+    measure('convert numpy array', lambda: convert(array, 'kWh', 'MWh'))
+
+    grid = Grid()
+    grid._addColumn('energy')
+    grid._row.extend([number] for number in mixed)
+    measure('to_numpy mixed units', lambda: grid.to_numpy('energy', 'MWh'))
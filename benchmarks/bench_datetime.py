@@ -0,0 +1,58 @@
+"""Decoding of Zinc date, time and datetime tokens, dateutil against the
+fromisoformat decoders of zinc_datetime, then a timestamp heavy parse.
+
+    python -m benchmarks.bench_datetime [nbTokens]
+"""
+import sys
+from time import perf_counter
+
+import dateutil.parser as dateutil
+
+from haystackparser.trio_parser import parse
+from haystackparser.zinc_datetime import (getHaystackTz, parse_date,
+                                          parse_datetime, parse_time)
+
+
+def measure(label: str, function, tokens) -> float:
+    start = perf_counter()
+    for token in tokens:
+        function(token)
+    seconds = perf_counter() - start
+    print(f'{label:>30}: {seconds:7.3f} s')
+    return seconds
+
+
+def dateutil_datetime(text: str):
+    """decoding before zinc_datetime had its own"""
+    text, _, tz = text.partition(' ')
+    if tz:
+        return dateutil.parse(text).replace(tzinfo=getHaystackTz(tz))
+    return dateutil.parse(text)
+
+
+if __name__ == '__main__':
+    nbTokens = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dates = [f'2020-{1 + idx % 12:02d}-{1 + idx % 28:02d}'
+             for idx in range(nbTokens)]
+    times = [f'{idx % 24:02d}:{idx % 60:02d}:{idx % 60:02d}.{idx % 1000:03d}'
+             for idx in range(nbTokens)]
+    datetimes = [f'{day}T{moment}+02:00 Paris'
+                 for day, moment in zip(dates, times)]
+    offsets = [f'{day}T{moment}Z' for day, moment in zip(dates, times)]
+    print(f'{nbTokens} tokens of each kind')
+    for label, tokens, slow, fast in (
+            ('date', dates, lambda text: dateutil.parse(text).date(), parse_date),
+            ('time', times, lambda text: dateutil.parse(text).time(), parse_time),
+            ('datetime tz', datetimes, dateutil_datetime, parse_datetime),
+            ('datetime offset', offsets, dateutil_datetime, parse_datetime)):
+        before = measure(f'dateutil {label}', slow, tokens)
+        after = measure(f'zinc_datetime {label}', fast, tokens)
+        print(f'{"":>30}  {before / after:5.1f}x')
+
+    trio = ''.join(f'id: @p{idx}\nday: {day}\nat: {moment}\nts: {stamp}\n---\n'
+                   for idx, (day, moment, stamp)
+                   in enumerate(zip(dates, times, datetimes)))
+    start = perf_counter()
+    parse(trio, 'scanner')
+    print(f'{"scanner parse":>30}: {perf_counter() - start:7.3f} s'
+          f' for {nbTokens} entities of 3 timestamps')
@@ -0,0 +1,32 @@
+"""Build, tag lookup and tag update time of an Entity with a growing number
+of tags.
+
+    python -m benchmarks.bench_entity_tags
+"""
+from timeit import timeit
+
+from haystackparser.kinds import Marker, Ref
+from haystackparser.ontology import Entity, Tag
+
+if __name__ == '__main__':
+    for nbTags in (10, 100, 1000, 10000):
+        tags = [Tag(f'tag{idx}', Marker()) for idx in range(nbTags)]
+        names = [tag.name for tag in tags]
+        repeat = max(1, 100000 // nbTags)
+
+        build = timeit(lambda: Entity(Ref('@e'), tags), number=repeat)
+        myEntity = Entity(Ref('@e'), tags)
+
+        def lookup():
+            for name in names:
+                myEntity[name]
+
+        def update():
+            for tag in tags:
+                myEntity[tag.name] = tag
+
+        lookupTime = timeit(lookup, number=repeat)
+        updateTime = timeit(update, number=repeat)
+        print(f'{nbTags:>6} tags: build {build / repeat / nbTags * 1e6:5.2f} µs/tag'
+              f', lookup {lookupTime / repeat / nbTags * 1e6:5.2f} µs/tag'
+              f', update {updateTime / repeat / nbTags * 1e6:7.2f} µs/tag')
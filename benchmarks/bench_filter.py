@@ -0,0 +1,32 @@
+"""Haystack filter queries against a Python scan of the entities.
+
+    python -m benchmarks.bench_filter [nbEntities]
+"""
+import sys
+from timeit import timeit
+
+from haystackparser.haystack_filter import TagIndex, query
+from haystackparser.kinds import Ref
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+
+def scan(ontology):
+    return [entity for entity in ontology.entities
+            if 'equipRef' in entity and entity['equipRef'].kind == Ref('@equip1')]
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ontology = parse(trio_corpus(nbEntities), 'scanner')
+    print(f'{nbEntities} entities, index built in '
+          f'{timeit(lambda: TagIndex.of(ontology), number=1):.3f} s')
+    for filter in ('equipRef == @equip1', 'point and sensor and temp',
+                   'ahu and siteRef->site'):
+        elapsed = timeit(lambda: query(ontology, filter), number=10) / 10
+        print(f'{filter:>28}: {len(query(ontology, filter)):6} entities'
+              f' in {elapsed * 1000:8.3f} ms')
+    elapsed = timeit(lambda: scan(ontology), number=10) / 10
+    print(f'{"python scan equipRef==@equip1":>28}: {len(scan(ontology)):6} entities'
+          f' in {elapsed * 1000:8.3f} ms')
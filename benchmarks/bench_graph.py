@@ -0,0 +1,35 @@
+"""Site -> equip -> point navigation with RefGraph against Python scans.
+
+    python -m benchmarks.bench_graph [nbEntities]
+"""
+import sys
+from timeit import timeit
+
+from haystackparser.graph import RefGraph
+from haystackparser.kinds import Ref
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+
+def scanChildren(ontology, ref, via):
+    return [entity for entity in ontology.entities
+            if via in entity and entity[via].kind == ref]
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ontology = parse(trio_corpus(nbEntities), 'scanner')
+    print(f'{nbEntities} entities, graph built in '
+          f'{timeit(lambda: RefGraph.of(ontology), number=1):.3f} s')
+    graph = RefGraph.of(ontology)
+    equip = Ref('@equip1')
+    for name, walk in (
+            ('children equipRef', lambda: graph.children(equip, via='equipRef')),
+            ('ancestors', lambda: graph.ancestors(Ref('@point2'))),
+            ('subtree site', lambda: graph.subtree(Ref('@site'))),
+            ('python scan equipRef',
+             lambda: scanChildren(ontology, equip, 'equipRef'))):
+        elapsed = timeit(walk, number=10) / 10
+        print(f'{name:>22}: {len(walk()):6} entities'
+              f' in {elapsed * 1000:8.3f} ms')
@@ -0,0 +1,63 @@
+"""Zinc serialization of wide grids, against the former Grid implementation
+(list.index per tag, string concatenation).
+
+    python -m benchmarks.bench_grid [nbRows] [nbColumns]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.kinds import Kind, Number, Ref
+from haystackparser.ontology import Entity, Grid, Ontology, Tag
+from haystackparser.util import populateListWithNone
+
+
+class FormerGrid:
+    def __init__(self, ontology):
+        self._columns = []
+        self._row = []
+        for entity in ontology.entities:
+            if 'id' not in self._columns:
+                self._columns.append('id')
+            _row = populateListWithNone([], len(self._columns))
+            _row[self._columns.index('id')] = entity.id
+            for tag in entity.tags:
+                if tag.name not in self._columns:
+                    self._columns.append(tag.name)
+                _row = populateListWithNone(_row, len(self._columns))
+                _row[self._columns.index(tag.name)] = tag.kind
+            self._row.append(_row)
+
+    def toZinc(self):
+        _str = 'ver:"3.0"\n'
+        for col in self._columns:
+            _str += f'{col}, '
+        _str = _str[0:-2] + "\n"
+        for row in self._row:
+            for kind in row:
+                if isinstance(kind, Kind):
+                    _str += f'{kind.toZinc}, '
+                else:
+                    _str += ', '
+            _str = _str[0:-2] + "\n"
+        return _str
+
+
+if __name__ == '__main__':
+    nbRows = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    nbColumns = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    ontology = Ontology([
+        Entity(Ref(f'@row{row}'),
+               [Tag(f'tag{col}', Number(float(row + col)))
+                for col in range(nbColumns) if (row + col) % 3])
+        for row in range(nbRows)])
+    results = []
+    for gridClass in (FormerGrid, Grid):
+        start = perf_counter()
+        grid = gridClass(ontology)
+        build = perf_counter() - start
+        start = perf_counter()
+        results.append(grid.toZinc())
+        write = perf_counter() - start
+        print(f'{gridClass.__name__:>10}: {nbRows} rows x {nbColumns} columns,'
+              f' build {build:7.3f} s, toZinc {write:7.3f} s')
+    assert results[0] == results[1]
@@ -0,0 +1,47 @@
+"""Grid.to_numpy/to_arrow on a large grid, against unwrapping kind.value
+cell by cell.
+
+    python -m benchmarks.bench_grid_export [nbRows]
+"""
+import sys
+from datetime import date, timedelta
+from time import perf_counter
+
+from haystackparser.kinds import Bool, HaystackDate, Marker, Number, Ref, Str
+from haystackparser.ontology import Grid, Ontology
+
+
+def measure(name, function):
+    start = perf_counter()
+    function()
+    print(f'{name:>28}: {perf_counter() - start:7.3f} s')
+
+
+if __name__ == '__main__':
+    nbRows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # rows built directly, building an Ontology of 1M entities is slower
+    # than what is measured here
+    grid = Grid(Ontology())
+    for name in ('id', 'point', 'curVal', 'his', 'installed', 'dis', 'equipRef'):
+        grid._addColumn(name)
+    start = date(2020, 1, 1)
+    equips = [Ref(f'@equip{idx}') for idx in range(1000)]
+    names = [Str(f'Point {idx % 100}') for idx in range(100)]
+    dates = [HaystackDate(start + timedelta(days=idx)) for idx in range(365)]
+    for idx in range(nbRows):
+        grid._row.append([Ref(f'@p{idx}'), Marker(),
+                          Number(float(idx % 40), '°C'), Bool(idx % 2 == 0),
+                          dates[idx % 365], names[idx % 100], equips[idx % 1000]])
+    print(f'{nbRows} rows x {len(grid._columns)} columns')
+
+    measure('python curVal values',
+            lambda: [row[2].value if row[2] is not None else None
+                     for row in grid._row])
+    measure('to_numpy curVal', lambda: grid.to_numpy('curVal'))
+    measure('to_numpy equipRef', lambda: grid.to_numpy('equipRef'))
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print('pyarrow is not installed')
+    else:
+        measure('to_arrow', grid.to_arrow)
@@ -0,0 +1,40 @@
+"""Hayson encoding and decoding throughput in MB/s, with orjson when it is
+installed and with the json module.
+
+    python -m benchmarks.bench_hayson [nbEntities]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser import hayson
+from haystackparser.ontology import Grid, Ontology
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+
+def measure(function):
+    start = perf_counter()
+    result = function()
+    return result, perf_counter() - start
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    ontology = parse(trio_corpus(nbEntities), 'scanner')
+    grid = Grid(ontology)
+    orjson = hayson.orjson
+    for backend in ('orjson', 'json'):
+        if backend == 'orjson' and orjson is None:
+            continue
+        hayson.orjson = orjson if backend == 'orjson' else None
+        for name, encode, decode in (
+                ('ontology', ontology.to_json, Ontology.from_json),
+                ('grid', grid.to_json, Grid.from_json)):
+            text, encoding = measure(encode)
+            _, decoding = measure(lambda: decode(text))
+            size = len(text.encode('utf-8')) / 1e6
+            print(f'{backend:>6} {name:>8} ({size:5.1f} MB):'
+                  f' encode {size / encoding:6.2f} MB/s,'
+                  f' decode {size / decoding:6.2f} MB/s')
+    hayson.orjson = orjson
@@ -0,0 +1,36 @@
+"""Peak memory of iter_parse against parse for growing Trio files.
+
+    python -m benchmarks.bench_iter_parse
+"""
+import tempfile
+import tracemalloc
+
+from haystackparser.trio_parser import iter_parse, parse
+
+from .corpus import iter_trio_entities
+
+
+def peak(function) -> float:
+    tracemalloc.start()
+    function()
+    _, peakSize = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peakSize / 1e6
+
+
+if __name__ == '__main__':
+    for nbEntities in (1000, 4000, 16000):
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as trioFile:
+            trioFile.write('---\n'.join(iter_trio_entities(nbEntities)))
+
+            def streamed():
+                trioFile.seek(0)
+                for entity in iter_parse(trioFile, 'scanner'):
+                    pass
+
+            def whole():
+                trioFile.seek(0)
+                parse(trioFile.read(), 'scanner')
+
+            print(f'{nbEntities:>6} entities: iter_parse {peak(streamed):6.2f} MB'
+                  f', parse {peak(whole):7.2f} MB')
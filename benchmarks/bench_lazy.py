@@ -0,0 +1,30 @@
+"""Load time of eager and lazy parsing, then reading a few tags per entity.
+
+    python -m benchmarks.bench_lazy [nbEntities]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    trio = trio_corpus(nbEntities)
+    print(f'{nbEntities} entities, {len(trio) / 1e6:.1f} MB of Trio')
+    for engine in ('lalr', 'scanner'):
+        if engine == 'lalr' and nbEntities > 5000:
+            continue
+        for lazy in (False, True):
+            start = perf_counter()
+            ontology = parse(trio, engine, lazy=lazy)
+            load = perf_counter() - start
+            start = perf_counter()
+            for entity in ontology:
+                if 'curVal' in entity:
+                    entity['curVal'].kind
+                    entity['equipRef'].kind
+            access = perf_counter() - start
+            print(f'{engine:>8} {"lazy" if lazy else "eager":>5}:'
+                  f' load {load:7.3f} s, read 2 tags/entity {access:7.3f} s')
@@ -0,0 +1,45 @@
+"""Serializing a grid again after a few tag changes: rebuilding the Grid
+against patching a LiveGrid.
+
+    python -m benchmarks.bench_live_grid [nbEntities]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.kinds import Number
+from haystackparser.live_grid import LiveGrid
+from haystackparser.ontology import Grid, Tag
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+NB_CHANGES = 10
+
+
+def change(ontology, step: int) -> None:
+    """set curVal on NB_CHANGES points"""
+    for idx in range(NB_CHANGES):
+        entity = ontology[(2 + idx * 97 + step) % len(ontology)]
+        if 'curVal' in entity:
+            entity['curVal'] = Tag('curVal', Number(float(step), '°C'))
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ontology = parse(trio_corpus(nbEntities), 'scanner')
+    print(f'{nbEntities} entities, {NB_CHANGES} tags changed per request')
+
+    start = perf_counter()
+    grid = LiveGrid(ontology)
+    grid.toZinc()
+    print(f'{"first LiveGrid.toZinc":>24}: {perf_counter() - start:7.3f} s')
+
+    for label, serialize in (
+            ('rebuild Grid', lambda: Grid(ontology).toZinc()),
+            ('LiveGrid', grid.toZinc)):
+        start = perf_counter()
+        for step in range(5):
+            change(ontology, step)
+            zinc = serialize()
+        print(f'{label:>24}: {(perf_counter() - start) / 5:7.3f} s per request')
+    assert zinc == Grid(ontology).toZinc()
@@ -0,0 +1,119 @@
+"""Memory held by a parsed Ontology, and distinct Marker/Bool objects.
+
+    python -m benchmarks.bench_memory [nbEntities]
+
+The layouts before the singletons (user-015) and before __slots__
+(user-016) are rebuilt from the parsed entities: the same tags copied
+into objects holding their attributes in a __dict__, with a fresh Marker,
+NA, Remove or Bool object per tag or the shared ones. The current layout
+is copied the same way, so the three figures only differ by the object
+layout and can be compared.
+"""
+import gc
+import sys
+import tracemalloc
+
+from haystackparser.kinds import NA, Bool, Marker, Remove
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+SINGLETONS = (Marker, NA, Remove, Bool)
+
+
+class DictObject:
+    """Attributes in a per-instance __dict__, as the kinds, Tag and Entity
+    kept them before __slots__"""
+
+
+# one DictObject class per copied class, so that its instances share their
+# dict keys as the instances of the class did
+_dictClasses = {}
+
+
+def slotNames(cls):
+    return [name for klass in cls.__mro__
+            for name in getattr(klass, '__slots__', ())
+            if name not in ('__dict__', '__weakref__')]
+
+
+def dictCopy(obj, **attributes):
+    cls = type(obj)
+    dictClass = _dictClasses.get(cls)
+    if dictClass is None:
+        dictClass = _dictClasses[cls] = type(cls.__name__, (DictObject,), {})
+    copy = dictClass()
+    for name in slotNames(cls):
+        if hasattr(obj, name):
+            setattr(copy, name, attributes.get(name, getattr(obj, name)))
+    return copy
+
+
+def slotCopy(obj, **attributes):
+    copy = object.__new__(type(obj))
+    for name in slotNames(type(obj)):
+        if hasattr(obj, name):
+            setattr(copy, name, attributes.get(name, getattr(obj, name)))
+    return copy
+
+
+def copyLayout(ontology, copyObject, sharedSingletons):
+    """entities, tags and scalar kinds copied with copyObject, the list and
+    dict kinds are kept as they are"""
+    entities = []
+    for entity in ontology:
+        tags = []
+        for tag in entity.tags:
+            kind = tag.kind
+            if isinstance(kind, SINGLETONS) and sharedSingletons:
+                pass
+            elif not isinstance(kind, (list, dict)):
+                kind = copyObject(kind)
+            tags.append(copyObject(tag, _value=kind))
+        entities.append(copyObject(entity, _id=copyObject(entity.id),
+                                   _tags=tags,
+                                   _tagIndex=dict(entity._tagIndex)))
+    return entities
+
+
+def traced(build):
+    """traced memory allocated by build, with its result still alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    trio = trio_corpus(nbEntities)
+    gc.collect()
+    tracemalloc.start()
+    ontology = parse(trio, 'scanner')
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nbTags = sum(len(entity) for entity in ontology)
+    print(f'{nbEntities} entities, {nbTags} tags: {size / 1e6:7.1f} MB,'
+          f' {size / nbEntities:6.0f} bytes/entity,'
+          f' {size / nbTags:6.0f} bytes/tag')
+    kinds = [tag.kind for entity in ontology for tag in entity.tags]
+    for kindClass in SINGLETONS:
+        instances = [kind for kind in kinds if isinstance(kind, kindClass)]
+        print(f'{kindClass.__name__:>8}: {len(instances):7} tags,'
+              f' {len(set(map(id, instances))):7} objects')
+
+    print('entities, tags and kinds objects:')
+    for name, copyObject, sharedSingletons in (
+            ('__dict__, one Marker/Bool per tag', dictCopy, False),
+            ('__dict__, shared Marker/Bool', dictCopy, True),
+            ('__slots__, shared Marker/Bool', slotCopy, True)):
+        size = traced(lambda: copyLayout(ontology, copyObject,
+                                         sharedSingletons))
+        print(f'{name:>36}: {size / 1e6:7.1f} MB,'
+              f' {size / nbEntities:6.0f} bytes/entity,'
+              f' {size / nbTags:6.0f} bytes/tag')
@@ -0,0 +1,30 @@
+"""Build and ref lookup time of Ontology from 1k to 1M entities.
+
+    python -m benchmarks.bench_ontology_index [maxEntities]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.kinds import Ref
+from haystackparser.ontology import Entity, Ontology
+
+if __name__ == '__main__':
+    maxEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    nbEntities = 1000
+    while nbEntities <= maxEntities:
+        entities = [Entity(Ref(f'@e{idx}')) for idx in range(nbEntities)]
+        refs = [Ref(f'@e{idx}') for idx in range(nbEntities)]
+
+        start = perf_counter()
+        myOntology = Ontology(entities)
+        build = perf_counter() - start
+
+        start = perf_counter()
+        for ref in refs:
+            myOntology[ref]
+        lookup = perf_counter() - start
+
+        print(f'{nbEntities:>9} entities: build {build:8.3f} s'
+              f' ({build / nbEntities * 1e6:5.2f} µs/entity)'
+              f', lookup {lookup / nbEntities * 1e6:5.2f} µs/ref')
+        nbEntities *= 10
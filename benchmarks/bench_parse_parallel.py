@@ -0,0 +1,24 @@
+"""Scaling of parse_parallel with the number of worker processes.
+
+    python -m benchmarks.bench_parse_parallel [nbEntities] [engine]
+"""
+import os
+import sys
+from time import perf_counter
+
+from haystackparser.trio_parser import parse_parallel
+
+from .corpus import trio_corpus
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    engine = sys.argv[2] if len(sys.argv) > 2 else 'lalr'
+    trio = trio_corpus(nbEntities)
+    print(f'{nbEntities} entities, engine {engine}, {os.cpu_count()} cpus')
+    workers = 1
+    while workers <= os.cpu_count():
+        start = perf_counter()
+        parse_parallel(trio, workers, engine, chunkSize=250)
+        elapsed = perf_counter() - start
+        print(f'{workers:>3} workers: {nbEntities / elapsed:10.0f} entities/s')
+        workers *= 2
@@ -0,0 +1,43 @@
+"""Startup time: parsing Trio against opening a snapshot.
+
+    python -m benchmarks.bench_snapshot [nbEntities]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from haystackparser import snapshot
+from haystackparser.kinds import Ref
+from haystackparser.trio_parser import parse
+
+from .corpus import trio_corpus
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    trio = trio_corpus(nbEntities)
+    start = perf_counter()
+    ontology = parse(trio, 'scanner')
+    print(f'parse trio (scanner) : {perf_counter() - start:8.3f} s'
+          f' ({len(trio.encode("utf-8")) / 1e6:.1f} MB)')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'corpus.hsnap')
+        start = perf_counter()
+        snapshot.save(ontology, path)
+        print(f'save snapshot        : {perf_counter() - start:8.3f} s'
+              f' ({os.path.getsize(path) / 1e6:.1f} MB)')
+
+        start = perf_counter()
+        mySnapshot = snapshot.Snapshot(path)
+        opened = perf_counter() - start
+        start = perf_counter()
+        mySnapshot[Ref(f'@point{nbEntities - 1}')]
+        lookup = perf_counter() - start
+        print(f'open snapshot        : {opened * 1000:8.3f} ms,'
+              f' first ref lookup {lookup * 1000:.3f} ms')
+
+        start = perf_counter()
+        mySnapshot.toOntology()
+        print(f'decode every entity  : {perf_counter() - start:8.3f} s')
+        mySnapshot.close()
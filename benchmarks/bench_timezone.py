@@ -0,0 +1,54 @@
+"""Timezone resolution: first lookup in a fresh process, then the lookups
+and city names of a history of datetimes.
+
+    python -m benchmarks.bench_timezone [nbValues]
+"""
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+from zoneinfo import available_timezones
+
+from haystackparser.kinds import HaystackDateTime
+from haystackparser.zinc_datetime import getHaystackTz
+
+FIRST_LOOKUP = '''
+from time import perf_counter
+start = perf_counter()
+from haystackparser.zinc_datetime import getHaystackTz
+getHaystackTz("Paris")
+print(perf_counter() - start)
+'''
+
+
+def scan(tz: str):
+    """lookup walking the installed tzdata, as zinc_datetime used to"""
+    zones = {zone.split('/')[-1]: zone for zone in available_timezones()}
+    return zones[tz]
+
+
+if __name__ == '__main__':
+    nbValues = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    start = perf_counter()
+    scan('Paris')
+    print(f'{"tzdata scan":>24}: {perf_counter() - start:7.4f} s')
+    first = subprocess.run([sys.executable, '-c', FIRST_LOOKUP], check=True,
+                           capture_output=True, text=True).stdout
+    print(f'{"first getHaystackTz":>24}: {float(first):7.4f} s (with imports)')
+
+    zones = ['Paris', 'New_York', 'GMT+5', 'Tokyo']
+    start = perf_counter()
+    for idx in range(nbValues):
+        getHaystackTz(zones[idx % 4])
+    print(f'{"getHaystackTz":>24}: {perf_counter() - start:7.4f} s'
+          f' for {nbValues} values')
+
+    tz = getHaystackTz('Paris')
+    moment = datetime(2020, 7, 17, tzinfo=tz)
+    values = [HaystackDateTime(moment + timedelta(minutes=idx))
+              for idx in range(nbValues)]
+    start = perf_counter()
+    for value in values:
+        value.toZinc
+    print(f'{"HaystackDateTime.toZinc":>24}: {perf_counter() - start:7.4f} s'
+          f' for {nbValues} values')
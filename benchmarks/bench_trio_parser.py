@@ -0,0 +1,25 @@
+"""Entities per second of the Trio parser engines.
+
+    python -m benchmarks.bench_trio_parser [nbEntities]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.trio_parser import ENGINES, parse
+
+from .corpus import trio_corpus
+
+
+def bench(trio: str, engine: str) -> float:
+    start = perf_counter()
+    ontology = parse(trio, engine)
+    elapsed = perf_counter() - start
+    return len(ontology) / elapsed
+
+
+if __name__ == '__main__':
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    trio = trio_corpus(nbEntities)
+    print(f'{nbEntities} entities, {len(trio) / 1e6:.1f} MB of Trio')
+    for engine in ENGINES:
+        print(f'{engine:>8}: {bench(trio, engine):10.0f} entities/s')
@@ -0,0 +1,42 @@
+"""Unit database: cold load in a fresh process, then the time and memory
+of Numbers carrying a unit.
+
+    python -m benchmarks.bench_units [nbNumbers]
+"""
+import gc
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+
+from haystackparser.kinds import Number
+
+COLD_LOAD = '''
+from time import perf_counter
+from haystackparser.unitDb import Unit
+start = perf_counter()
+Unit("°C")
+print(perf_counter() - start)
+'''
+SYMBOLS = ('°C', 'kW', 'kWh', '%', 'm³/h', 'Pa')
+
+if __name__ == '__main__':
+    nbNumbers = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    cold = subprocess.run([sys.executable, '-c', COLD_LOAD], check=True,
+                          capture_output=True, text=True).stdout
+    print(f'{"cold load":>16}: {float(cold) * 1e3:7.2f} ms')
+
+    start = perf_counter()
+    for idx in range(nbNumbers):
+        Number(float(idx), SYMBOLS[idx % 6])
+    print(f'{"Number(v, unit)":>16}: {perf_counter() - start:7.3f} s'
+          f' for {nbNumbers} numbers')
+
+    gc.collect()
+    tracemalloc.start()
+    numbers = [Number(float(idx), SYMBOLS[idx % 6]) for idx in range(nbNumbers)]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{"memory":>16}: {size / nbNumbers:7.0f} bytes/number,'
+          f' {len({id(number.unit) for number in numbers})} Unit objects')
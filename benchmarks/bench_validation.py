@@ -0,0 +1,45 @@
+"""Cost of the name and value checks of the hot constructors, validated
+and trusted, then a scanner parse that uses the trusted path.
+
+    python -m benchmarks.bench_validation [nbEntities]
+"""
+import sys
+from time import perf_counter
+from timeit import timeit
+
+from haystackparser.kinds import Marker, Ref, Symbol, XStr
+from haystackparser.ontology import Tag
+from haystackparser.trio_parser import parse
+from haystackparser.zinc_scalar import decodeScalar
+
+from .corpus import trio_corpus
+
+NUMBER = 200000
+
+
+def measure(label: str, statement) -> None:
+    seconds = timeit(statement, number=NUMBER)
+    print(f'{label:>28}: {seconds / NUMBER * 1e9:7.0f} ns')
+
+
+if __name__ == '__main__':
+    marker = Marker()
+    measure('Tag', lambda: Tag('curVal', marker))
+    measure('Tag.trusted', lambda: Tag.trusted('curVal', marker))
+    measure('Ref', lambda: Ref('@point1', 'Point 1'))
+    measure('Ref.trusted', lambda: Ref.trusted('@point1', 'Point 1'))
+    measure('Symbol', lambda: Symbol('^cov'))
+    measure('Symbol.trusted', lambda: Symbol.trusted('^cov'))
+    measure('XStr', lambda: XStr('Bin', 'text/plain'))
+    measure('XStr.trusted', lambda: XStr.trusted('Bin', 'text/plain'))
+    measure('decodeScalar REF', lambda: decodeScalar('REF', '@point1 "Point 1"'))
+    measure('decodeScalar NUMBER', lambda: decodeScalar('NUMBER', '12.5°C'))
+    measure('decodeScalar COORD',
+            lambda: decodeScalar('COORD', 'C(37.5458266,-77.4491888)'))
+
+    nbEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    trio = trio_corpus(nbEntities)
+    start = perf_counter()
+    parse(trio, 'scanner')
+    print(f'{"scanner parse":>28}: {perf_counter() - start:7.3f} s'
+          f' for {nbEntities} entities')
@@ -0,0 +1,26 @@
+"""parse_zinc throughput from 1k to 100k rows.
+
+    python -m benchmarks.bench_zinc_parser [maxRows]
+"""
+import sys
+from time import perf_counter
+
+from haystackparser.ontology import Grid
+from haystackparser.trio_parser import parse
+from haystackparser.zinc_parser import parse_zinc
+
+from .corpus import trio_corpus
+
+if __name__ == '__main__':
+    maxRows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nbRows = 1000
+    while nbRows <= maxRows:
+        zinc = Grid(parse(trio_corpus(nbRows), 'scanner')).toZinc()
+        start = perf_counter()
+        grid = parse_zinc(zinc)
+        elapsed = perf_counter() - start
+        print(f'{nbRows:>7} rows x {len(grid._columns)} columns'
+              f' ({len(zinc) / 1e6:6.1f} MB): {elapsed:7.3f} s,'
+              f' {nbRows / elapsed:8.0f} rows/s,'
+              f' {len(zinc) / elapsed / 1e6:5.2f} MB/s')
+        nbRows *= 10
@@ -0,0 +1,50 @@
+"""Generators of synthetic Haystack models used by the benchmarks."""
+from typing import Iterator
+
+
+def iter_trio_entities(nbEntities: int) -> Iterator[str]:
+    """Yield the Trio text of nbEntities entities: one site, then equips
+    each followed by a few points, with every scalar kind represented."""
+    yield ('id: @site "Main site"\n'
+           'dis: "Main site"\n'
+           'site\n'
+           'area: 3702ft²\n'
+           'geoCoord: C(37.5458266,-77.4491888)\n'
+           'tz: "Paris"\n')
+    equip = None
+    for idx in range(1, nbEntities):
+        if idx % 10 == 1:
+            equip = f'@equip{idx}'
+            yield (f'id: {equip} "AHU {idx}"\n'
+                   f'dis: "AHU {idx}"\n'
+                   'equip\n'
+                   'ahu\n'
+                   'siteRef: @site\n'
+                   f'installed: 2020-07-{1 + idx % 28:02d}\n'
+                   'vendor: Acme Corp\n')
+        else:
+            yield (f'id: @point{idx} "Point {idx}"\n'
+                   f'dis: "Point {idx} temp"\n'
+                   'point\n'
+                   'sensor\n'
+                   'temp\n'
+                   'kind: "Number"\n'
+                   'unit: "°C"\n'
+                   f'curVal: {idx % 40}.5°C\n'
+                   f'minVal: {idx % 7}.0°C\n'
+                   'his: T\n'
+                   'writable: F\n'
+                   'hisMode: ^cov\n'
+                   'occupied: 08:00:00\n'
+                   f'lastUpdate: 2020-07-17T16:55:{idx % 60:02d}.977+02:00 Paris\n'
+                   'doc: `http://project-haystack.org/`\n'
+                   'color: Color("red")\n'
+                   'enum: ["off","on"]\n'
+                   'range: {min:0,max:40}\n'
+                   f'equipRef: {equip}\n'
+                   'siteRef: @site\n')
+
+
+def trio_corpus(nbEntities: int) -> str:
+    """Whole Trio document with nbEntities entities"""
+    return '---\n'.join(iter_trio_entities(nbEntities))
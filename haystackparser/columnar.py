@@ -0,0 +1,304 @@
+"""Columnar view of an ontology for scans of a few tags over many entities
+
+    store = ColumnStore.of(ontology)
+    areas = store['area'].numbers('m²')
+    ahus = store.select('equipRef', Ref('@ahu1'))
+
+Each tag name is a Column. Rows are the entity positions in the ontology:
+a presence mask of every row, then typed segments of (rows, values) arrays
+- markers: rows only
+- numbers: float64 values and unit codes
+- Str and Ref: codes into a dictionary of the distinct values
+- any other kind: the Kind objects
+so a scan walks one or two flat arrays instead of entities and tags.
+
+The arrays are filled as array.array, then viewed as NumPy arrays when
+numpy is installed: a unit conversion is one multiply-add over a table of
+factors indexed by the unit codes, a value match one boolean mask. Without
+numpy the same scans run in pure Python (compress and map over the
+arrays). Like TagIndex, the store is built on first use and kept until the
+ontology or one of its entities changes."""
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from .exception import IncompatibleUnits, TagNotFound
+from .kinds import Kind, Marker, Number, Ref, Str
+from .ontology import Entity, Ontology
+from .unitDb import Unit, conversion
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def _dictionaryKey(kind: Kind) -> Optional[Hashable]:
+    if isinstance(kind, Str):
+        return (Str, kind.value)
+    if isinstance(kind, Ref):
+        return (Ref, kind.value, kind.displayname)
+    return None
+
+
+def _codeMask(values: 'numpy.ndarray', codes: List[int],
+              nbCodes: int) -> 'numpy.ndarray':
+    """match of each code of values against codes, through a table of
+    nbCodes + 1 flags so that the code -1 never matches"""
+    table = numpy.zeros(nbCodes + 1, dtype=numpy.bool_)
+    table[codes] = True
+    return table[values]
+
+
+class Column:
+    """Values of one tag name, row by row"""
+
+    def __init__(self, name: str, nbRows: int) -> None:
+        self.name = name
+        self.present = bytearray(nbRows)
+        self.markerRows = array('I')
+        self.numberRows = array('I')
+        self.numberValues = array('d')
+        self.units = array('i')
+        self.unitSymbols: List[str] = []
+        self._unitIndex: Dict[str, int] = {}
+        self.codeRows = array('I')
+        self.codes = array('I')
+        self.dictionary: List[Kind] = []
+        self._dictionaryIndex: Dict[Hashable, int] = {}
+        self.otherRows = array('I')
+        self.others: List[Kind] = []
+
+    def _append(self, row: int, kind: Kind) -> None:
+        self.present[row] = 1
+        if isinstance(kind, Marker):
+            self.markerRows.append(row)
+        elif isinstance(kind, Number):
+            self.numberRows.append(row)
+            self.numberValues.append(kind.value)
+            self.units.append(self._unitCode(kind.unit.symbol)
+                              if kind.unit else -1)
+        else:
+            key = _dictionaryKey(kind)
+            if key is None:
+                self.otherRows.append(row)
+                self.others.append(kind)
+                return
+            code = self._dictionaryIndex.get(key)
+            if code is None:
+                code = self._dictionaryIndex[key] = len(self.dictionary)
+                self.dictionary.append(kind)
+            self.codeRows.append(row)
+            self.codes.append(code)
+
+    def _freeze(self) -> None:
+        """NumPy views of the arrays, once every row is appended"""
+        if numpy is None:
+            return
+        self.present = numpy.frombuffer(self.present, dtype=numpy.bool_)
+        for name in ('markerRows', 'numberRows', 'numberValues', 'units',
+                     'codeRows', 'codes', 'otherRows'):
+            values = getattr(self, name)
+            setattr(self, name, numpy.frombuffer(values, dtype=values.typecode))
+
+    def _unitCode(self, symbol: str) -> int:
+        code = self._unitIndex.get(symbol)
+        if code is None:
+            code = self._unitIndex[symbol] = len(self.unitSymbols)
+            self.unitSymbols.append(symbol)
+        return code
+
+    def __len__(self) -> int:
+        """number of rows holding the tag"""
+        if numpy is not None:
+            return int(numpy.count_nonzero(self.present))
+        return len(self.present) - self.present.count(0)
+
+    def __contains__(self, row: int) -> bool:
+        return 0 <= row < len(self.present) and self.present[row] == 1
+
+    def __getitem__(self, row: int) -> Optional[Kind]:
+        """kind of the row, None if the entity has no such tag"""
+        if row not in self:
+            return None
+        for rows, decode in ((self.markerRows, lambda idx: Marker()),
+                             (self.numberRows, self._number),
+                             (self.codeRows,
+                              lambda idx: self.dictionary[self.codes[idx]]),
+                             (self.otherRows, self.others.__getitem__)):
+            idx = bisect_left(rows, row)
+            if idx < len(rows) and rows[idx] == row:
+                return decode(idx)
+        raise IndexError(f'Row {row} of column {self.name} not found')
+
+    def _number(self, idx: int) -> Number:
+        unit = self.units[idx]
+        return Number(float(self.numberValues[idx]),
+                      self.unitSymbols[unit] if unit >= 0 else None)
+
+    def _unitCodes(self, unit: str) -> List[int]:
+        """codes of the symbols of the same unit as unit"""
+        canonical = Unit(unit).canonical
+        return [code for code, symbol in enumerate(self.unitSymbols)
+                if Unit(symbol).canonical == canonical]
+
+    def _conversions(self, unit: str) -> Dict[int, Tuple[float, float]]:
+        """unit code -> scale and shift to unit, for the codes of units
+        compatible with unit"""
+        conversions = {}
+        for code, symbol in enumerate(self.unitSymbols):
+            try:
+                conversions[code] = conversion(symbol, unit)
+            except IncompatibleUnits:
+                pass
+        return conversions
+
+    def _factors(self, unit: str) -> Tuple['numpy.ndarray', 'numpy.ndarray',
+                                           'numpy.ndarray']:
+        """scales, shifts to unit and compatibility of each unit code. The
+        last entry, read by the code -1 of the Numbers without unit, is not
+        compatible"""
+        size = len(self.unitSymbols) + 1
+        scales, shifts = numpy.zeros(size), numpy.zeros(size)
+        compatible = numpy.zeros(size, dtype=numpy.bool_)
+        for code, (scale, shift) in self._conversions(unit).items():
+            scales[code], shifts[code], compatible[code] = scale, shift, True
+        return scales, shifts, compatible
+
+    def numbers(self, unit: str = None) -> Sequence[float]:
+        """float values of the Number rows. With unit, the values of the
+        Numbers in a unit compatible with it converted to unit, the others
+        (no unit, another dimension) are left out: numberRowsIn(unit) are the
+        rows of the values. A NumPy array when numpy is installed, an
+        array('d') else"""
+        if numpy is not None:
+            if unit is None:
+                return self.numberValues.copy()
+            scales, shifts, compatible = self._factors(unit)
+            mask = compatible[self.units]
+            units = self.units[mask]
+            return self.numberValues[mask] * scales[units] + shifts[units]
+        if unit is None:
+            return array('d', self.numberValues)
+        conversions = self._conversions(unit)
+        return array('d', (value * conversions[code][0] + conversions[code][1]
+                           for value, code in zip(self.numberValues, self.units)
+                           if code in conversions))
+
+    def numberRowsIn(self, unit: str) -> Sequence[int]:
+        """rows of the values of numbers(unit)"""
+        if numpy is not None:
+            return self.numberRows[self._factors(unit)[2][self.units]]
+        conversions = self._conversions(unit)
+        return array('I', compress(self.numberRows,
+                                   map(conversions.__contains__, self.units)))
+
+    def rows(self, kind: Kind = None) -> Sequence[int]:
+        """rows holding the tag, or holding this value when kind is given. A
+        NumPy array when numpy is installed, an array('I') else"""
+        if numpy is not None:
+            return self._rowsNumpy(kind)
+        if kind is None:
+            return array('I', compress(range(len(self.present)), self.present))
+        if isinstance(kind, Marker):
+            return array('I', self.markerRows)
+        if isinstance(kind, Number):
+            matches = map(kind.value.__eq__, self.numberValues)
+            if kind.unit is None:
+                units = map((-1).__eq__, self.units)
+            else:
+                units = map(set(self._unitCodes(kind.unit.symbol)).__contains__,
+                            self.units)
+            return array('I', compress(self.numberRows,
+                                       map(all, zip(matches, units))))
+        key = _dictionaryKey(kind)
+        if key is not None:
+            codes = self._dictionaryCodes(kind, key)
+            return array('I', compress(self.codeRows,
+                                       map(set(codes).__contains__, self.codes)))
+        return array('I', (row for row, other in zip(self.otherRows, self.others)
+                           if other.toZinc == kind.toZinc))
+
+    def _rowsNumpy(self, kind: Optional[Kind]) -> 'numpy.ndarray':
+        if kind is None:
+            return numpy.flatnonzero(self.present).astype(numpy.uint32)
+        if isinstance(kind, Marker):
+            return self.markerRows.copy()
+        if isinstance(kind, Number):
+            mask = self.numberValues == kind.value
+            if kind.unit is None:
+                mask &= self.units == -1
+            else:
+                mask &= _codeMask(self.units, self._unitCodes(kind.unit.symbol),
+                                  len(self.unitSymbols))
+            return self.numberRows[mask]
+        key = _dictionaryKey(kind)
+        if key is not None:
+            codes = self._dictionaryCodes(kind, key)
+            return self.codeRows[_codeMask(self.codes, codes,
+                                           len(self.dictionary))]
+        return numpy.array([row for row, other in zip(self.otherRows, self.others)
+                            if other.toZinc == kind.toZinc], dtype=numpy.uint32)
+
+    def _dictionaryCodes(self, kind: Kind, key: Hashable) -> List[int]:
+        """dictionary codes matching kind, a Ref matches whatever its
+        display name"""
+        if isinstance(kind, Ref):
+            return [code for code, value in enumerate(self.dictionary)
+                    if isinstance(value, Ref) and value.value == kind.value]
+        code = self._dictionaryIndex.get(key)
+        return [] if code is None else [code]
+
+
+class ColumnStore:
+    """Columns of an ontology, one per tag name plus id"""
+
+    def __init__(self, ontology: Ontology) -> None:
+        self.ontology = ontology
+        self.entities: List[Entity] = list(ontology.entities)
+        nbRows = len(self.entities)
+        self.columns: Dict[str, Column] = {'id': Column('id', nbRows)}
+        idColumn = self.columns['id']
+        for row, entity in enumerate(self.entities):
+            idColumn._append(row, entity.id)
+            for tag in entity.tags:
+                column = self.columns.get(tag.name)
+                if column is None:
+                    column = self.columns[tag.name] = Column(tag.name, nbRows)
+                column._append(row, tag.kind)
+        for column in self.columns.values():
+            column._freeze()
+
+    @classmethod
+    def of(cls, ontology: Ontology) -> 'ColumnStore':
+        """Store of the ontology, built once until the ontology changes"""
+        store = ontology._cache.get(cls)
+        if store is None:
+            store = ontology._cache[cls] = cls(ontology)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Column:
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise TagNotFound(f'No entity with tag {name}')
+
+    def select(self, name: str, kind: Kind = None) -> List[Entity]:
+        """Entities holding the tag, or holding this value when kind is given"""
+        if name not in self.columns:
+            return []
+        return [self.entities[row] for row in self.columns[name].rows(kind)]
+
+    def scan(self, *names: str) -> Iterator[Tuple[Optional[Kind], ...]]:
+        """Kinds of the tags, row by row, None where a tag is missing"""
+        columns = [self.columns.get(name) for name in names]
+        for row in range(len(self.entities)):
+            yield tuple(column[row] if column is not None else None
+                        for column in columns)
@@ -9,6 +9,10 @@ class UnitNotFound(Exception):
     def __init__(self, *args: object) -> None:
         super().__init__(*args)
 
+class IncompatibleUnits(Exception):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
+
 class TimeZoneNotFound(Exception):
     def __init__(self, *args: object) -> None:
         super().__init__(*args)
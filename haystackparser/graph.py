@@ -0,0 +1,107 @@
+"""Graph of the Ref tags of an ontology
+
+    graph = RefGraph.of(ontology)
+    graph.children(Ref('@ahu1'), via='equipRef')
+    graph.subtree(Ref('@site'))
+
+Each Ref valued tag of an entity is an edge from the entity to the
+referenced one. Edges are kept in forward (entity -> refs) and reverse
+(ref -> entities) adjacency lists, so walks only touch the edges they
+follow. The graph is built on first use and kept until the ontology or one
+of its entities changes."""
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .exception import RefNotFound
+from .kinds import Ref
+from .ontology import Entity, Ontology
+
+# (tag name, ref value) of the other end of an edge
+Edge = Tuple[str, str]
+
+
+class RefGraph:
+    """Forward and reverse adjacency of the Ref tags of an ontology"""
+
+    def __init__(self, ontology: Ontology) -> None:
+        self.ontology = ontology
+        self.forward: Dict[str, List[Edge]] = {}
+        self.reverse: Dict[str, List[Edge]] = {}
+        for entity in ontology.entities:
+            source = entity.id.value
+            edges = self.forward[source] = []
+            for tag in entity.tags:
+                if isinstance(tag.kind, Ref):
+                    target = tag.kind.value
+                    edges.append((tag.name, target))
+                    self.reverse.setdefault(target, []).append(
+                        (tag.name, source))
+
+    @classmethod
+    def of(cls, ontology: Ontology) -> 'RefGraph':
+        """Graph of the ontology, built once until the ontology changes"""
+        graph = ontology._cache.get(cls)
+        if graph is None:
+            graph = ontology._cache[cls] = cls(ontology)
+        return graph
+
+    def _entity(self, value: str) -> Entity:
+        return self.ontology._index[value]
+
+    def _source(self, ref: Ref) -> str:
+        if ref.value not in self.forward:
+            raise RefNotFound(f'Ref {ref.value} not found in ontology')
+        return ref.value
+
+    def _walk(self, adjacency: Dict[str, List[Edge]], ref: Ref,
+              via: Optional[str]) -> Iterator[str]:
+        """breadth first walk, each entity yield once, start excluded"""
+        start = self._source(ref)
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for name, value in adjacency.get(queue.popleft(), ()):
+                if (via is None or name == via) and value not in seen \
+                        and value in self.forward:
+                    seen.add(value)
+                    queue.append(value)
+                    yield value
+
+    def parents(self, ref: Ref, via: Optional[str] = None) -> List[Entity]:
+        """Entities referenced by the entity, through the tag via or any Ref
+        tag. Dangling refs are skipped"""
+        return [self._entity(value)
+                for name, value in self.forward[self._source(ref)]
+                if (via is None or name == via) and value in self.forward]
+
+    def children(self, ref: Ref, via: Optional[str] = None) -> List[Entity]:
+        """Entities referencing the entity, through the tag via or any Ref
+        tag"""
+        return [self._entity(value)
+                for name, value in self.reverse.get(self._source(ref), ())
+                if via is None or name == via]
+
+    def ancestors(self, ref: Ref, via: Optional[str] = None) -> List[Entity]:
+        """Entities reachable following Ref tags, nearest first"""
+        return [self._entity(value)
+                for value in self._walk(self.forward, ref, via)]
+
+    def subtree(self, ref: Ref, via: Optional[str] = None) -> List[Entity]:
+        """Entities reaching the entity following Ref tags, nearest first"""
+        return [self._entity(value)
+                for value in self._walk(self.reverse, ref, via)]
+
+    def dangling(self) -> List[Tuple[Entity, str, Ref]]:
+        """(entity, tag name, ref) of the Ref tags pointing outside the
+        ontology"""
+        return [(self._entity(source), name, Ref(value))
+                for source, edges in self.forward.items()
+                for name, value in edges if value not in self.forward]
+
+    def check(self) -> None:
+        """Raise RefNotFound if a Ref tag points outside the ontology"""
+        dangling = self.dangling()
+        if dangling:
+            refs = ', '.join(f'{entity.id.value}.{name} -> {ref.value}'
+                             for entity, name, ref in dangling)
+            raise RefNotFound(f'Dangling refs: {refs}')
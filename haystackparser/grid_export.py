@@ -0,0 +1,187 @@
+"""NumPy and Arrow export of Grid columns
+
+    values, mask, meta = grid.to_numpy('curVal')
+    values, mask, meta = grid.to_numpy('energy', unit='MWh')
+    table = grid.to_arrow()
+
+A column is converted according to the kinds of its cells:
+
+    Number          float64, the unit in meta when every cell has the same
+                    or when the column is converted to one
+    Bool            bool
+    Marker          bool, True where the marker is set, never null
+    Date            datetime64[D]
+    DateTime        datetime64[us] in UTC, the timezone in meta
+    Str, Ref        int32 codes into meta['dictionary'], -1 for null
+    mixed, others   object array of the kinds
+
+mask is True for the null cells. numpy and pyarrow are optional
+dependencies, imported on first use."""
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from zoneinfo import ZoneInfo
+
+from .exception import IncompatibleUnits
+from .kinds import (Bool, HaystackDate, HaystackDateTime, Kind, Marker,
+                    Number, Ref, Str)
+from .ontology import Grid
+from .unitDb import Unit, conversion
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MICROSECOND = timedelta(microseconds=1)
+
+
+class NumpyColumn(NamedTuple):
+    values: Any
+    mask: Any
+    meta: Dict[str, Any]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Grid.to_numpy needs numpy: pip install numpy')
+    return numpy
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Grid.to_arrow needs pyarrow: pip install pyarrow')
+    return pyarrow
+
+
+def _cells(grid: Grid, column: str) -> List[Optional[Kind]]:
+    try:
+        idx = grid._columnIndex[column]
+    except KeyError:
+        raise KeyError(f'Column {column} not in grid')
+    return [row[idx] if idx < len(row) else None for row in grid._row]
+
+
+def _columnKind(cells: List[Optional[Kind]]) -> Optional[type]:
+    """the kind class shared by every non null cell, None if mixed"""
+    kinds = {cell.__class__ for cell in cells if cell is not None}
+    if len(kinds) == 1:
+        return kinds.pop()
+    if not kinds:
+        return Marker
+    return None
+
+
+def _convertNumbers(np, cells: List[Optional[Kind]], values, units: Set[Unit],
+                    unit: str):
+    """values converted to unit with the factors of each source unit, in one
+    vectorized operation"""
+    if None in units:
+        raise IncompatibleUnits(f'Numbers without unit cannot be converted to {unit}')
+    if len(units) == 1:
+        scale, shift = conversion(units.pop(), unit)
+        return values * scale + shift
+    codes = {source: code for code, source in enumerate(units)}
+    factors = np.array([conversion(source, unit) for source in codes])
+    rows = np.array([codes[cell.unit] if cell is not None else 0
+                     for cell in cells], dtype=np.intp)
+    return values * factors[rows, 0] + factors[rows, 1]
+
+
+def to_numpy(grid: Grid, column: str, unit: str = None) -> NumpyColumn:
+    """values, null mask and meta of a grid column, with unit the numbers
+    are converted to it whatever their own unit"""
+    np = _numpy()
+    cells = _cells(grid, column)
+    mask = np.array([cell is None for cell in cells], dtype=bool)
+    kind = _columnKind(cells)
+    nbCells = len(cells)
+
+    if unit is not None and kind is not Number:
+        raise IncompatibleUnits(f'Column {column} does not hold numbers to convert')
+    if kind is Number:
+        units = {cell.unit for cell in cells if cell is not None}
+        if unit is not None or len(units) == 1:
+            nan = float('nan')
+            values = np.array([cell.value if cell is not None else nan
+                               for cell in cells], dtype=np.float64)
+            if unit is not None:
+                values = _convertNumbers(np, cells, values, units, unit)
+            else:
+                unit = units.pop()
+                unit = unit.symbol if unit is not None else None
+            return NumpyColumn(values, mask, {'kind': 'number', 'unit': unit})
+    elif kind is Bool:
+        values = np.fromiter((cell is not None and cell.value
+                              for cell in cells), dtype=bool, count=nbCells)
+        return NumpyColumn(values, mask, {'kind': 'bool'})
+    elif kind is Marker:
+        return NumpyColumn(~mask, np.zeros(nbCells, dtype=bool),
+                           {'kind': 'marker'})
+    elif kind is HaystackDate:
+        days = np.fromiter((cell.value.toordinal() - EPOCH_ORDINAL
+                            if cell is not None else 0 for cell in cells),
+                           dtype=np.int64, count=nbCells)
+        values = days.astype('datetime64[D]')
+        values[mask] = np.datetime64('NaT')
+        return NumpyColumn(values, mask, {'kind': 'date'})
+    elif kind is HaystackDateTime:
+        zones = {cell.value.tzinfo.key if isinstance(cell.value.tzinfo, ZoneInfo)
+                 else None for cell in cells if cell is not None}
+        if all(cell is None or cell.value.tzinfo is not None
+               for cell in cells):
+            micros = np.fromiter(((cell.value - EPOCH) // MICROSECOND
+                                  if cell is not None else 0 for cell in cells),
+                                 dtype=np.int64, count=nbCells)
+            values = micros.astype('datetime64[us]')
+            values[mask] = np.datetime64('NaT')
+            tz = zones.pop() if len(zones) == 1 else None
+            return NumpyColumn(values, mask, {'kind': 'dateTime',
+                                              'tz': tz or 'UTC'})
+    elif kind is Str or kind is Ref:
+        dictionary: Dict[str, int] = {}
+        codes = np.fromiter((dictionary.setdefault(cell.value, len(dictionary))
+                             if cell is not None else -1 for cell in cells),
+                            dtype=np.int32, count=nbCells)
+        return NumpyColumn(codes, mask, {
+            'kind': 'str' if kind is Str else 'ref',
+            'dictionary': np.array(list(dictionary), dtype=object)})
+
+    values = np.empty(nbCells, dtype=object)
+    values[:] = cells
+    return NumpyColumn(values, mask, {'kind': 'object'})
+
+
+def to_arrow(grid: Grid):
+    """pyarrow Table of the grid, kinds without an Arrow type are stored as
+    their Zinc text"""
+    pa = _pyarrow()
+    arrays = []
+    fields = []
+    for column in grid._columns:
+        values, mask, meta = to_numpy(grid, column)
+        kind = meta['kind']
+        metadata = {'kind': kind}
+        if kind == 'number':
+            array = pa.array(values, type=pa.float64(), mask=mask)
+            if meta['unit'] is not None:
+                metadata['unit'] = meta['unit']
+        elif kind in ('bool', 'marker'):
+            array = pa.array(values, type=pa.bool_(), mask=mask)
+        elif kind == 'date':
+            array = pa.array(values, type=pa.date32(), mask=mask)
+        elif kind == 'dateTime':
+            array = pa.array(values.view('int64'),
+                             type=pa.timestamp('us', tz=meta['tz']), mask=mask)
+            metadata['tz'] = meta['tz']
+        elif kind in ('str', 'ref'):
+            array = pa.DictionaryArray.from_arrays(
+                pa.array(values, type=pa.int32(), mask=mask),
+                pa.array(list(meta['dictionary']), type=pa.string()))
+        else:
+            metadata['kind'] = 'zinc'
+            array = pa.array([cell.toZinc if cell is not None else None
+                              for cell in values], type=pa.string())
+        arrays.append(array)
+        fields.append(pa.field(column, array.type, metadata=metadata))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
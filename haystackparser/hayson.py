@@ -0,0 +1,204 @@
+"""Hayson, the JSON encoding of Haystack https://project-haystack.org/doc/docHaystack/Json
+
+    text = ontology.to_json()
+    ontology = Ontology.from_json(text)
+
+Kinds are encoded with their toJson, except the few kinds whose toJson
+does not follow Hayson. Decoding dispatches on the _kind of JSON objects
+through the DECODERS table. orjson is used when it is installed."""
+import json
+from typing import Any, Callable, Dict, Iterator, TextIO
+
+from .exception import ParseError
+from .kinds import (NA, JSON_KIND, Bool, Coord, HaystackDate, HaystackDateTime,
+                    HaystackDict, HaystackList, HaystackTime, HaystackUri, Kind,
+                    Marker, Number, Ref, Remove, Str, Symbol, XStr)
+from .ontology import Entity, Grid, Ontology, Tag
+from .zinc_datetime import parse_date, parse_datetime, parse_time
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    Bool: lambda kind: kind.value,
+    Str: lambda kind: kind.value,
+    Symbol: lambda kind: {JSON_KIND: 'symbol', 'val': kind.value[1:]},
+    XStr: lambda kind: {JSON_KIND: 'xstr', 'type': kind.type, 'val': kind.value},
+    HaystackList: lambda kind: [encodeKind(item) for item in kind],
+    HaystackDict: lambda kind: {name: encodeKind(item)
+                                for name, item in kind.items()},
+}
+
+
+def encodeKind(kind: Kind) -> Any:
+    """JSON value of a kind"""
+    encoder = ENCODERS.get(kind.__class__)
+    if encoder is not None:
+        return encoder(kind)
+    return kind.toJson
+
+
+def encodeEntity(entity: Entity) -> Dict[str, Any]:
+    """JSON object of an entity, its id then its tags"""
+    _dict = {'id': encodeKind(entity.id)}
+    for tag in entity.tags:
+        _dict[tag.name] = encodeKind(tag.kind)
+    return _dict
+
+
+def _number(obj: dict) -> Number:
+    value = obj['val']
+    if isinstance(value, str):
+        value = {'INF': 'inf', '-INF': '-inf', 'NaN': 'nan'}.get(value, value)
+    return Number(float(value), obj.get('unit'))
+
+
+def _dateTime(obj: dict) -> HaystackDateTime:
+    if obj.get('tz'):
+        return HaystackDateTime(parse_datetime(f"{obj['val']} {obj['tz']}"))
+    return HaystackDateTime(parse_datetime(obj['val']))
+
+
+DECODERS: Dict[str, Callable[[dict], Kind]] = {
+    'marker': lambda obj: Marker(),
+    'na': lambda obj: NA(),
+    'remove': lambda obj: Remove(),
+    'number': _number,
+    'str': lambda obj: Str(obj['val']),
+    'uri': lambda obj: HaystackUri(obj['val']),
+    'ref': lambda obj: Ref(f"@{obj['val']}", obj.get('dis')),
+    'symbol': lambda obj: Symbol(f"^{obj['val']}"),
+    'date': lambda obj: HaystackDate(parse_date(obj['val'])),
+    'time': lambda obj: HaystackTime(parse_time(obj['val'])),
+    'dateTime': _dateTime,
+    'coord': lambda obj: Coord(float(obj['lat']), float(obj['lng'])),
+    'xstr': lambda obj: XStr(obj['type'], obj.get('val', obj.get('value'))),
+    'dict': lambda obj: _decodeDict(obj),
+}
+
+
+def decodeKind(obj: Any) -> Kind:
+    """Kind of a JSON value"""
+    if isinstance(obj, dict):
+        kind = obj.get(JSON_KIND)
+        if kind is None or kind == 'dict':
+            return _decodeDict(obj)
+        if isinstance(kind, bool):
+            # Bool.toJson
+            return Bool(kind)
+        try:
+            return DECODERS[kind](obj)
+        except KeyError:
+            raise ParseError(f'Unknown Hayson kind {kind}')
+    if isinstance(obj, str):
+        return Str(obj)
+    if isinstance(obj, bool):
+        return Bool(obj)
+    if isinstance(obj, (int, float)):
+        return Number(float(obj))
+    if isinstance(obj, list):
+        return HaystackList([decodeKind(item) for item in obj])
+    raise ParseError(f'Unexpected JSON value {obj!r}')
+
+
+def _decodeDict(obj: dict) -> HaystackDict:
+    _dict = HaystackDict()
+    for name, value in obj.items():
+        if name != JSON_KIND and value is not None:
+            _dict[name] = decodeKind(value)
+    return _dict
+
+
+def decodeEntity(obj: dict) -> Entity:
+    """Entity of a JSON object, null tags are skipped"""
+    id = None
+    tags = []
+    for name, value in obj.items():
+        if value is None or name == JSON_KIND:
+            continue
+        kind = decodeKind(value)
+        if name == 'id':
+            if not isinstance(kind, Ref):
+                raise ParseError(f'id tag is always a Ref: {value}')
+            id = kind
+        else:
+            tags.append(Tag(name, kind))
+    return Entity(id, tags)
+
+
+def iter_ontology(ontology: Ontology, chunkSize: int = 1000) -> Iterator[str]:
+    """JSON array of the entities in chunks of chunkSize entities"""
+    yield '['
+    entities = ontology.entities
+    for start in range(0, len(entities), chunkSize):
+        chunk = dumps([encodeEntity(entity)
+                       for entity in entities[start:start + chunkSize]])
+        yield (',' if start else '') + chunk[1:-1]
+    yield ']'
+
+
+def iter_grid(grid: Grid, chunkSize: int = 1000) -> Iterator[str]:
+    """Hayson grid in chunks: the meta and columns, then chunkSize rows at a
+    time"""
+    columns = grid._columns
+    yield dumps({JSON_KIND: 'grid', 'meta': {'ver': '3.0'},
+                 'cols': [{'name': name} for name in columns]})[:-1]
+    yield ',"rows":['
+    for start in range(0, len(grid._row), chunkSize):
+        chunk = dumps([{columns[idx]: encodeKind(kind)
+                        for idx, kind in enumerate(row) if kind is not None}
+                       for row in grid._row[start:start + chunkSize]])
+        yield (',' if start else '') + chunk[1:-1]
+    yield ']}'
+
+
+def write(chunks: Iterator[str], fp: TextIO) -> None:
+    for chunk in chunks:
+        fp.write(chunk)
+
+
+def load_ontology(text: str) -> Ontology:
+    """Ontology of a JSON array of entities, or of a Hayson grid"""
+    obj = loads(text)
+    if isinstance(obj, dict) and obj.get(JSON_KIND) == 'grid':
+        obj = obj.get('rows', [])
+    if not isinstance(obj, list):
+        raise ParseError('Hayson ontology is an array of entities or a grid')
+    return Ontology([decodeEntity(entity) for entity in obj])
+
+
+def load_grid(text: str) -> Grid:
+    """Grid of a Hayson grid"""
+    obj = loads(text)
+    if not isinstance(obj, dict) or obj.get(JSON_KIND) != 'grid':
+        raise ParseError('Hayson grid expected')
+    grid = Grid()
+    for column in obj.get('cols', []):
+        grid._addColumn(column['name'])
+    nbColumns = len(grid._columns)
+    for row in obj.get('rows', []):
+        cells = [None] * nbColumns
+        for name, value in row.items():
+            if value is None:
+                continue
+            idx = grid._columnIndex.get(name)
+            if idx is None:
+                raise ParseError(f'Column {name} not in grid')
+            cells[idx] = decodeKind(value)
+        grid._row.append(cells)
+    return grid
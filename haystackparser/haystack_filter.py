@@ -0,0 +1,286 @@
+"""Haystack filters https://project-haystack.org/doc/docHaystack/Filters
+
+    query(ontology, 'point and sensor and equipRef->ahu')
+
+Queries are answered from a TagIndex of the ontology: tag name -> entities
+and (tag name, value) -> entities. The index is built on the first query
+and kept until the ontology or one of its entities changes."""
+from importlib.resources import as_file, files
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from lark import Lark
+from lark.lexer import Token
+from lark.tree import Tree
+
+from . import grammar
+from .exception import EntityNotFound, ParseError
+from .kinds import (Bool, HaystackDate, HaystackDateTime, HaystackTime,
+                    HaystackUri, Kind, Number, Ref, Str, Symbol)
+from .ontology import Entity, Ontology
+from .zinc_scalar import decodeScalar
+
+source = files(grammar).joinpath('filter.lark')
+with as_file(source) as file:
+    grammarFile = file.open('r', encoding='utf-8')
+
+parser = Lark(grammarFile, start='start',
+              parser='lalr',
+              )
+
+EntitySet = Dict[Entity, None]
+
+
+def valueKey(kind: Kind) -> Optional[Hashable]:
+    """Hashable key of a scalar value, equal for equal values of the same
+    kind. None for kinds that are not compared by filters"""
+    if isinstance(kind, Ref):
+        return (Ref, kind.value)
+    if isinstance(kind, Number):
+        return (Number, kind.value, kind.unit.canonical if kind.unit else None)
+    if isinstance(kind, (Bool, Str, HaystackUri, Symbol, HaystackDate,
+                         HaystackTime, HaystackDateTime)):
+        return (kind.__class__, kind.value)
+    return None
+
+
+class TagIndex:
+    """Inverted index of an ontology"""
+
+    def __init__(self, ontology: Ontology) -> None:
+        self.ontology = ontology
+        self.position: Dict[Entity, int] = {}
+        self.tags: Dict[str, EntitySet] = {'id': {}}
+        self.values: Dict[Tuple[str, Hashable], EntitySet] = {}
+        for position, entity in enumerate(ontology.entities):
+            self.position[entity] = position
+            self.tags['id'][entity] = None
+            self.values.setdefault(
+                ('id', valueKey(entity.id)), {})[entity] = None
+            for tag in entity.tags:
+                self.tags.setdefault(tag.name, {})[entity] = None
+                key = valueKey(tag.kind)
+                if key is not None:
+                    self.values.setdefault((tag.name, key), {})[entity] = None
+
+    @classmethod
+    def of(cls, ontology: Ontology) -> 'TagIndex':
+        """Index of the ontology, built once until the ontology changes"""
+        index = ontology._cache.get(cls)
+        if index is None:
+            index = ontology._cache[cls] = cls(ontology)
+        return index
+
+    def withTag(self, name: str) -> EntitySet:
+        return self.tags.get(name, {})
+
+    def withValue(self, name: str, kind: Kind) -> EntitySet:
+        return self.values.get((name, valueKey(kind)), {})
+
+
+class Filter:
+    """Node of a parsed filter"""
+
+    def estimate(self, index: TagIndex) -> int:
+        """Upper bound of the number of entities selected"""
+        return len(index.position)
+
+    def select(self, index: TagIndex) -> EntitySet:
+        """Entities of the index matching the filter"""
+        return {entity: None for entity in index.position
+                if self.matches(entity, index.ontology)}
+
+    def matches(self, entity: Entity, ontology: Ontology) -> bool:
+        raise NotImplementedError()
+
+
+class Path:
+    """tag names separated by ->, each name but the last one is a Ref
+    followed in the ontology"""
+
+    def __init__(self, names: List[str]) -> None:
+        self.names = names
+
+    def resolve(self, entity: Entity, ontology: Ontology) -> Optional[Kind]:
+        kind = None
+        for idx, name in enumerate(self.names):
+            if idx > 0:
+                if not isinstance(kind, Ref):
+                    return None
+                try:
+                    entity = ontology[kind]
+                except EntityNotFound:
+                    return None
+            if name == 'id':
+                kind = entity.id
+            elif name in entity:
+                kind = entity[name].kind
+            else:
+                return None
+        return kind
+
+    def __repr__(self) -> str:
+        return '->'.join(self.names)
+
+
+class Has(Filter):
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def estimate(self, index: TagIndex) -> int:
+        return len(index.withTag(self.path.names[0]))
+
+    def select(self, index: TagIndex) -> EntitySet:
+        candidates = index.withTag(self.path.names[0])
+        if len(self.path.names) == 1:
+            return candidates
+        return {entity: None for entity in candidates
+                if self.matches(entity, index.ontology)}
+
+    def matches(self, entity: Entity, ontology: Ontology) -> bool:
+        return self.path.resolve(entity, ontology) is not None
+
+    def __repr__(self) -> str:
+        return f'{self.path}'
+
+
+class Missing(Filter):
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def matches(self, entity: Entity, ontology: Ontology) -> bool:
+        return self.path.resolve(entity, ontology) is None
+
+    def __repr__(self) -> str:
+        return f'not {self.path}'
+
+
+class Cmp(Filter):
+    def __init__(self, path: Path, op: str, value: Kind) -> None:
+        self.path = path
+        self.op = op
+        self.value = value
+        self.key = valueKey(value)
+
+    def estimate(self, index: TagIndex) -> int:
+        if self.op == '==' and len(self.path.names) == 1:
+            return len(index.withValue(self.path.names[0], self.value))
+        return len(index.withTag(self.path.names[0]))
+
+    def select(self, index: TagIndex) -> EntitySet:
+        if self.op == '==' and len(self.path.names) == 1:
+            return index.withValue(self.path.names[0], self.value)
+        return {entity: None for entity in index.withTag(self.path.names[0])
+                if self.matches(entity, index.ontology)}
+
+    def matches(self, entity: Entity, ontology: Ontology) -> bool:
+        kind = self.path.resolve(entity, ontology)
+        if kind is None:
+            return False
+        key = valueKey(kind)
+        if self.op == '==':
+            return key == self.key
+        if self.op == '!=':
+            return key != self.key
+        if key is None:
+            return False
+        # only values of the same kind, and same unit for numbers compare
+        if key[0] != self.key[0] or key[2:] != self.key[2:]:
+            return False
+        if self.op == '<':
+            return key[1] < self.key[1]
+        if self.op == '<=':
+            return key[1] <= self.key[1]
+        if self.op == '>':
+            return key[1] > self.key[1]
+        return key[1] >= self.key[1]
+
+    def __repr__(self) -> str:
+        return f'{self.path} {self.op} {self.value.toZinc}'
+
+
+class And(Filter):
+    def __init__(self, filters: List[Filter]) -> None:
+        self.filters = filters
+
+    def estimate(self, index: TagIndex) -> int:
+        return min(operand.estimate(index) for operand in self.filters)
+
+    def select(self, index: TagIndex) -> EntitySet:
+        # walk the most selective operand, check the others entity by entity
+        filters = sorted(self.filters,
+                         key=lambda operand: operand.estimate(index))
+        candidates = filters[0].select(index)
+        return {entity: None for entity in candidates
+                if all(operand.matches(entity, index.ontology)
+                       for operand in filters[1:])}
+
+    def matches(self, entity: Entity, ontology: Ontology) -> bool:
+        return all(operand.matches(entity, ontology) for operand in self.filters)
+
+    def __repr__(self) -> str:
+        return '(' + ' and '.join(repr(operand) for operand in self.filters) + ')'
+
+
+class Or(Filter):
+    def __init__(self, filters: List[Filter]) -> None:
+        self.filters = filters
+
+    def estimate(self, index: TagIndex) -> int:
+        return sum(operand.estimate(index) for operand in self.filters)
+
+    def select(self, index: TagIndex) -> EntitySet:
+        selected = {}
+        for operand in self.filters:
+            selected.update(operand.select(index))
+        return selected
+
+    def matches(self, entity: Entity, ontology: Ontology) -> bool:
+        return any(operand.matches(entity, ontology) for operand in self.filters)
+
+    def __repr__(self) -> str:
+        return '(' + ' or '.join(repr(operand) for operand in self.filters) + ')'
+
+
+def parse_filter(filter: str) -> Filter:
+    """Parse a Haystack filter"""
+    try:
+        tree = parser.parse(filter)
+    except Exception as error:
+        raise ParseError(f'Filter {filter} malformed: {error}')
+    return _buildFilter(tree)
+
+
+def _buildFilter(tree: Tree) -> Filter:
+    if tree.data == 'cond_or':
+        return Or([_buildFilter(child) for child in tree.children])
+    elif tree.data == 'cond_and':
+        return And([_buildFilter(child) for child in tree.children])
+    elif tree.data == 'has':
+        return Has(_buildPath(tree.children[0]))
+    elif tree.data == 'missing':
+        return Missing(_buildPath(tree.children[0]))
+    elif tree.data == 'cmp':
+        path, op, value = tree.children
+        return Cmp(_buildPath(path), op.value, _buildValue(value))
+    raise ParseError(f'Filter rule {tree.data} not implemented')
+
+
+def _buildPath(tree: Tree) -> Path:
+    return Path([token.value for token in tree.children])
+
+
+def _buildValue(token: Token) -> Kind:
+    if token.type == 'BOOL':
+        return Bool(token.value == 'true')
+    return decodeScalar(token.type, token.value)
+
+
+def select(ontology: Ontology, filter: Filter) -> Iterable[Entity]:
+    """Entities of the ontology matching a parsed filter, in ontology order"""
+    index = TagIndex.of(ontology)
+    return sorted(filter.select(index), key=index.position.__getitem__)
+
+
+def query(ontology: Ontology, filter: str) -> Ontology:
+    """Ontology of the entities matching the Haystack filter"""
+    return Ontology(select(ontology, parse_filter(filter)))
@@ -5,21 +5,30 @@ from datetime import date, datetime, time
 from math import isinf, isnan
 from nis import match
 import re
-from typing import List, MutableSequence, Type, Union
+from typing import Dict, List, MutableSequence, Type, Union
 from zoneinfo import ZoneInfo
-from haystackparser.unitDb import Unit
+from haystackparser.unitDb import Unit, baseValue, conversion
+from haystackparser.zinc_datetime import haystackCity
 import dateutil.parser as dateutil
 
 
-from .exception import ZincFormatException
+from .exception import IncompatibleUnits, ZincFormatException
 
 
 NAME_CHARS = r"^[a-z][a-zA-Z0-9_]+$"
 JSON_KIND = '_kind'
+# significant digits of the base value Numbers with unit compare on
+BASE_DIGITS = 12
+
+DICT_NAME = re.compile(NAME_CHARS)
+REF_NAME = re.compile(r"^@[a-zA-Z0-9_:\-\.~]+$")
+SYMBOL_NAME = re.compile(r"^\^[a-zA-Z0-9_:\-\.~]+$")
+XSTR_TYPE = re.compile(r"^[A-Z][a-zA-Z0-9_]+$")
 
 
 class Kind(ABC):
     """Kind base class"""
+    __slots__ = ()
 
     def __init__(self) -> None:
         super().__init__()
@@ -43,6 +52,19 @@ class Kind(ABC):
 class Marker(Kind):
     """Marker is a singleton used to create "label" tags.
     Markers are used to express typing information."""
+    __slots__ = ()
+
+    _instance = None
+
+    def __new__(cls) -> 'Marker':
+        # one shared instance, Marker() always returns it
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __reduce__(self):
+        return (self.__class__, ())
+
     @property
     def value(self) -> any:
         return "M"
@@ -68,6 +90,19 @@ from t import
     a place holding for missing or invalid data values.
     In Haystack it is most often used in historized data to indicate
     that a timestamp sample is in error."""
+    __slots__ = ()
+
+    _instance = None
+
+    def __new__(cls) -> 'NA':
+        # one shared instance, NA() always returns it
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __reduce__(self):
+        return (self.__class__, ())
+
     @property
     def value(self) -> any:
         return "NA"
@@ -89,6 +124,19 @@ from t import
 class Remove(Kind):
     """Remove is a singleton used in dicts to indicate removal of a tag.
     It is reserved for future HTTP ops that perform entity updates."""
+    __slots__ = ()
+
+    _instance = None
+
+    def __new__(cls) -> 'Remove':
+        # one shared instance, Remove() always returns it
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __reduce__(self):
+        return (self.__class__, ())
+
     @property
     def value(self) -> any:
         return "R"
@@ -109,19 +157,29 @@ class Remove(Kind):
 
 class Bool(Kind):
     """Bool is the truth data type with the two values true and false."""
+    __slots__ = ('_value',)
+
+    _instances: Dict[bool, 'Bool'] = {}
+
+    def __new__(cls, value: bool) -> 'Bool':
+        # Bool(True) and Bool(False) are interned, so value is read only
+        value = bool(value)
+        instance = cls._instances.get(value)
+        if instance is None:
+            instance = cls._instances[value] = super().__new__(cls)
+            instance._value = value
+        return instance
 
     def __init__(self, value: bool) -> None:
-        self.value = value
         super().__init__()
 
+    def __reduce__(self):
+        return (self.__class__, (self._value,))
+
     @property
     def value(self) -> bool:
         return self._value
 
-    @value.setter
-    def value(self, value: bool) -> None:
-        self._value = value
-
     @property
     def toZinc(self) -> str:
         return 'T' if self.value else 'F'
@@ -138,9 +196,14 @@ class Bool(Kind):
         return super().__eq__(other)
 
 
+def _zinc(number: object) -> str:
+    return number.toZinc if isinstance(number, Kind) else repr(number)
+
+
 class Number(Kind):
     """Number is an integer or floating point value with an optional unit of measurement.
     Implementations should represent a number as a 64-bit IEEE 754 floating point and provide 52 bits of lossless integer representation."""
+    __slots__ = ('_value', '_unit')
 
     def __init__(self,  value: float = None, unite: str = None) -> None:
         if not isinstance(value, float):
@@ -172,6 +235,15 @@ class Number(Kind):
         else:
             self._unit = None
 
+    def to(self, unit: Union[str, Unit]) -> 'Number':
+        """Number converted to unit, IncompatibleUnits when the units do not
+        share a dimension"""
+        if self._unit is None:
+            raise IncompatibleUnits(f'Number {self.toZinc} has no unit to convert')
+        scale, shift = conversion(self._unit, unit)
+        return Number(self._value * scale + shift,
+                      unit.symbol if isinstance(unit, Unit) else unit)
+
     @property
     def toZinc(self) -> str:
         if isnan(self.value):
@@ -202,13 +274,159 @@ class Number(Kind):
                 "val": value,
             }
 
+    def _base(self) -> tuple:
+        """dimension key and value in the base unit of the dimension. With a
+        unit the value is rounded to BASE_DIGITS significant digits: the
+        factors of units.txt are not exact, 100°C and 212°F must be equal"""
+        if self._unit is None:
+            return None, self._value
+        key, value = baseValue(self._value, self._unit)
+        return key, float(f'{value:.{BASE_DIGITS}g}')
+
+    @staticmethod
+    def _operand(other: object) -> Union[tuple, None]:
+        """unit and value of other, None when other is not a number. A float
+        or an int is a number without unit"""
+        if isinstance(other, Number):
+            return other._unit, other._value
+        if isinstance(other, (float, int)) and not isinstance(other, bool):
+            return None, float(other)
+        return None
+
+    def _other(self, other: object) -> Union[float, None]:
+        """value of other in the unit of self, None when other is not a
+        number. A number without unit only combines with another one"""
+        operand = self._operand(other)
+        if operand is None:
+            return None
+        unit, value = operand
+        if unit is self._unit:
+            return value
+        if unit is None or self._unit is None:
+            raise IncompatibleUnits(
+                f'Cannot combine {self.toZinc} and {_zinc(other)}')
+        scale, shift = conversion(unit, self._unit)
+        return value * scale + shift
+
+    def _compare(self, other: object) -> Union[tuple, None]:
+        """base values of self and other, None when other is not a number.
+        As for _other, a number without unit only compares to another one"""
+        if isinstance(other, Number):
+            otherKey, otherValue = other._base()
+        elif isinstance(other, (float, int)) and not isinstance(other, bool):
+            otherKey, otherValue = None, float(other)
+        else:
+            return None
+        key, value = self._base()
+        if key != otherKey:
+            raise IncompatibleUnits(
+                f'Cannot compare {self.toZinc} and {_zinc(other)}')
+        return value, otherValue
+
+    def _number(self, value: float) -> 'Number':
+        return Number(value, self._unit.symbol if self._unit else None)
+
     def __eq__(self, other: object) -> bool:
-        if isinstance(other, float):
-            return self.value == other
-        elif isinstance(other, int):
-            return self.value == float(other)
+        """A Number with unit equals a Number in a compatible unit with the
+        same rounded base value, a Number without unit equals the same
+        Number, float or int"""
+        if isinstance(other, Number):
+            return self._base() == other._base()
+        if isinstance(other, (float, int)):
+            return self._unit is None and self._value == other
         return super().__eq__(other)
 
+    def __hash__(self) -> int:
+        if self._unit is None:
+            return hash(self._value)
+        return hash(self._base())
+
+    def __lt__(self, other: object) -> bool:
+        values = self._compare(other)
+        if values is None:
+            return NotImplemented
+        return values[0] < values[1]
+
+    def __le__(self, other: object) -> bool:
+        values = self._compare(other)
+        if values is None:
+            return NotImplemented
+        return values[0] <= values[1]
+
+    def __gt__(self, other: object) -> bool:
+        values = self._compare(other)
+        if values is None:
+            return NotImplemented
+        return values[0] > values[1]
+
+    def __ge__(self, other: object) -> bool:
+        values = self._compare(other)
+        if values is None:
+            return NotImplemented
+        return values[0] >= values[1]
+
+    def __add__(self, other: object) -> 'Number':
+        value = self._other(other)
+        if value is None:
+            return NotImplemented
+        return self._number(self._value + value)
+
+    def __radd__(self, other: object) -> 'Number':
+        # the int 0 is the start value of sum()
+        if type(other) is int and other == 0:
+            return self._number(self._value)
+        return self.__add__(other)
+
+    def __sub__(self, other: object) -> 'Number':
+        value = self._other(other)
+        if value is None:
+            return NotImplemented
+        return self._number(self._value - value)
+
+    def __rsub__(self, other: object) -> 'Number':
+        value = self._other(other)
+        if value is None:
+            return NotImplemented
+        return self._number(value - self._value)
+
+    def __mul__(self, other: object) -> 'Number':
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        unit, value = operand
+        if unit is not None:
+            if self._unit is not None:
+                raise IncompatibleUnits(
+                    f'Cannot multiply {self.toZinc} by {other.toZinc}')
+            return other._number(self._value * value)
+        return self._number(self._value * value)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: object) -> 'Number':
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        unit, value = operand
+        if unit is not None:
+            if self._unit is None:
+                raise IncompatibleUnits(
+                    f'Cannot divide {self.toZinc} by {other.toZinc}')
+            # same dimension, a ratio without unit
+            return Number(self._value / self._other(other))
+        return self._number(self._value / value)
+
+    def __rtruediv__(self, other: object) -> 'Number':
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        if self._unit is not None:
+            raise IncompatibleUnits(f'Cannot divide by {self.toZinc}')
+        return Number(operand[1] / self._value)
+
+    def __neg__(self) -> 'Number':
+        return self._number(-self._value)
+
 
 class Str(Kind):
     """Str is a sequence of zero or more Unicode characters.
@@ -224,11 +442,19 @@ Note that Zinc and Trio require the "$" character to be backslash escaped.
 
 Strings are also used for enumerated types. Enumerations define their range via the enum type.
 """
+    __slots__ = ('_value',)
 
     def __init__(self,  value: str) -> None:
         self._value = value.replace('\$', '$')
         super().__init__()
 
+    @classmethod
+    def trusted(cls, value: str) -> 'Str':
+        """Str of a value already unescaped, by the Zinc reader for instance"""
+        text = cls.__new__(cls)
+        text._value = value
+        return text
+
     @property
     def value(self) -> str:
         return self._value
@@ -268,6 +494,7 @@ Encodings:
 
 // JSON
 { "_kind": "uri", "val": "http://project-haystack.org/" }"""
+    __slots__ = ('_value',)
 
     def __init__(self, value: str) -> None:
         self.value = value
@@ -300,19 +527,28 @@ Encodings:
 
 class Ref(Kind):
     """reference used to identify an entity instance"""
+    __slots__ = ('_value', '_displayname')
 
     def __init__(self,  value: str, displayname: str = None) -> None:
         self.value = value
         self.displayname = displayname
         super().__init__()
 
+    @classmethod
+    def trusted(cls, value: str, displayname: str = None) -> 'Ref':
+        """Ref of a value already checked, by a parser grammar for instance"""
+        ref = cls.__new__(cls)
+        ref._value = value
+        ref._displayname = displayname
+        return ref
+
     @property
     def value(self) -> str:
         return self._value
 
     @value.setter
     def value(self, val) -> any:
-        if not re.match(r"^@[a-zA-Z0-9_:\-\.~]+$", val):
+        if not REF_NAME.match(val):
             raise ZincFormatException(f'Ref tag name {val} malformed')
         self._value = val
 
@@ -360,18 +596,26 @@ Although only a subset of these punctuation characters are used today.
 Dashes are used for conjunct symbols and the colon is used for feature key symbols.
 
 Symbols are encoded using "^" as a prefix:"""
+    __slots__ = ('_value',)
 
     def __init__(self,  value: str) -> None:
         self.value = value
         super().__init__()
 
+    @classmethod
+    def trusted(cls, value: str) -> 'Symbol':
+        """Symbol of a value already checked, by a parser grammar for instance"""
+        symbol = cls.__new__(cls)
+        symbol._value = value
+        return symbol
+
     @property
     def value(self) -> str:
         return self._value
 
     @value.setter
     def value(self, val) -> any:
-        if not re.match(r"^\^[a-zA-Z0-9_:\-\.~]+$", val):
+        if not SYMBOL_NAME.match(val):
             raise ZincFormatException(f'Ref symbol name {val} malformed')
         self._value = val
 
@@ -394,6 +638,7 @@ Symbols are encoded using "^" as a prefix:"""
 
 class HaystackDate(Kind):
     """Date is an ISO 8601 calendar date. It is encoded as YYYY-MM-DD:"""
+    __slots__ = ('_value',)
 
     def __init__(self, value: date) -> None:
         self.value = value
@@ -426,6 +671,7 @@ class HaystackDate(Kind):
 
 class HaystackTime(Kind):
     """Time is an ISO 8601 time of day. It is encoded as hh:mm:ss.sss:"""
+    __slots__ = ('_value',)
 
     def __init__(self,  value: time) -> None:
         self.value = value
@@ -465,6 +711,7 @@ class HaystackDateTime(Kind):
     Haystack requires all timestamps to include a timezone.
     Timezone names are standardized in the timezone database (city name from zoneinfo database).
     Implementations should support DateTime precision at least down to the millisecond."""
+    __slots__ = ('_value',)
 
     def __init__(self,  value: datetime = None, tz=ZoneInfo) -> None:
         self.value = value
@@ -484,14 +731,7 @@ class HaystackDateTime(Kind):
 
     @property
     def city(self):
-        zone = str(self.tz).split('/')
-
-        if len(zone) == 2:
-            return zone[1]
-        else:
-            if zone[0] == "None":
-                return None
-            return zone[0]
+        return haystackCity(self.tz)
 
     @property
     def toZinc(self) -> str:
@@ -524,6 +764,7 @@ class Coord(Kind):
     Implementations should support precision down to the micro-degree (6 decimal places)
     which provides accuracy to ~100mm and can be packed into a 64-bit integer.
     Coord is encoded using positive/negative latitude, longitude in decimal degrees"""
+    __slots__ = ('_lat', '_lng')
 
     def __init__(self,  lat: float = None, lng: float = None) -> None:
 
@@ -533,47 +774,45 @@ class Coord(Kind):
 
     @property
     def value(self) -> dict:
-        return self._value
+        return {
+            "lat": self._lat,
+            "lng": self._lng
+        }
 
     def _set_value(self, lat: float, lng: float) -> any:
-        self._value = {
-            "lat": lat,
-            "lng": lng
-        }
+        self._lat = lat
+        self._lng = lng
 
     @property
     def lat(self) -> float:
-        return self._value['lat']
+        return self._lat
 
     @lat.setter
     def lat(self, value: float) -> None:
-        self._value['lat'] = value
+        self._lat = value
 
     @property
     def lng(self) -> float:
-        return self._value['lng']
+        return self._lng
 
     @lng.setter
     def lng(self, value: float) -> None:
-        self._value['lng'] = value
+        self._lng = value
 
     @value.setter
     def value(self, lat: float, lng: float) -> dict:
-        self._value = {
-            "lat": lat,
-            "lng": lng
-        }
+        self._set_value(lat, lng)
 
     @property
     def toZinc(self) -> str:
-        return f'C({self.value["lat"]},{self.value["lng"]})'
+        return f'C({self._lat},{self._lng})'
 
     @property
     def toJson(self) -> dict:
         return {
             JSON_KIND: 'coord',
-            "lat": self.value["lat"],
-            "lng": self.value["lng"]
+            "lat": self._lat,
+            "lng": self._lng
         }
 
 
@@ -585,40 +824,41 @@ class XStr(Kind):
     The type name is not currently standardized by Project Haystack. 
     However it should be assumed that future versions of this specification
     may standardize a set of XStr type names."""
+    __slots__ = ('_type', '_value')
 
     def __init__(self,  type: str = None, value: str = None,) -> None:
-        self._value = {
-            "value": None,
-            "type": None
-        }
         self.type = type
         self.value = value
         super().__init__()
 
-    @property
-    def value(self) -> dict:
-        return self._value
+    @classmethod
+    def trusted(cls, type: str, value: str) -> 'XStr':
+        """XStr of a type name already checked, by a parser grammar for instance"""
+        xstr = cls.__new__(cls)
+        xstr._type = type
+        xstr._value = value
+        return xstr
 
     @property
     def type(self) -> str:
-        return self._value['type']
+        return self._type
 
     @type.setter
     def type(self, value: str) -> None:
-        if (not re.match(r"^[A-Z][a-zA-Z0-9_]+$", value)):
+        if (not XSTR_TYPE.match(value)):
             raise ZincFormatException(
                 f'type name "{value}" is incorrect'
             )
 
-        self._value['type'] = value
+        self._type = value
 
     @property
     def value(self) -> str:
-        return self._value['value']
+        return self._value
 
     @value.setter
     def value(self, value: str) -> None:
-        self._value['value'] = value
+        self._value = value
 
     @property
     def toZinc(self) -> str:
@@ -634,6 +874,8 @@ class XStr(Kind):
 
 
 class HaystackList(MutableSequence, Kind):
+    __slots__ = ('_value',)
+
     def __init__(self, initValue: List[Kind] = None) -> None:
         self._value: list[Kind] = []
 
@@ -689,14 +931,16 @@ class HaystackList(MutableSequence, Kind):
         return _str[0:-2] + "]"
 
     @property
-    def toJson(self) -> dict:
-        return self._value 
+    def toJson(self) -> list:
+        return [kind.toJson for kind in self._value]
 
 
 
 class HaystackDict(dict[str, Kind], Kind):
+    __slots__ = ()
+
     def __setitem__(self, key: str, value: Kind) -> None:
-        _match = re.match(NAME_CHARS, key)
+        _match = DICT_NAME.match(key)
         if not _match:
             raise NameError(f'Name {key} malformed')
         if not isinstance(value, Kind):
@@ -709,10 +953,8 @@ class HaystackDict(dict[str, Kind], Kind):
 
     @property
     def toZinc(self) -> str:
-        _str = '{'
-        for name, kind in list(self.items()):
-            _str += f'{name}:{kind.toZinc}, '
-        return _str[0:-2] + '}'
+        return '{' + ', '.join(
+            f'{name}:{kind.toZinc}' for name, kind in self.items()) + '}'
 
     @property
     def toJson(self) -> dict:
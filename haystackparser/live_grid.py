@@ -0,0 +1,131 @@
+"""Grid following the changes of its ontology
+
+    grid = LiveGrid(ontology)
+    ontology[Ref('@p1')]['curVal'] = Tag('curVal', Number(21.0, '°C'))
+    grid.toZinc()
+
+The grid subscribes to the ontology: an appended, replaced or deleted
+entity adds or drops its row, a tag set, added or deleted on an entity
+patches its row only. The Zinc text of each row is kept until the row
+changes, so serializing again after a few changes only encodes those rows.
+Columns are in the order they appeared, a column without any cell left is
+dropped."""
+from typing import Dict, Iterator, List, Optional
+
+from .kinds import Kind
+from .ontology import Entity, Grid, Ontology
+
+
+class LiveGrid(Grid):
+    """Grid of an ontology, patched on each change of the ontology"""
+
+    def __init__(self, ontology: Ontology) -> None:
+        self._ontology = ontology
+        # entity -> its row, its Zinc text once encoded
+        self._rowOf: Dict[Entity, List[Optional[Kind]]] = {}
+        self._zincOf: Dict[Entity, str] = {}
+        # column name -> number of rows with a cell in it
+        self._cellCount: Dict[str, int] = {}
+        # False when _rows is not in the order of the ontology any more
+        self._ordered = True
+        super().__init__()
+        for entity in ontology.entities:
+            self._entityAdded(entity)
+        ontology._observers.add(self)
+
+    @property
+    def _row(self) -> List[List[Optional[Kind]]]:
+        if not self._ordered:
+            self._rows = [self._rowOf[entity]
+                          for entity in self._ontology.entities]
+            self._ordered = True
+        return self._rows
+
+    @_row.setter
+    def _row(self, rows: List[List[Optional[Kind]]]) -> None:
+        self._rows = rows
+
+    def updateGrid(self, ontology: Ontology):
+        raise NotImplementedError('A LiveGrid only follows its own ontology')
+
+    def _fill(self, entity: Entity, row: List[Optional[Kind]]) -> None:
+        """cells of the entity into row, as Grid.updateGrid does"""
+        idIdx = self._addColumn('id')
+        row[:] = [None] * len(self._columns)
+        row[idIdx] = entity.id
+        for tag in entity.tags:
+            idx = self._addColumn(tag.name)
+            if idx >= len(row):
+                row.extend([None] * (len(self._columns) - len(row)))
+            row[idx] = tag.kind
+        self._count(row, 1)
+
+    def _count(self, row: List[Optional[Kind]], delta: int) -> List[str]:
+        """add delta to the cell count of the columns of row, return the
+        columns left without cells"""
+        emptyColumns = []
+        for idx, kind in enumerate(row):
+            if kind is not None:
+                name = self._columns[idx]
+                count = self._cellCount[name] = self._cellCount.get(name, 0) + delta
+                if count == 0:
+                    emptyColumns.append(name)
+        return emptyColumns
+
+    def _dropEmpty(self, names: List[str]) -> None:
+        for name in names:
+            if self._cellCount.get(name) == 0:
+                self._dropColumn(self._columnIndex[name])
+
+    def _dropColumn(self, idx: int) -> None:
+        del self._cellCount[self._columns[idx]]
+        del self._columns[idx]
+        self._columnIndex = {name: position
+                             for position, name in enumerate(self._columns)}
+        for row in self._rowOf.values():
+            if idx < len(row):
+                del row[idx]
+        # every row after the column moved
+        self._zincOf.clear()
+
+    def _entityAdded(self, entity: Entity) -> None:
+        row: List[Optional[Kind]] = []
+        self._fill(entity, row)
+        self._rowOf[entity] = row
+        entities = self._ontology.entities
+        if self._ordered and len(self._rows) == len(entities) - 1 \
+                and entities[-1] is entity:
+            self._rows.append(row)
+        else:
+            self._ordered = False
+
+    def _entityRemoved(self, entity: Entity) -> None:
+        row = self._rowOf.pop(entity)
+        self._zincOf.pop(entity, None)
+        self._dropEmpty(self._count(row, -1))
+        self._ordered = False
+
+    def _entityChanged(self, entity: Entity) -> None:
+        row = self._rowOf[entity]
+        self._zincOf.pop(entity, None)
+        emptyColumns = self._count(row, -1)
+        self._fill(entity, row)
+        # a column of a tag set again is kept in place
+        self._dropEmpty(emptyColumns)
+
+    def _zinc(self, entity: Entity) -> str:
+        zinc = self._zincOf.get(entity)
+        if zinc is None:
+            zinc = self._zincOf[entity] = ', '.join(
+                kind.toZinc if isinstance(kind, Kind) else ''
+                for kind in self._rowOf[entity]) + '\n'
+        return zinc
+
+    def iter_zinc(self, chunkSize: int = 1000) -> Iterator[str]:
+        """Zinc text of the grid in chunks, the rows left unchanged since the
+        last call are not encoded again"""
+        yield 'ver:"3.0"\n' + (', '.join(self._columns) or 'empty') + '\n'
+        entities = self._ontology.entities
+        for start in range(0, len(entities), chunkSize):
+            yield ''.join(self._zinc(entity)
+                          for entity in entities[start:start + chunkSize])
@@ -3,15 +3,17 @@
 
 import re
 from collections.abc import MutableSequence
-from typing import Any, List, Union
+from typing import Any, Callable, Dict, Iterator, List, TextIO, Union
 from uuid import uuid4
+from weakref import WeakSet
 
 from haystackparser.exception import (DontChangeTagName, DuplicateEntity, DuplicateTag, EntityNotFound, TagNotFound,
                                       ZincFormatException)
 from haystackparser.kinds import (NA, Bool, Coord, HaystackDate, HaystackDateTime, HaystackDict, HaystackList,
                                   HaystackTime, HaystackUri, Kind, Marker, Number, Ref,
                                   Remove, Str, Symbol, XStr)
-from haystackparser.util import populateListWithNone
+
+TAG_NAME = re.compile(r'^(^[a-z][a-zA-Z0-9_]*)$')
 
 Kinds = Union[Marker, NA, Remove, Bool, Number, Str,
               HaystackUri, Ref, Symbol, HaystackDate,
@@ -21,13 +23,38 @@ Kinds = Union[Marker, NA, Remove, Bool, Number, Str,
 
 
 class Tag:
+    __slots__ = ('_name', '_value', '_raw')
+
     def __init__(self, tagName: str, data: Kinds) -> None:
-        if(not re.match(r'^(^[a-z][a-zA-Z0-9_]*)$', tagName)):
+        if(not TAG_NAME.match(tagName)):
             raise ZincFormatException(f'Tag name : {tagName} is malformed')
         self._name = tagName
         if not (isinstance(data, Kind) ):
             raise TypeError('Please Use only Kinds')
         self._value = data
+        self._raw = None
+
+    @classmethod
+    def lazy(cls, tagName: str, decode: Callable[..., Kinds], *raw: str) -> 'Tag':
+        """Tag keeping the raw text of its value, decode(*raw) builds the kind
+        on first access"""
+        if(not TAG_NAME.match(tagName)):
+            raise ZincFormatException(f'Tag name : {tagName} is malformed')
+        tag = cls.__new__(cls)
+        tag._name = tagName
+        tag._value = None
+        tag._raw = (decode,) + raw
+        return tag
+
+    @classmethod
+    def trusted(cls, tagName: str, data: Kinds) -> 'Tag':
+        """Tag of a name and kind already checked, by a parser grammar for
+        instance"""
+        tag = cls.__new__(cls)
+        tag._name = tagName
+        tag._value = data
+        tag._raw = None
+        return tag
 
     @property
     def name(self) -> str:
@@ -35,8 +62,16 @@ class Tag:
 
     @property
     def kind(self) -> Kinds:
+        if self._value is None:
+            decode, *raw = self._raw
+            self._value = decode(*raw)
+            self._raw = None
         return self._value
 
+    @property
+    def value(self) -> Any:
+        return self.kind.value
+
     def __call__(self) -> Kinds:
         return self.kind
 
@@ -44,8 +79,14 @@ class Tag:
         return f'{self.name}:{self.kind.toZinc}'
 
 class Entity(MutableSequence):
+    __slots__ = ('_id', '_tags', '_tagIndex', '_ontologies')
+
     def __init__(self, id: Ref = None, initValue: List[Tag] = None) -> None:
         self._tags: list[Tag] = []
+        # tag name -> position in _tags, kept in sync with _tags
+        self._tagIndex: Dict[str, int] = {}
+        # ontologies holding this entity, they index it by id
+        self._ontologies: WeakSet[Ontology] = WeakSet()
 
         if(id != None):
             self.id = id  # ref
@@ -62,7 +103,21 @@ class Entity(MutableSequence):
 
     @id.setter
     def id(self, id: Ref) -> None:
+        for ontology in self._ontologies:
+            ontology._checkId(self, id)
+        oldId = getattr(self, '_id', None)
         self._id = id
+        for ontology in self._ontologies:
+            ontology._reindex(self, oldId)
+
+    def __getstate__(self) -> dict:
+        return {'_id': self._id, '_tags': self._tags,
+                '_tagIndex': self._tagIndex}
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._ontologies = WeakSet()
 
     def insert(self, index: int, value: Tag) -> None:
         raise NotImplementedError('Use append')
@@ -71,8 +126,7 @@ class Entity(MutableSequence):
         if isinstance(index, int) or isinstance(index, slice):
             return self._tags[index]
         elif isinstance(index, str):
-            idx, tag = self._getTagByName(index)
-            return tag
+            return self._getTagByName(index)
         else:
             raise NotImplementedError()
 
@@ -80,12 +134,14 @@ class Entity(MutableSequence):
         if isinstance(index, int):
             if self._tags[index].name == value.name:
                 self._tags[index] = value
+                self._changed()
             else:
                 raise DontChangeTagName()
         elif isinstance(index, str):
-            idx, data = self._getTagByName(index)
-            if self._tags[idx].name == value.name:
-                self._tags[idx] = value
+            position = self._getTagPosition(index)
+            if index == value.name:
+                self._tags[position] = value
+                self._changed()
             else:
                 raise DontChangeTagName()
 
@@ -96,35 +152,65 @@ class Entity(MutableSequence):
             raise TypeError('Function only accept Int, slice or str in index')
 
     def __delitem__(self, index: Union[int, str, slice]) -> None:
-        if isinstance(index, int) or isinstance(index, slice):
+        if isinstance(index, int):
+            position = range(len(self._tags))[index]
+            del self._tagIndex[self._tags[position].name]
+            del self._tags[position]
+            self._reindexTags(position)
+        elif isinstance(index, slice):
+            for data in self._tags[index]:
+                del self._tagIndex[data.name]
             del self._tags[index]
+            self._reindexTags(0)
         elif isinstance(index, str):
-            idx, data = self._getTagByName(index)
-            del self._tags[idx]
+            position = self._getTagPosition(index)
+            del self._tagIndex[index]
+            del self._tags[position]
+            self._reindexTags(position)
         else:
             raise TypeError('Function only accept Int, slice or Ref in index')
+        self._changed()
 
     def __len__(self) -> int:
         return len(self._tags)
 
-    def _getTagByName(self, name: str):
-        for idx, tag in enumerate(self._tags):
-            if tag.name == name:
-                return idx, tag
-        raise TagNotFound(
-            f'Tag with {name} not found in entity {self.id.value}')
+    def __contains__(self, value: Union[str, Tag]) -> bool:
+        if isinstance(value, str):
+            return value in self._tagIndex
+        return super().__contains__(value)
+
+    def _getTagByName(self, name: str) -> Tag:
+        return self._tags[self._getTagPosition(name)]
+
+    def _getTagPosition(self, name: str) -> int:
+        try:
+            return self._tagIndex[name]
+        except KeyError:
+            raise TagNotFound(
+                f'Tag with {name} not found in entity {self.id.value}')
+
+    def _reindexTags(self, start: int) -> None:
+        """positions of the tags from start on, after a deletion"""
+        for position in range(start, len(self._tags)):
+            self._tagIndex[self._tags[position].name] = position
 
     def _addTag(self, value: Tag):
         """add a tag to the entity, Raise an error if a tag with same name exist"""
         if not isinstance(value, Tag):
             raise TypeError('Entity accept only Tag ')
 
-        try:
-            idx, tag = self._getTagByName(value.name)
+        if value.name in self._tagIndex:
             raise DuplicateTag(
                 f'Tag with name {value.name} already in entity {self.id.value}')
-        except TagNotFound:
-            self._tags.append(value)
+        self._tagIndex[value.name] = len(self._tags)
+        self._tags.append(value)
+        self._changed()
+
+    def _changed(self):
+        """tell the ontologies holding this entity that its tags changed"""
+        if self._ontologies:
+            for ontology in self._ontologies:
+                ontology._entityChanged(self)
 
     def append(self, value: Tag) -> None:
         self._addTag(value)
@@ -143,6 +229,12 @@ class Entity(MutableSequence):
 class Ontology(MutableSequence):
     def __init__(self, initvalue: List[Entity] = None) -> None:
         self._entities: List[Entity] = []
+        # ref value -> entity, kept in sync with _entities
+        self._index: Dict[str, Entity] = {}
+        # indexes derived from the entities and their tags, dropped on change
+        self._cache: Dict[Any, Any] = {}
+        # views patched on change (LiveGrid), told through _notify
+        self._observers: WeakSet = WeakSet()
         if initvalue is not None:
             for data in initvalue:
                 self._add_entity(data)
@@ -155,8 +247,7 @@ class Ontology(MutableSequence):
             return self._entities[index]
         elif isinstance(index, Ref):
             # issume one entity ref is unic
-            idx, data = self._getEntityByRef(index)
-            return data
+            return self._getEntityByRef(index)
         elif isinstance(index, slice):
             return self.__class__(self._entities[index])
         else:
@@ -164,10 +255,10 @@ class Ontology(MutableSequence):
 
     def __setitem__(self, index: Union[int, Ref, slice], value: Entity) -> None:
         if isinstance(index, int):
-            self._entities[index] = value
+            self._replace_entity(index, value)
         elif isinstance(index, Ref):
-            idx, data = self._getEntityByRef(index)
-            self._entities[idx] = value
+            data = self._getEntityByRef(index)
+            self._replace_entity(self._entities.index(data), value)
         elif isinstance(index, slice):
             raise NotImplementedError(
                 "Update Ontology by slice is unsupported")
@@ -175,13 +266,24 @@ class Ontology(MutableSequence):
             raise TypeError('Function only accept Int, slice or Ref in index')
 
     def __delitem__(self, index: Union[int, Ref, slice]) -> None:
-        if isinstance(index, int) or isinstance(index, slice):
+        if isinstance(index, int):
+            removed = [self._entities[index]]
+            self._unindex(removed[0])
+            del self._entities[index]
+        elif isinstance(index, slice):
+            removed = self._entities[index]
+            for data in removed:
+                self._unindex(data)
             del self._entities[index]
         elif isinstance(index, Ref):
-            idx, data = self._getEntityByRef(index)
-            del self._entities[idx]
+            removed = [self._getEntityByRef(index)]
+            self._unindex(removed[0])
+            self._entities.remove(removed[0])
         else:
             raise TypeError('Function only accept Int, slice or Ref in index')
+        # observers see the ontology without the entities
+        for data in removed:
+            self._notify('_entityRemoved', data)
 
     def __len__(self) -> int:
         return len(self._entities)
@@ -193,22 +295,94 @@ class Ontology(MutableSequence):
         if not isinstance(index, Ref):
             raise TypeError('Use only Ref in index')
 
-        for idx, data in enumerate(self._entities):
-            if data.id == index:
-                return idx, data
-        raise EntityNotFound(f'Entity {index.value} not found')
+        try:
+            return self._index[index.value]
+        except KeyError:
+            raise EntityNotFound(f'Entity {index.value} not found')
 
     def _add_entity(self, entity: Entity):
         """add an entity, raise an error if an another entity with same id  in ontology"""
         if not isinstance(entity, Entity):
             raise TypeError('Ontologie accept only Entity')
 
-        try:
-            self._getEntityByRef(entity.id)
+        if entity.id.value in self._index:
+            raise DuplicateEntity(
+                f'Entity with ref {entity.id.value} already in ontology')
+        self._entities.append(entity)
+        self._index[entity.id.value] = entity
+        entity._ontologies.add(self)
+        self._changed()
+        self._notify('_entityAdded', entity)
+
+    def _replace_entity(self, idx: int, entity: Entity):
+        """replace the entity at idx, raise an error if an another entity with same id in ontology"""
+        if not isinstance(entity, Entity):
+            raise TypeError('Ontologie accept only Entity')
+
+        oldEntity = self._entities[idx]
+        if oldEntity is entity:
+            return
+        if self._index.get(entity.id.value, oldEntity) is not oldEntity:
             raise DuplicateEntity(
                 f'Entity with ref {entity.id.value} already in ontology')
-        except EntityNotFound:
-            self._entities.append(entity)
+        self._unindex(oldEntity)
+        self._entities[idx] = entity
+        self._index[entity.id.value] = entity
+        entity._ontologies.add(self)
+        self._changed()
+        self._notify('_entityRemoved', oldEntity)
+        self._notify('_entityAdded', entity)
+
+    def _unindex(self, entity: Entity):
+        """drop the entity from the index, the caller removes it from the
+        entities then notifies the observers"""
+        del self._index[entity.id.value]
+        entity._ontologies.discard(self)
+        self._changed()
+
+    def _checkId(self, entity: Entity, id: Ref):
+        """raise an error if another entity of the ontology use this id"""
+        if self._index.get(id.value, entity) is not entity:
+            raise DuplicateEntity(
+                f'Entity with ref {id.value} already in ontology')
+
+    def _reindex(self, entity: Entity, oldId: Ref):
+        """called by the entity when its id change"""
+        if oldId is not None and self._index.get(oldId.value) is entity:
+            del self._index[oldId.value]
+        self._index[entity.id.value] = entity
+        self._entityChanged(entity)
+
+    def _changed(self):
+        """drop the derived indexes, they are rebuilt on next use"""
+        if self._cache:
+            self._cache.clear()
+
+    def _entityChanged(self, entity: Entity):
+        """called by the entity when its id or its tags change"""
+        if not self._cache and not self._observers:
+            # nothing derived from the entities, as while parsing
+            return
+        self._changed()
+        self._notify('_entityChanged', entity)
+
+    def _notify(self, event: str, entity: Entity):
+        """call event(entity) on the observers"""
+        if self._observers:
+            for observer in list(self._observers):
+                getattr(observer, event)(entity)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        del state['_observers']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._observers = WeakSet()
+        for entity in self._entities:
+            entity._ontologies.add(self)
 
     def trio_dumper(self) -> str:
         trioStr= ''
@@ -218,48 +392,119 @@ class Ontology(MutableSequence):
             trioStr += f'{entity.trio_dumper()}'
         return trioStr
 
+    def to_json(self) -> str:
+        """Hayson array of the entities"""
+        from haystackparser.hayson import iter_ontology
+        return ''.join(iter_ontology(self))
+
+    def write_json(self, fp: TextIO, chunkSize: int = 1000) -> None:
+        """Write the Hayson array of the entities, chunkSize entities at a time"""
+        from haystackparser.hayson import iter_ontology, write
+        write(iter_ontology(self, chunkSize), fp)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Ontology':
+        """Ontology of a Hayson array of entities or of a Hayson grid"""
+        from haystackparser.hayson import load_ontology
+        return load_ontology(text)
+
     @property
     def entities(self):
         return self._entities
 
 class Grid:
-    def __init__(self, ontology: Ontology) -> None:
+    def __init__(self, ontology: Ontology = None) -> None:
         self._columns: List[str] = []
+        # column name -> position in _columns
+        self._columnIndex: Dict[str, int] = {}
         self._row:List[List[Kinds]] = []
-        self.updateGrid(ontology)
+        if ontology is not None:
+            self.updateGrid(ontology)
 
 
-    def _addColumn(self, columnName):
-        if not columnName in self._columns:
+    def _addColumn(self, columnName) -> int:
+        """position of the column, added at the end if missing"""
+        idx = self._columnIndex.get(columnName)
+        if idx is None:
+            idx = self._columnIndex[columnName] = len(self._columns)
             self._columns.append(columnName)
+        return idx
 
     def updateGrid(self, ontology: Ontology ):
         for entity in ontology.entities:
-            self._addColumn('id')
-            _row:List[Kinds] = []
-            _row =  populateListWithNone(_row, len(self._columns))
-            _row[self._columns.index('id')] =  entity.id
+            # a row is as long as the columns known once its entity is added
+            idIdx = self._addColumn('id')
+            _row:List[Kinds] = [None] * len(self._columns)
+            _row[idIdx] = entity.id
             for tag in entity.tags:
-                self._addColumn(tag.name)
-                _row =  populateListWithNone(_row, len(self._columns))
-                _row[self._columns.index(tag.name)] = tag.kind
+                idx = self._addColumn(tag.name)
+                if idx >= len(_row):
+                    _row.extend([None] * (len(self._columns) - len(_row)))
+                _row[idx] = tag.kind
 
             self._row.append(_row)
 
-    def toZinc(self) -> str:
-        _str = 'ver:"3.0"\n' # add meta
-        for col in self._columns:
-            _str += f'{col}, '
-        _str = _str[0:-2] + "\n"
+    def toOntology(self) -> Ontology:
+        """Ontology of the rows, the id column gives the entity ids"""
+        myOntology = Ontology()
+        idIdx = self._columnIndex.get('id')
         for row in self._row:
-            for kind in row:
-                if isinstance(kind, Kind):
-                    _str += f'{kind.toZinc}, '
+            id = None
+            tags = []
+            for idx, kind in enumerate(row):
+                if kind is None:
+                    continue
+                if idx == idIdx and isinstance(kind, Ref):
+                    id = kind
                 else:
-                    _str += ', '
-            _str = _str[0:-2] + "\n"
-        return _str
+                    tags.append(Tag(self._columns[idx], kind))
+            myOntology.append(Entity(id, tags))
+        return myOntology
+
+    def iter_zinc(self, chunkSize: int = 1000) -> Iterator[str]:
+        """Zinc text of the grid in chunks: the header, then chunkSize rows
+        at a time"""
+        # a grid without columns has the single column empty
+        yield 'ver:"3.0"\n' + (', '.join(self._columns) or 'empty') + '\n' # add meta
+        for start in range(0, len(self._row), chunkSize):
+            yield ''.join(
+                ', '.join(kind.toZinc if isinstance(kind, Kind) else ''
+                          for kind in row) + '\n'
+                for row in self._row[start:start + chunkSize])
+
+    def write_zinc(self, fp: TextIO, chunkSize: int = 1000) -> None:
+        """Write the grid to a text stream, chunkSize rows at a time"""
+        for chunk in self.iter_zinc(chunkSize):
+            fp.write(chunk)
+
+    def toZinc(self) -> str:
+        return ''.join(self.iter_zinc())
+
+    def to_json(self) -> str:
+        """Hayson grid"""
+        from haystackparser.hayson import iter_grid
+        return ''.join(iter_grid(self))
+
+    def write_json(self, fp: TextIO, chunkSize: int = 1000) -> None:
+        """Write the Hayson grid, chunkSize rows at a time"""
+        from haystackparser.hayson import iter_grid, write
+        write(iter_grid(self, chunkSize), fp)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Grid':
+        from haystackparser.hayson import load_grid
+        return load_grid(text)
+
+    def to_numpy(self, column: str, unit: str = None):
+        """(values, mask, meta) numpy arrays of a column, its numbers
+        converted to unit when given, see grid_export"""
+        from haystackparser.grid_export import to_numpy
+        return to_numpy(self, column, unit)
+
+    def to_arrow(self):
+        """pyarrow Table of the grid, see grid_export"""
+        from haystackparser.grid_export import to_arrow
+        return to_arrow(self)
 
     def __repr__(self) -> str:
         return self.toZinc()
-        
\ No newline at end of file
@@ -0,0 +1,418 @@
+"""Binary snapshot of an ontology, opened with mmap and decoded lazily
+
+    snapshot.save(ontology, 'site.hsnap')
+    with snapshot.Snapshot('site.hsnap') as mySnapshot:
+        entity = mySnapshot[Ref('@ahu1')]
+
+Layout, little endian:
+
+    header      magic, version, string and entity counts, table positions
+    entities    one record per entity: id, display name, tags
+    strings     offsets then utf-8 blob of every distinct string (tag
+                names, refs, units...), each string is stored once
+    entity idx  offset of each entity record
+    id idx      entity positions sorted by id, for the binary search of refs
+
+A tag is its name index and its kind: a type byte, then fixed width fields
+(float64 for Number and Coord, day ordinal for Date, microseconds for Time
+and DateTime, UTC offset in seconds for fixed offset ones) or string
+indexes. Only kinds are stored, a value that cannot be encoded raises
+TypeError. Opening a snapshot reads the header only, strings and entities
+are decoded on first access."""
+import mmap
+import struct
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from .exception import EntityNotFound, ParseError
+from .kinds import (NA, Bool, Coord, HaystackDate, HaystackDateTime,
+                    HaystackDict, HaystackList, HaystackTime, HaystackUri,
+                    Kind, Marker, Number, Ref, Remove, Str, Symbol, XStr)
+from .ontology import Entity, Ontology, Tag
+
+MAGIC = b'HAYSNAP\x00'
+VERSION = 2
+NONE = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<8sHHIIQQQQ')
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_I64 = struct.Struct('<q')
+_ENTITY = struct.Struct('<IIH')
+_NUMBER = struct.Struct('<dI')
+_COORD = struct.Struct('<dd')
+_PAIR = struct.Struct('<II')
+_DATETIME = struct.Struct('<qI')
+_OFFSET_DATETIME = struct.Struct('<qi')
+_OFFSET_TIME = struct.Struct('<Qi')
+
+# kind type bytes
+MARKER, NA_, REMOVE, TRUE, FALSE, NUMBER, STR, URI, REF, SYMBOL, DATE, TIME, \
+    DATETIME, COORD, XSTR, LIST, DICT, OFFSET_TIME, OFFSET_DATETIME, \
+    NAIVE_DATETIME = range(20)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+SECOND = timedelta(seconds=1)
+
+
+def _microseconds(value: time) -> int:
+    """microseconds since midnight"""
+    return ((value.hour * 60 + value.minute) * 60 + value.second) \
+        * 1_000_000 + value.microsecond
+
+
+def _time(microseconds: int, tz: Optional[timezone] = None) -> time:
+    seconds, microsecond = divmod(microseconds, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond, tz)
+
+
+def _offset(tz: object) -> int:
+    """UTC offset in seconds of a fixed offset timezone"""
+    offset = tz.utcoffset(None)
+    if offset % SECOND:
+        raise TypeError(f'UTC offset {offset} is not a whole number of seconds')
+    return offset // SECOND
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.body = bytearray()
+        self.strings: Dict[str, int] = {}
+
+    def string(self, value: Optional[str]) -> int:
+        """index of the string in the string table"""
+        if value is None:
+            return NONE
+        idx = self.strings.get(value)
+        if idx is None:
+            idx = self.strings[value] = len(self.strings)
+        return idx
+
+    def kind(self, kind: Kind) -> None:
+        body = self.body
+        if isinstance(kind, Marker):
+            body += _U8.pack(MARKER)
+        elif isinstance(kind, NA):
+            body += _U8.pack(NA_)
+        elif isinstance(kind, Remove):
+            body += _U8.pack(REMOVE)
+        elif isinstance(kind, Bool):
+            body += _U8.pack(TRUE if kind.value else FALSE)
+        elif isinstance(kind, Number):
+            body += _U8.pack(NUMBER)
+            body += _NUMBER.pack(kind.value, self.string(
+                kind.unit.symbol if kind.unit else None))
+        elif isinstance(kind, Str):
+            body += _U8.pack(STR) + _U32.pack(self.string(kind.value))
+        elif isinstance(kind, HaystackUri):
+            body += _U8.pack(URI) + _U32.pack(self.string(kind.value))
+        elif isinstance(kind, Ref):
+            body += _U8.pack(REF) + _PAIR.pack(
+                self.string(kind.value), self.string(kind.displayname))
+        elif isinstance(kind, Symbol):
+            body += _U8.pack(SYMBOL) + _U32.pack(self.string(kind.value))
+        elif isinstance(kind, HaystackDate):
+            body += _U8.pack(DATE) + _U32.pack(kind.value.toordinal())
+        elif isinstance(kind, HaystackTime):
+            self.timeKind(kind.value)
+        elif isinstance(kind, HaystackDateTime):
+            self.dateTimeKind(kind.value)
+        elif isinstance(kind, Coord):
+            body += _U8.pack(COORD) + _COORD.pack(kind.lat, kind.lng)
+        elif isinstance(kind, XStr):
+            body += _U8.pack(XSTR) + _PAIR.pack(
+                self.string(kind.type), self.string(kind.value))
+        elif isinstance(kind, HaystackList):
+            body += _U8.pack(LIST) + _U32.pack(len(kind))
+            for item in kind:
+                self.kind(item)
+        elif isinstance(kind, HaystackDict):
+            body += _U8.pack(DICT) + _U32.pack(len(kind))
+            for name, item in kind.items():
+                body += _U32.pack(self.string(name))
+                self.kind(item)
+        else:
+            raise TypeError(
+                f'{type(kind).__name__} cannot be stored in a snapshot')
+
+    def timeKind(self, value: time) -> None:
+        tz = value.tzinfo
+        if tz is None:
+            self.body += _U8.pack(TIME) + _U64.pack(_microseconds(value))
+        elif isinstance(tz, timezone):
+            self.body += _U8.pack(OFFSET_TIME) + _OFFSET_TIME.pack(
+                _microseconds(value), _offset(tz))
+        else:
+            raise TypeError(f'Time {value} has no fixed UTC offset')
+
+    def dateTimeKind(self, value: datetime) -> None:
+        tz = value.tzinfo
+        if tz is None:
+            self.body += _U8.pack(NAIVE_DATETIME) + _I64.pack(
+                (value - NAIVE_EPOCH) // MICROSECOND)
+        elif isinstance(tz, ZoneInfo) and tz.key is not None:
+            self.body += _U8.pack(DATETIME) + _DATETIME.pack(
+                (value - EPOCH) // MICROSECOND, self.string(tz.key))
+        elif isinstance(tz, timezone):
+            self.body += _U8.pack(OFFSET_DATETIME) + _OFFSET_DATETIME.pack(
+                (value - EPOCH) // MICROSECOND, _offset(tz))
+        else:
+            raise TypeError(
+                f'DateTime {value} has neither a zone nor a fixed UTC offset')
+
+    def entity(self, entity: Entity) -> None:
+        tags = entity.tags
+        self.body += _ENTITY.pack(self.string(entity.id.value),
+                                  self.string(entity.id.displayname), len(tags))
+        for tag in tags:
+            self.body += _U32.pack(self.string(tag.name))
+            self.kind(tag.kind)
+
+
+def dumps(ontology: Ontology) -> bytes:
+    """Snapshot of the ontology"""
+    writer = _Writer()
+    entityOffsets = []
+    for entity in ontology.entities:
+        entityOffsets.append(_HEADER.size + len(writer.body))
+        writer.entity(entity)
+
+    encoded = [value.encode('utf-8') for value in writer.strings]
+    stringOffsets = [0]
+    for data in encoded:
+        stringOffsets.append(stringOffsets[-1] + len(data))
+    ids = [entity.id.value for entity in ontology.entities]
+    sortedIds = sorted(range(len(ids)), key=ids.__getitem__)
+
+    stringOffsetsPos = _HEADER.size + len(writer.body)
+    stringBlobPos = stringOffsetsPos + 8 * len(stringOffsets)
+    entityOffsetsPos = stringBlobPos + stringOffsets[-1]
+    sortedIdsPos = entityOffsetsPos + 8 * len(entityOffsets)
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(encoded), len(entityOffsets),
+                          stringOffsetsPos, stringBlobPos, entityOffsetsPos,
+                          sortedIdsPos)
+    return b''.join((
+        header, writer.body,
+        struct.pack(f'<{len(stringOffsets)}Q', *stringOffsets),
+        *encoded,
+        struct.pack(f'<{len(entityOffsets)}Q', *entityOffsets),
+        struct.pack(f'<{len(sortedIds)}I', *sortedIds),
+    ))
+
+
+def save(ontology: Ontology, path: str) -> None:
+    """Write the snapshot of the ontology to a file"""
+    with open(path, 'wb') as file:
+        file.write(dumps(ontology))
+
+
+class Snapshot:
+    """Read only sequence of the entities of a snapshot file, decoded on
+    first access"""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0,
+                                     access=mmap.ACCESS_READ)
+            self._readHeader()
+        except (ValueError, ParseError, struct.error):
+            self._file.close()
+            raise ParseError(f'{path} is not a haystack snapshot')
+        self._strings: List[Optional[str]] = [None] * self._nbStrings
+        self._entities: Dict[int, Entity] = {}
+
+    @classmethod
+    def frombuffer(cls, data: bytes) -> 'Snapshot':
+        """Snapshot held in memory"""
+        mySnapshot = cls.__new__(cls)
+        mySnapshot._file = None
+        mySnapshot._buffer = data
+        mySnapshot._readHeader()
+        mySnapshot._strings = [None] * mySnapshot._nbStrings
+        mySnapshot._entities = {}
+        return mySnapshot
+
+    def _readHeader(self) -> None:
+        magic, version, _, self._nbStrings, self._nbEntities, \
+            self._stringOffsetsPos, self._stringBlobPos, \
+            self._entityOffsetsPos, self._sortedIdsPos = \
+            _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ParseError('Not a haystack snapshot')
+        if version != VERSION:
+            raise ParseError(f'Snapshot version {version} is not supported')
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._buffer.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _string(self, idx: int) -> Optional[str]:
+        if idx == NONE:
+            return None
+        value = self._strings[idx]
+        if value is None:
+            start, end = struct.unpack_from(
+                '<QQ', self._buffer, self._stringOffsetsPos + 8 * idx)
+            value = self._strings[idx] = str(
+                self._buffer[self._stringBlobPos + start:
+                             self._stringBlobPos + end], 'utf-8')
+        return value
+
+    def _kind(self, pos: int) -> Tuple[Kind, int]:
+        """kind at pos and the position after it"""
+        buffer = self._buffer
+        kindType = buffer[pos]
+        pos += 1
+        if kindType == MARKER:
+            return Marker(), pos
+        if kindType == NA_:
+            return NA(), pos
+        if kindType == REMOVE:
+            return Remove(), pos
+        if kindType == TRUE or kindType == FALSE:
+            return Bool(kindType == TRUE), pos
+        if kindType == NUMBER:
+            value, unit = _NUMBER.unpack_from(buffer, pos)
+            return Number(value, self._string(unit)), pos + _NUMBER.size
+        if kindType in (STR, URI, SYMBOL):
+            value = self._string(_U32.unpack_from(buffer, pos)[0])
+            kind = {STR: Str, URI: HaystackUri, SYMBOL: Symbol}[kindType](value)
+            return kind, pos + _U32.size
+        if kindType == REF:
+            value, dis = _PAIR.unpack_from(buffer, pos)
+            return Ref(self._string(value), self._string(dis)), pos + _PAIR.size
+        if kindType == DATE:
+            ordinal = _U32.unpack_from(buffer, pos)[0]
+            return HaystackDate(date.fromordinal(ordinal)), pos + _U32.size
+        if kindType == TIME:
+            return HaystackTime(_time(_U64.unpack_from(buffer, pos)[0])), \
+                pos + _U64.size
+        if kindType == OFFSET_TIME:
+            micros, offset = _OFFSET_TIME.unpack_from(buffer, pos)
+            return HaystackTime(_time(micros, timezone(offset * SECOND))), \
+                pos + _OFFSET_TIME.size
+        if kindType == DATETIME:
+            micros, tz = _DATETIME.unpack_from(buffer, pos)
+            value = (EPOCH + micros * MICROSECOND).astimezone(
+                ZoneInfo(self._string(tz)))
+            return HaystackDateTime(value), pos + _DATETIME.size
+        if kindType == OFFSET_DATETIME:
+            micros, offset = _OFFSET_DATETIME.unpack_from(buffer, pos)
+            value = (EPOCH + micros * MICROSECOND).astimezone(
+                timezone(offset * SECOND))
+            return HaystackDateTime(value), pos + _OFFSET_DATETIME.size
+        if kindType == NAIVE_DATETIME:
+            micros = _I64.unpack_from(buffer, pos)[0]
+            return HaystackDateTime(NAIVE_EPOCH + micros * MICROSECOND), \
+                pos + _I64.size
+        if kindType == COORD:
+            lat, lng = _COORD.unpack_from(buffer, pos)
+            return Coord(lat, lng), pos + _COORD.size
+        if kindType == XSTR:
+            xtype, value = _PAIR.unpack_from(buffer, pos)
+            return XStr(self._string(xtype), self._string(value)), \
+                pos + _PAIR.size
+        if kindType == LIST:
+            count = _U32.unpack_from(buffer, pos)[0]
+            pos += _U32.size
+            items = HaystackList()
+            for _ in range(count):
+                item, pos = self._kind(pos)
+                items.append(item)
+            return items, pos
+        if kindType == DICT:
+            count = _U32.unpack_from(buffer, pos)[0]
+            pos += _U32.size
+            items = HaystackDict()
+            for _ in range(count):
+                name = self._string(_U32.unpack_from(buffer, pos)[0])
+                items[name], pos = self._kind(pos + _U32.size)
+            return items, pos
+        raise ParseError(f'Unknown kind type {kindType} in snapshot')
+
+    def _entityOffset(self, position: int) -> int:
+        return _U64.unpack_from(self._buffer,
+                                self._entityOffsetsPos + 8 * position)[0]
+
+    def _entityId(self, position: int) -> str:
+        return self._string(_U32.unpack_from(
+            self._buffer, self._entityOffset(position))[0])
+
+    def _decodeEntity(self, position: int) -> Entity:
+        pos = self._entityOffset(position)
+        id, dis, nbTags = _ENTITY.unpack_from(self._buffer, pos)
+        pos += _ENTITY.size
+        tags = []
+        for _ in range(nbTags):
+            name = self._string(_U32.unpack_from(self._buffer, pos)[0])
+            kind, pos = self._kind(pos + _U32.size)
+            tags.append(Tag(name, kind))
+        return Entity(Ref(self._string(id), self._string(dis)), tags)
+
+    def _position(self, ref: Ref) -> int:
+        """binary search of the sorted ids"""
+        low, high = 0, self._nbEntities
+        while low < high:
+            middle = (low + high) // 2
+            position = _U32.unpack_from(
+                self._buffer, self._sortedIdsPos + 4 * middle)[0]
+            value = self._entityId(position)
+            if value == ref.value:
+                return position
+            if value < ref.value:
+                low = middle + 1
+            else:
+                high = middle
+        raise EntityNotFound(f'Entity {ref.value} not found')
+
+    def __len__(self) -> int:
+        return self._nbEntities
+
+    def __getitem__(self, index: Union[int, Ref]) -> Entity:
+        if isinstance(index, Ref):
+            index = self._position(index)
+        elif isinstance(index, int):
+            if index < 0:
+                index += self._nbEntities
+            if not 0 <= index < self._nbEntities:
+                raise IndexError('Snapshot index out of range')
+        else:
+            raise TypeError('Function only accept Int or Ref in index')
+        entity = self._entities.get(index)
+        if entity is None:
+            entity = self._entities[index] = self._decodeEntity(index)
+        return entity
+
+    def __iter__(self) -> Iterator[Entity]:
+        for index in range(self._nbEntities):
+            yield self[index]
+
+    def toOntology(self) -> Ontology:
+        """Ontology of every entity of the snapshot"""
+        return Ontology(list(self))
+
+
+def loads(data: bytes) -> Ontology:
+    """Ontology of a snapshot"""
+    return Snapshot.frombuffer(data).toOntology()
+
+
+def load(path: str) -> Ontology:
+    """Ontology of a snapshot file"""
+    with Snapshot(path) as mySnapshot:
+        return mySnapshot.toOntology()
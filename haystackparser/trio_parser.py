@@ -1,20 +1,20 @@
 
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
 from importlib.resources import as_file, files
-from typing import List, Union
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
 
-import dateutil.parser as dateutil
 from lark import Lark
 from lark.lexer import Token
 from lark.tree import Tree
 
-from . import grammar
+from . import grammar, trio_scanner
 from .exception import ParseError, RuleError
-from .kinds import (NA, Bool, Coord, HaystackDate, HaystackDateTime,
-                    HaystackDict, HaystackList, HaystackTime, HaystackUri,
-                    Marker, Number, Ref, Remove, Str, Symbol, XStr)
+from .kinds import HaystackDict, HaystackList, Marker, Ref, Str
 from .ontology import Entity, Ontology, Tag
-from .zinc_datetime import parse_datetime
+from .zinc_scalar import decodeScalar, parseNumber
 
 source = files(grammar).joinpath('trio.lark')
 with as_file(source) as file:
@@ -25,9 +25,37 @@ parser = Lark(grammarFile,  start='start',
               debug=True,
               )
 
+lalrSource = files(grammar).joinpath('trio_lalr.lark')
+with as_file(lalrSource) as file:
+    lalrGrammarFile = file.open('r', encoding='utf-8')
 
-def parse(trio: str) -> Ontology:
-    tree = parser.parse(trio)
+lalr_parser = Lark(lalrGrammarFile, start='start',
+                   parser='lalr',
+                   )
+
+LARK_PARSERS = {
+    'earley': parser,
+    'lalr': lalr_parser,
+}
+
+ENGINES = ('earley', 'lalr', 'scanner')
+
+
+def parse(trio: str, engine: str = 'earley', lazy: bool = False) -> Ontology:
+    """Parse a Trio document.
+
+    engine selects the parser: "earley" (default), "lalr", the faster
+    LALR(1) grammar meant for large models, or "scanner", a single pass
+    line scanner that does not build a parse tree at all.
+
+    With lazy, tags keep the raw text of their scalar value and decode it
+    the first time their kind is read, malformed values only raise then."""
+    if engine not in ENGINES:
+        raise ValueError(
+            f'Unknown engine {engine}, use one of {", ".join(ENGINES)}')
+    if engine == 'scanner':
+        return trio_scanner.parse(trio, lazy)
+    tree = LARK_PARSERS[engine].parse(trio)
     myOntology = Ontology()
     for entity in tree.children:
         if entity.data.type == 'RULE' and (entity.data.value == 'first_entity' or entity.data.value == 'entity'):
@@ -37,25 +65,32 @@ def parse(trio: str) -> Ontology:
                 if tag.data.type == 'RULE':
                     if tag.data.value == 'tag':
 
-                        name, value = parseTagRule(tag.children)
+                        name, value = parseTagRule(tag.children, lazy)
+                        if isinstance(value, tuple):
+                            # scalar type and text left undecoded by a lazy parse
+                            if name != 'id' and value[0] != 'NULL':
+                                myEntity.append(Tag.lazy(name, decodeScalar, *value))
+                                continue
+                            value = decodeScalar(*value)
                         if name == 'id':
                             if not isinstance(value, Ref):
                                 raise ParseError(
                                     f'id tag is always a Ref line: {tag.data.line} column : {tag.data.column} ')
                             myEntity.id = value
-                        else:
-                            myEntity.append(Tag(name, value))
+                        elif value is not None:
+                            # a null value is no tag at all
+                            myEntity.append(Tag.trusted(name, value))
                     elif tag.data.value == 'marker':
-                        myEntity.append(Tag(tag.children[0].value, Marker()))
+                        myEntity.append(Tag.trusted(tag.children[0].value, Marker()))
                     elif tag.data.value == 'multiline':
                         name = None
                         myStr = ''
                         for token in tag.children:
                             if token.type == "NAME":
                                 name = token.value
-                            elif token.type == "TRIO_UNQUOTED_STR":
+                            elif token.type in ("TRIO_UNQUOTED_STR", "TRIO_INDENTED_STR"):
                                 myStr += str(token.value).strip() + "\n"
-                        myEntity.append(Tag(name, Str(myStr)))
+                        myEntity.append(Tag.trusted(name, Str(myStr)))
 
         else:
             raise RuleError('Rule not implemented')
@@ -63,104 +98,128 @@ def parse(trio: str) -> Ontology:
     return myOntology
 
 
-def parseTagRule(input: List[Union[Token, Tree]]):
+def iter_parse(lines: Union[str, Iterable[str]], engine: str = 'earley',
+               lazy: bool = False) -> Iterator[Entity]:
+    """Parse Trio one entity at a time.
+
+    lines is a file object or any iterable of lines, only the lines of the
+    current entity are kept in memory. Use Ontology.extend(iter_parse(...))
+    to feed an Ontology incrementally."""
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    for chunk in trio_scanner.iterEntityLines(lines):
+        if engine == 'scanner':
+            myOntology = trio_scanner.parseLines(chunk, lazy)
+        else:
+            chunk.append('')
+            myOntology = parse('\n'.join(chunk), engine, lazy)
+        yield from myOntology.entities
+
+
+def parse_parallel(trio: Union[str, os.PathLike], workers: int = None,
+                   engine: str = 'earley', chunkSize: int = 1000,
+                   lazy: bool = False) -> Ontology:
+    """Parse Trio in a pool of worker processes.
+
+    trio is a Trio document when it is a str, a Trio file or a directory
+    of *.trio files when it is a path (pathlib.Path or any os.PathLike).
+    The input is split on the entity separators into chunks of chunkSize
+    entities, each chunk is parsed by one of the workers (os.cpu_count()
+    by default) and the entities are merged in input order, so duplicate
+    ids still raise DuplicateEntity."""
+    myOntology = Ontology()
+    chunks = _iterChunks(trio, chunkSize)
+    if workers == 1:
+        for chunk in chunks:
+            myOntology.extend(parse(chunk, engine, lazy).entities)
+        return myOntology
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunkOntology in executor.map(parse, chunks, repeat(engine),
+                                          repeat(lazy)):
+            myOntology.extend(chunkOntology.entities)
+    return myOntology
+
+
+def _iterChunks(trio: Union[str, os.PathLike], chunkSize: int) -> Iterator[str]:
+    """Trio text of chunkSize entities at a time"""
+    if isinstance(trio, str):
+        sources = [trio.splitlines()]
+    elif isinstance(trio, os.PathLike):
+        path = Path(trio)
+        if path.is_dir():
+            sources = [_readLines(trioFile)
+                       for trioFile in sorted(path.glob('*.trio'))]
+        else:
+            sources = [_readLines(path)]
+    else:
+        raise TypeError('Function only accept a Trio str or a path')
+
+    for lines in sources:
+        entities = trio_scanner.iterEntityLines(lines)
+        while True:
+            chunk = list(islice(entities, chunkSize))
+            if not chunk:
+                break
+            yield '---\n'.join('\n'.join(lines) + '\n' for lines in chunk)
+
+
+def _readLines(path: Path) -> Iterator[str]:
+    with path.open('r', encoding='utf-8') as trioFile:
+        yield from trioFile
+
+
+def parseTagRule(input: List[Union[Token, Tree]], lazy: bool = False):
+    """name and value of a tag rule, with lazy a scalar value is returned
+    undecoded as its scalar type and text, without the lark Token"""
     name = None
     value = None
     for row in input:
         if isinstance(row, Token):
             if row.type == 'NAME':
                 name = row.value
+            elif row.type in ('LIST', 'DICT'):
+                # whole line collection of the lalr grammar
+                value = trio_scanner.parseValue(row.value)
             else:
-                value = parseScalar(row)
+                value = _rawScalar(row) if lazy else parseScalar(row)
 
         elif isinstance(row, Tree):
             if isinstance(row.data, Token) and row.data.type == "RULE" and row.data.value == "scalars":
 
                 for token in row.children:
-                    value = parseScalar(token)
+                    value = _rawScalar(token) if lazy else parseScalar(token)
             elif row.data == "list":
                 _value = []
                 for _row in row.children:
-                    _value.append(parseScalar(_row))
+                    kind = parseScalar(_row)
+                    if kind is None:
+                        raise ParseError(f'Null in list line {_row.line}')
+                    _value.append(kind)
                 value = HaystackList(_value)
             elif row.data == "dict":
                 _value = HaystackDict()
                 for _row in row.children:
                     tagName, tagValue = parseTagRule(_row.children)
-                    _value[tagName] = tagValue
+                    if tagValue is not None:
+                        _value[tagName] = tagValue
                 value = _value
 
     return name, value
 
 
 def parseScalar(token: Token):
-    if token.type == "zinctype__REF":
-        _match = re.match(
-            r"(?P<ref>^@[0-9a-zA-Z_:\-.~]+)( \"(?P<desc>.*)\")?", token.value)
-        value = Ref(_match.groupdict().get("ref", None),
-                    _match.groupdict().get("desc", None))
-    elif token.type == "zinctype__MARKER":
-        value = Marker()
-    elif token.type == "zinctype__NA":
-        value = NA()
-    elif token.type == "zinctype__REMOVE":
-        value = Remove()
-    elif token.type == "zinctype__BOOL":
-        if token.value == 'T':
-            value = Bool(True)
-        else:
-            value = Bool(False)
-    elif token.type == "zinctype__NUMBER":
-        value = parseNumber(token.value)
-
-    elif token.type == "zinctype__STR":
-        value = Str(token.value[1:-1])
-
-    elif token.type == "zinctype__URI":
-        value = HaystackUri(token.value[1:-1])
-
-    elif token.type == "zinctype__SYMBOL":
-        value = Symbol(token.value)
+    return decodeScalar(scalarType(token.type), token.value)
 
-    elif token.type == "zinctype__DATE":
-        value = HaystackDate(dateutil.parse(token.value).date())
 
-    elif token.type == "zinctype__TIME":
-        value = HaystackTime(dateutil.parse(token.value).time())
+def _rawScalar(token: Token) -> Tuple[str, str]:
+    """what decodeScalar needs of the token, as plain strings"""
+    return scalarType(token.type), str(token)
 
-    elif token.type == "zinctype__DATETIME":
-        value = HaystackDateTime(parse_datetime(token.value))
-
-    elif token.type == "zinctype__COORD":
-        regex = r"^C\((?P<lat>[+-]?\d*\.\d*)\,(?P<lng>[+-]?\d+\.\d*)\)"
-        _match = re.match(regex, token.value)
-        lat = _match.groupdict().get('lat')
-        lng = _match.groupdict().get('lng')
-        value = Coord(float(lat), float(lng))
-
-    elif token.type == 'zinctype__XSTR':
-        regex = r"^(?P<type>[A-Z][a-zA-Z\d0-9]+)\(\"(?P<val>\w+)\"\)"
-        _match = re.match(regex, token.value)
-        type = _match.groupdict().get('type')
-        val = _match.groupdict().get('val')
-        value = XStr(type, val)
-
-    elif token.type == "TRIO_UNQUOTED_STR":
-        value = Str(token.value.strip())
-
-    return value
-
-
-def parseNumber(nb: str):
-    if nb == "INF":
-        return Number(float('INF'))
-    elif nb == "-INF":
-        return Number(float("-INF"))
-    elif nb == "NaN":
-        return Number(float("NaN"))
-    else:
-        _match = re.match(
-            r"(?P<number>^-?[\d]+\.?[\d]*(?:[eE][+-]?\d+)?)(?P<unit>.*)", nb)
 
-        return Number(float(_match.groupdict().get('number', None)),
-                      _match.groupdict().get('unit', None))
+def scalarType(tokenType: str) -> str:
+    """Strip the grammar prefix of a scalar token type:
+    zinctype__REF (earley), ZINC_REF and REF (lalr) are all REF"""
+    tokenType = tokenType.rsplit('__', 1)[-1]
+    if tokenType.startswith('ZINC_'):
+        return tokenType[5:]
+    return tokenType
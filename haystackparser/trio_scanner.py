@@ -0,0 +1,172 @@
+"""Single pass Trio parser.
+
+Trio is line oriented: each line is an entity separator, a marker, a tag
+or a line of a multiline string. Lines are dispatched with regexes and
+tag values decoded straight into Kinds, without building a parse tree."""
+import re
+from typing import Iterable, Iterator, List, Optional
+
+from .exception import ParseError
+from .kinds import HaystackDict, HaystackList, Kind, Marker, Ref, Str
+from .ontology import Entity, Ontology, Tag
+from .zinc_scalar import SCALAR, decodeScalar
+
+ENTITY_MARK = re.compile(r'-+[ ]*')
+TAG_LINE = re.compile(
+    r'(?P<name>[a-z][a-zA-Z0-9_]*)[ ]*(?:(?P<colon>:)[ ]*(?P<value>.*?))?[ ]*')
+COMMENT_LINE = re.compile(r'[ ]*//.*')
+
+_SPACES = re.compile(r'[ ]*')
+_COMMA = re.compile(r'[ ]*,[ ]*')
+_DICT_NAME = re.compile(r'(?P<name>[a-z][a-zA-Z0-9_]*)[ ]*:[ ]*')
+
+
+def parse(trio: str, lazy: bool = False) -> Ontology:
+    return parseLines(trio.splitlines(), lazy)
+
+
+def parseLines(lines: Iterable[str], lazy: bool = False) -> Ontology:
+    """Parse Trio lines (without line ending) into an Ontology, with lazy
+    the tag values are decoded on first access"""
+    myOntology = Ontology()
+    myEntity = None
+    multiline = None
+    for lineNumber, line in enumerate(lines, 1):
+        if multiline is not None:
+            if line.startswith(' '):
+                myStr += line.strip() + "\n"
+                continue
+            if line.strip() == '':
+                continue
+            myEntity.append(Tag.trusted(multiline, Str(myStr)))
+            multiline = None
+
+        if line.strip() == '' or COMMENT_LINE.fullmatch(line):
+            continue
+        if ENTITY_MARK.fullmatch(line):
+            if myEntity is not None:
+                myOntology.append(myEntity)
+                myEntity = None
+            continue
+
+        _match = TAG_LINE.fullmatch(line)
+        if not _match:
+            raise ParseError(f'Unexpected line {lineNumber}: {line}')
+        if myEntity is None:
+            myEntity = Entity()
+        name = _match.group('name')
+        if _match.group('colon') is None:
+            myEntity.append(Tag.trusted(name, Marker()))
+            continue
+        value = _match.group('value')
+        if value == '':
+            multiline = name
+            myStr = ''
+            continue
+
+        if lazy and name != 'id' and value != 'N':
+            myEntity.append(Tag.lazy(name, parseValue, value))
+            continue
+        kind = parseValue(value)
+        if name == 'id':
+            if not isinstance(kind, Ref):
+                raise ParseError(
+                    f'id tag is always a Ref line: {lineNumber} column : 1 ')
+            myEntity.id = kind
+        elif kind is not None:
+            # a null value is no tag at all
+            myEntity.append(Tag.trusted(name, kind))
+
+    if multiline is not None:
+        myEntity.append(Tag.trusted(multiline, Str(myStr)))
+    if myEntity is not None:
+        myOntology.append(myEntity)
+    return myOntology
+
+
+def iterEntityLines(lines: Iterable[str]) -> Iterator[List[str]]:
+    """Split Trio lines on the entity separators, yield the lines (without
+    line ending) of one entity at a time. Chunks holding only blank or
+    comment lines are skipped."""
+    chunk = []
+    hasTag = False
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if ENTITY_MARK.fullmatch(line):
+            if hasTag:
+                yield chunk
+            chunk = []
+            hasTag = False
+            continue
+        chunk.append(line)
+        if not hasTag and line.strip() != '' \
+                and not COMMENT_LINE.fullmatch(line):
+            hasTag = True
+    if hasTag:
+        yield chunk
+
+
+def parseValue(value: str) -> Optional[Kind]:
+    """Decode the value of a tag line, falling back to an unquoted string
+    when it is not a scalar or a collection. None for the null N"""
+    _match = SCALAR.fullmatch(value)
+    if _match:
+        return decodeScalar(_match.lastgroup, value)
+    if value[0] == '[':
+        kind = parseList(value)
+    elif value[0] == '{':
+        kind = parseDict(value)
+    else:
+        kind = None
+    if kind is None:
+        kind = decodeScalar('TRIO_UNQUOTED_STR', value)
+    return kind
+
+
+def parseList(value: str) -> Optional[HaystackList]:
+    """[scalar, scalar...], None if value is not a list"""
+    items = []
+    pos = _SPACES.match(value, 1).end()
+    while True:
+        _match = SCALAR.match(value, pos)
+        if not _match:
+            break
+        kind = decodeScalar(_match.lastgroup, _match.group())
+        if kind is None:
+            raise ParseError(f'Null in list: {value}')
+        items.append(kind)
+        _comma = _COMMA.match(value, _match.end())
+        if not _comma:
+            pos = _match.end()
+            break
+        pos = _comma.end()
+    if not items or _SPACES.match(value, pos).end() != len(value) - 1 \
+            or value[-1] != ']':
+        return None
+    return HaystackList(items)
+
+
+def parseDict(value: str) -> Optional[HaystackDict]:
+    """{name:scalar, name:scalar...}, None if value is not a dict"""
+    items = HaystackDict()
+    empty = True
+    pos = _SPACES.match(value, 1).end()
+    while True:
+        _name = _DICT_NAME.match(value, pos)
+        if not _name:
+            break
+        empty = False
+        _match = SCALAR.match(value, _name.end())
+        if not _match:
+            return None
+        kind = decodeScalar(_match.lastgroup, _match.group())
+        if kind is not None:
+            items[_name.group('name')] = kind
+        _comma = _COMMA.match(value, _match.end())
+        if _comma:
+            pos = _comma.end()
+        else:
+            pos = _SPACES.match(value, _match.end()).end()
+    if empty or pos != len(value) - 1 or value[-1] != '}':
+        return None
+    return items
@@ -1,76 +1,109 @@
-import re
-from . import resources
-from importlib.resources import as_file, files
-from .exception import UnitNotFound
-
 import logging
+import re
+from functools import lru_cache
+from importlib.resources import files
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
 
-class Unit:
-    _unitsDb = {}
-    _haystackUnitDb = {}
-
-    def __init__(self, symbol: str) -> None:
-        if not(len(self._unitsDb) >0 ):
-            self.loadUnitFile()
-        self._orig_Symbol= symbol
-        self._unit = self._get_unit(symbol)
-
-    def loadUnitFile(self):
-        logging.debug('load unitdb')
-        source = files(resources).joinpath('units.txt')
-        with as_file(source) as file:
-            unitfile = file.open('r', encoding='utf-8')
-
+from . import resources
+from .exception import IncompatibleUnits, UnitNotFound
+
+_SECTION = re.compile(r"^-- (.+) \((.+)\)")
+
+
+class UnitDefinition(NamedTuple):
+    """One row of units.txt"""
+    canonical: str
+    alias: List[str]
+    quantity: str
+    # dimension of the quantity, and of the unit itself
+    dimension: Optional[str]
+    dim: Optional[str]
+    # value in the base unit of dim is value * ratio + offset
+    ratio: Optional[float]
+    offset: Optional[float]
+    print: str
+    fields: List[str]
+    # alias and dimension, the strings a Unit is equal to
+    names: FrozenSet[str]
+
+
+# canonical name -> definition, and any alias or canonical name -> canonical
+# name, loaded once from units.txt and shared by every Unit
+_unitsDb: Dict[str, UnitDefinition] = {}
+_haystackUnitDb: Dict[str, str] = {}
+
+
+def loadUnits() -> None:
+    """Parse units.txt into the unit database, once"""
+    if _unitsDb:
+        return
+    logging.debug('load unitdb')
+    dimension = None
+    with files(resources).joinpath('units.txt').open('r', encoding='utf-8') as unitfile:
         for row in unitfile:
             if row.startswith("//") or row.strip() == '':
                 continue
             elif row.startswith("-- "):
-                name, dimension = re.match(r"^-- (.+) \((.+)\)", row).groups()
+                name, dimension = _SECTION.match(row).groups()
                 if(dimension == "null"):
                     dimension = None
-                # print(f'DIMENSION: {name}, {dimension}')
             else:
                 temp = row.strip().split(";")
-                alias = temp[0].split(",")
-                alias = list(map(lambda x: x.strip(), alias))
+                alias = [symbol.strip() for symbol in temp[0].split(",")]
                 canonical = alias[0]
                 if len(alias) > 1:
                     alias = alias[1:]
+                fields = [field.strip() for field in temp[1:]]
                 dim = None
                 ratio = None
-
-                if len(temp) > 1:
-                    if(temp[1].strip() != ''):
-                        dim = temp[1].strip()
-                if len(temp) > 2:
-                    if(temp[2].strip() != ''):
-                        ratio = float(temp[2].strip())
-                unitPrint = alias[-1]
-                    
-                self._unitsDb[canonical] = {
-                    "alias": alias.copy(),
-                    "dimension": dimension,
-                    "ratio": ratio,
-                    "print": unitPrint
-                }
-
+                offset = None
+                if len(fields) > 0 and fields[0] != '':
+                    dim = fields[0]
+                if len(fields) > 1 and fields[1] != '':
+                    ratio = float(fields[1])
+                if len(fields) > 2 and fields[2] != '':
+                    offset = float(fields[2])
+
+                _unitsDb[canonical] = UnitDefinition(
+                    canonical, alias, name, dimension, dim, ratio, offset,
+                    alias[-1], fields, frozenset(alias + [dimension]))
+
+                _haystackUnitDb[canonical] = canonical
+                for symbol in alias:
+                    _haystackUnitDb[symbol] = canonical
                 if(not ratio and dim==dimension):
-                    # add dimension at alias list
-                    alias.append(dimension)
+                    # the base unit of a dimension is also found by it
+                    _haystackUnitDb[dimension] = canonical
 
-                self._haystackUnitDb[canonical] = canonical
 
-                for symbol in alias:
-                    self._haystackUnitDb[symbol] = canonical
-                
-    
+def getDefinition(symbol: str) -> UnitDefinition:
+    """Definition of a unit symbol, alias or canonical name"""
+    loadUnits()
+    canonical = _haystackUnitDb.get(symbol)
+    if canonical is None:
+        raise UnitNotFound(f'Unit {symbol} is not in haystack database')
+    return _unitsDb[canonical]
 
-    def _get_unit(self, symbole: str) -> dict:
-        self._canonical = self._haystackUnitDb.get(symbole, None)
-        if self._canonical:
-            return self._unitsDb[self._canonical]
 
-        raise UnitNotFound(f'Unit {symbole} is not in haystack database')
+class Unit:
+    """Unit of the haystack database. Units are immutable and interned,
+    Unit('°C') is always the same object"""
+    __slots__ = ('_orig_Symbol', '_canonical', '_unit')
+    _instances: Dict[str, 'Unit'] = {}
+
+    def __new__(cls, symbol: str) -> 'Unit':
+        unit = cls._instances.get(symbol)
+        if unit is None:
+            definition = getDefinition(symbol)
+            unit = super().__new__(cls)
+            unit._orig_Symbol = symbol
+            unit._canonical = definition.canonical
+            unit._unit = definition
+            cls._instances[symbol] = unit
+        return unit
+
+    def __reduce__(self):
+        return (Unit, (self._orig_Symbol,))
 
     @property
     def canonical(self):
@@ -85,32 +118,96 @@ class Unit:
     @property
     def print(self):
         """Get symbol for printing"""
-        return self._unit['print']
+        return self._unit.print
 
     @property
     def dimension(self):
         """Get dimension for conversion op """
-        return self._unit['dimension']
+        return self._unit.dimension
 
     @property
     def ratio(self):
         """Get ratio for conversion op """
-        return self._unit['ratio']
+        return self._unit.ratio
+
+    @property
+    def offset(self):
+        """Get offset for conversion op """
+        return self._unit.offset
 
     @property
     def alias(self):
         """Get alias of the unit"""
-        return self._unit['alias']
+        return self._unit.alias
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, str):
-            myAlias = self._unit['alias'] + [self._unit['dimension']]
-            if other in myAlias:
-                return True
-            else:
-                return False
+            return other in self._unit.names
         return super().__eq__(other)
 
+    __hash__ = object.__hash__
 
     def __repr__(self) -> str:
-        return f"Dimension : {self.dimension} ; Original Symbol : {self.symbol} ; Canonical: {self.canonical}"
\ No newline at end of file
+        return f"Dimension : {self.dimension} ; Original Symbol : {self.symbol} ; Canonical: {self.canonical}"
+
+
+UnitLike = Union[str, Unit]
+
+
+@lru_cache(maxsize=None)
+def _base(canonical: str) -> Tuple[Tuple[str, str], float, float]:
+    """what units convert to each other share (their dimension, the quantity
+    of dimensionless units, the currency itself: no exchange rates), then
+    ratio and offset to the base unit of that dimension"""
+    definition = _unitsDb[canonical]
+    if definition.quantity == 'currency':
+        key = ('currency', definition.canonical)
+    elif definition.dim is None:
+        key = ('quantity', definition.quantity)
+    else:
+        key = ('dim', definition.dim)
+    return key, definition.ratio or 1.0, definition.offset or 0.0
+
+
+# Unit -> _base of its canonical name, Units are interned
+_unitBase: Dict[Unit, Tuple[Tuple[str, str], float, float]] = {}
+
+
+def baseValue(value: float, unit: Unit) -> Tuple[Tuple[str, str], float]:
+    """value in the base unit of its dimension, and the dimension key: two
+    values in compatible units compare through it"""
+    base = _unitBase.get(unit)
+    if base is None:
+        base = _unitBase[unit] = _base(unit.canonical)
+    key, ratio, offset = base
+    return key, value * ratio + offset
+
+
+@lru_cache(maxsize=None)
+def _factors(fromCanonical: str, toCanonical: str) -> Tuple[float, float]:
+    fromKey, fromRatio, fromOffset = _base(fromCanonical)
+    toKey, toRatio, toOffset = _base(toCanonical)
+    if fromKey != toKey:
+        raise IncompatibleUnits(
+            f'Cannot convert {fromCanonical} ({fromKey[1]})'
+            f' to {toCanonical} ({toKey[1]})')
+    return fromRatio / toRatio, (fromOffset - toOffset) / toRatio
+
+
+def conversion(fromUnit: UnitLike, toUnit: UnitLike) -> Tuple[float, float]:
+    """scale and shift converting fromUnit values to toUnit: value * scale +
+    shift, computed once per pair of units"""
+    if isinstance(fromUnit, str):
+        fromUnit = Unit(fromUnit)
+    if isinstance(toUnit, str):
+        toUnit = Unit(toUnit)
+    return _factors(fromUnit.canonical, toUnit.canonical)
+
+
+def convert(values: Any, fromUnit: UnitLike, toUnit: UnitLike) -> Any:
+    """Convert a float, a NumPy array (in one vectorized operation) or any
+    iterable of floats (into a list) from fromUnit to toUnit"""
+    scale, shift = conversion(fromUnit, toUnit)
+    if isinstance(values, (int, float)) or hasattr(values, 'dtype'):
+        return values * scale + shift
+    return [value * scale + shift for value in values]
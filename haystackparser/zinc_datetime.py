@@ -1,41 +1,148 @@
-
+import os
 import re
-from datetime import datetime
-from zoneinfo import ZoneInfo, available_timezones
+from datetime import date, datetime, time, tzinfo
+from functools import lru_cache
+from importlib.resources import as_file, files
+from typing import Dict, Optional
+from zoneinfo import TZPATH, ZoneInfo
 
-import dateutil.parser as dateutil
+from haystackparser import resources
+from haystackparser.exception import ParseError, TimeZoneNotFound
 
-from haystackparser.exception import TimeZoneNotFound
+# Haystack city name -> IANA zone, and back, from resources/timezones.txt
+# generated by update_haystack_resource.py. A city parses to the first zone
+# of its rows, the next ones are links written with that city
+tz_db: Dict[str, str] = {}
+tz_cities: Dict[str, str] = {}
 
-tz_db = {}  
 
 def _loadTz():
-    for row in available_timezones():
-        haystack_canonical = row.split('/')
-        tz_db[haystack_canonical[-1]] = row
- 
+    source = files(resources).joinpath('timezones.txt')
+    with as_file(source) as file, file.open('r', encoding='utf-8') as table:
+        for row in table:
+            if row.startswith('//') or row.strip() == '':
+                continue
+            city, zone = row.strip().split(',')
+            tz_db.setdefault(city, zone)
+            tz_cities[zone] = city
+
+
+@lru_cache(maxsize=None)
+def tzifData(zone: str) -> Optional[bytes]:
+    """TZif data of an IANA zone, looked up as ZoneInfo does (TZPATH, then
+    the tzdata package). A link has the data of the zone it points to"""
+    for root in TZPATH:
+        path = os.path.join(root, zone)
+        if os.path.isfile(path):
+            with open(path, 'rb') as tzif:
+                return tzif.read()
+    try:
+        source = files('tzdata.zoneinfo')
+    except ModuleNotFoundError:
+        return None
+    for part in zone.split('/'):
+        source = source.joinpath(part)
+    return source.read_bytes() if source.is_file() else None
+
 
+@lru_cache(maxsize=1024)
 def getHaystackTz(tz:str):
+    """ZoneInfo of a Haystack timezone name, resolved once per name"""
     if (len(tz_db)<1):
-        _loadTz()        
+        _loadTz()
     try:
         return ZoneInfo(tz_db[tz])
     except Exception:
         raise TimeZoneNotFound(f'Timezone {tz} not found')
 
 
-def parse_datetime(chaine: str):
-    regexTime = "(?P<date>^\d{4}\-\d{2}\-\d{2})[T ](?P<time>\d{2}:\d{2}:\d{2}(?:\.\d+)?)(?P<offset>[Zz]?(?:[+-]\d{2}:\d{2})?)\s?(?P<timezone>[\w\d+-]+)?"
-    _dateStruct = re.match(regexTime, chaine)
-    _dateStruct = _dateStruct.groupdict()
-    _dateStr = f'{_dateStruct.get("date")}'
-    _timeStr = f'{_dateStruct.get("time")}'
-    _dateTimeStr = f'{_dateStr}T{_timeStr}'
-    _offsetStr = f'{_dateStruct.get("offset", None)}'
-    _timezoneStr = f'{_dateStruct.get("timezone", None)}'
-    if(_timezoneStr != 'None'):
-        # If Timezone is present we don't care about offset
-        tz = getHaystackTz(_timezoneStr)
-        return datetime.fromisoformat(_dateTimeStr).replace(tzinfo=tz)
-    else:
-        return dateutil.parse(_dateTimeStr + _offsetStr)
+def haystackCity(tz: Optional[tzinfo]) -> Optional[str]:
+    """Haystack timezone name of a tzinfo, None for a naive datetime"""
+    if tz is None:
+        return None
+    if isinstance(tz, ZoneInfo) and tz.key is not None:
+        if (len(tz_db)<1):
+            _loadTz()
+        city = tz_cities.get(tz.key)
+        if city is not None:
+            return city
+        return _linkCity(tz.key)
+    zone = str(tz).split('/')
+    if len(zone) == 2:
+        return zone[1]
+    return zone[0]
+
+
+@lru_cache(maxsize=None)
+def _linkCity(zone: str) -> str:
+    """Haystack name of a zone missing from the table (newer tzdata): its
+    own city when that city parses to the same rules, else the city of the
+    zone of the table it is a link to"""
+    data = tzifData(zone)
+    city = zone.split('/')[-1]
+    if data is not None:
+        if city in tz_db and tzifData(tz_db[city]) == data:
+            return city
+        for target, targetCity in tz_cities.items():
+            if tzifData(target) == data:
+                return targetCity
+    raise TimeZoneNotFound(f'No Haystack timezone name for {zone}')
+
+
+DATETIME = re.compile(r"(?P<date>^\d{4}\-\d{2}\-\d{2})[T ](?P<time>\d{2}:\d{2}:\d{2}(?:\.\d+)?)(?P<offset>[Zz]?(?:[+-]\d{2}:\d{2})?)\s?(?P<timezone>[\w\d+-]+)?")
+
+
+def _isoTime(text: str) -> str:
+    """hh:mm:ss with a fraction of 6 digits or none, the only layouts
+    fromisoformat reads before Python 3.11"""
+    if len(text) == 8 or len(text) == 15:
+        return text
+    if len(text) == 9:
+        # hh:mm:ss.
+        return text[:8]
+    return (text + '00000')[:15]
+
+
+def parse_date(text: str) -> date:
+    """date of a Zinc date YYYY-MM-DD"""
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise ParseError(f'Malformed date {text}')
+
+
+def parse_time(text: str) -> time:
+    """time of a Zinc time hh:mm:ss[.FFFFFFFFF], the fraction is truncated to
+    microseconds"""
+    try:
+        return time.fromisoformat(_isoTime(text))
+    except ValueError:
+        raise ParseError(f'Malformed time {text}')
+
+
+def parse_datetime(chaine: str) -> datetime:
+    """datetime of a Zinc datetime YYYY-MM-DDThh:mm:ss[.FFF](Z|+hh:mm)[ tz]
+
+    With a timezone the wall time is kept in that zone, the offset only
+    picks the first or second of an ambiguous hour. Without one the
+    datetime has a fixed offset, or none when there is no offset either"""
+    _match = DATETIME.match(chaine)
+    if _match is None:
+        raise ParseError(f'Malformed datetime {chaine}')
+    _date, _time, _offset, _timezone = _match.groups()
+    if _offset in ('Z', 'z'):
+        _offset = '+00:00'
+    try:
+        _datetime = datetime.fromisoformat(f'{_date}T{_isoTime(_time)}{_offset}')
+    except ValueError:
+        raise ParseError(f'Malformed datetime {chaine}')
+    if _timezone is None:
+        return _datetime
+    offset = _datetime.utcoffset()
+    _datetime = _datetime.replace(tzinfo=getHaystackTz(_timezone))
+    if offset is not None and _datetime.utcoffset() != offset:
+        # fall back hour, the offset tells which one
+        folded = _datetime.replace(fold=1)
+        if folded.utcoffset() == offset:
+            return folded
+    return _datetime
@@ -0,0 +1,158 @@
+"""Zinc grid reader https://project-haystack.org/doc/docHaystack/Zinc
+
+    grid = parse_zinc(zinc)
+    ontology = grid.toOntology()
+
+The header is split once into column names, then each row is read cell by
+cell, column after column, with the scalar regex of zinc_scalar. Grid and
+column meta are checked but not kept, nested grids are not supported."""
+import re
+from typing import List, Optional, Tuple
+
+from .exception import ParseError
+from .kinds import HaystackDict, HaystackList, Kind, Marker
+from .ontology import Grid
+from .zinc_scalar import SCALAR, decodeZincScalar
+
+VERSION = re.compile(r'ver:"(?P<version>[23]\.0)"')
+_NAME = re.compile(r'[a-z][a-zA-Z0-9_]*')
+_SPACES = re.compile(r'[ ]*')
+
+
+def parse_zinc(zinc: str) -> Grid:
+    """Parse the Zinc text of one grid"""
+    lines = iter(zinc.splitlines())
+    header = next(lines, '')
+    _match = VERSION.match(header)
+    if not _match:
+        raise ParseError(f'Zinc grid must start with ver:"3.0": {header}')
+    pos = _parseMeta(header, _match.end(), 1)
+    if pos != len(header):
+        raise ParseError(f'Unexpected grid meta line 1: {header}')
+
+    columns = _parseColumns(next(lines, ''))
+    grid = Grid()
+    for name in columns:
+        grid._addColumn(name)
+    if len(grid._columns) != len(columns):
+        raise ParseError(f'Duplicate column in {columns}')
+
+    nbColumns = len(columns)
+    for lineNumber, line in enumerate(lines, 3):
+        if line == '':
+            break
+        grid._row.append(parseRow(line, nbColumns, lineNumber))
+    return grid
+
+
+def _parseColumns(line: str) -> List[str]:
+    """name [meta], name [meta]..."""
+    columns = []
+    pos = 0
+    while True:
+        _name = _NAME.match(line, _SPACES.match(line, pos).end())
+        if not _name:
+            raise ParseError(f'Column name expected line 2 column {pos + 1}: {line}')
+        columns.append(_name.group())
+        pos = _parseMeta(line, _name.end(), 2)
+        if pos == len(line):
+            break
+        if line[pos] != ',':
+            raise ParseError(f'Unexpected column meta line 2 column {pos + 1}: {line}')
+        pos += 1
+    if columns == ['empty']:
+        return []
+    return columns
+
+
+def parseRow(line: str, nbColumns: int, lineNumber: int = 0) -> List[Optional[Kind]]:
+    """Cells of a row, None for the empty and null cells. Missing cells at the
+    end of the row are None"""
+    row: List[Optional[Kind]] = [None] * nbColumns
+    pos = 0
+    for column in range(nbColumns):
+        pos = _SPACES.match(line, pos).end()
+        if pos < len(line) and line[pos] != ',':
+            row[column], pos = _parseValue(line, pos, lineNumber)
+            pos = _SPACES.match(line, pos).end()
+        if pos == len(line):
+            return row
+        if line[pos] != ',':
+            raise ParseError(f'Unexpected cell line {lineNumber} column {pos + 1}: {line}')
+        pos += 1
+    if _SPACES.match(line, pos).end() != len(line):
+        raise ParseError(f'More cells than columns line {lineNumber}: {line}')
+    return row
+
+
+def _parseValue(line: str, pos: int, lineNumber: int) -> Tuple[Optional[Kind], int]:
+    """Kind starting at pos and the position after it, None for null"""
+    if pos == len(line):
+        raise ParseError(f'Value expected line {lineNumber}: {line}')
+    char = line[pos]
+    if char == '[':
+        return _parseList(line, pos, lineNumber)
+    if char == '{':
+        return _parseDict(line, pos, lineNumber)
+    if line.startswith('<<', pos):
+        raise ParseError(f'Nested grids are not supported line {lineNumber}')
+    _match = SCALAR.match(line, pos)
+    if not _match:
+        raise ParseError(f'Unexpected value line {lineNumber} column {pos + 1}: {line}')
+    if _match.lastgroup == 'NULL':
+        return None, _match.end()
+    return decodeZincScalar(_match.lastgroup, _match.group()), _match.end()
+
+
+def _parseList(line: str, pos: int, lineNumber: int) -> Tuple[HaystackList, int]:
+    """[value, value...]"""
+    items = HaystackList()
+    pos = _SPACES.match(line, pos + 1).end()
+    while pos < len(line) and line[pos] != ']':
+        kind, pos = _parseValue(line, pos, lineNumber)
+        if kind is None:
+            raise ParseError(f'Null in list line {lineNumber}: {line}')
+        items.append(kind)
+        pos = _SPACES.match(line, pos).end()
+        if pos < len(line) and line[pos] == ',':
+            pos = _SPACES.match(line, pos + 1).end()
+        elif pos < len(line) and line[pos] != ']':
+            raise ParseError(f'Unexpected list item line {lineNumber} column {pos + 1}: {line}')
+    if pos == len(line):
+        raise ParseError(f'Unclosed list line {lineNumber}: {line}')
+    return items, pos + 1
+
+
+def _parseDict(line: str, pos: int, lineNumber: int) -> Tuple[HaystackDict, int]:
+    """{name:value name, name:value...}, a name alone is a marker"""
+    items = HaystackDict()
+    pos = _SPACES.match(line, pos + 1).end()
+    while pos < len(line) and line[pos] != '}':
+        _name = _NAME.match(line, pos)
+        if not _name:
+            raise ParseError(f'Dict name expected line {lineNumber} column {pos + 1}: {line}')
+        pos = _name.end()
+        kind = Marker()
+        if line.startswith(':', pos):
+            kind, pos = _parseValue(line, pos + 1, lineNumber)
+        if kind is not None:
+            items[_name.group()] = kind
+        pos = _SPACES.match(line, pos).end()
+        if pos < len(line) and line[pos] == ',':
+            pos = _SPACES.match(line, pos + 1).end()
+    if pos == len(line):
+        raise ParseError(f'Unclosed dict line {lineNumber}: {line}')
+    return items, pos + 1
+
+
+def _parseMeta(line: str, pos: int, lineNumber: int) -> int:
+    """skip the meta tags (name or name:value separated by spaces) after a
+    grid version or a column name, return the position after them"""
+    while True:
+        _space = _SPACES.match(line, pos)
+        _name = _NAME.match(line, _space.end())
+        if _space.end() == pos or not _name:
+            return _space.end()
+        pos = _name.end()
+        if line.startswith(':', pos):
+            _kind, pos = _parseValue(line, pos + 1, lineNumber)
@@ -0,0 +1,153 @@
+"""Zinc scalar tokens shared by the Trio parsers.
+
+Token types are the terminal names of zinctype.lark (REF, NUMBER, ...),
+plus TRIO_UNQUOTED_STR for the Trio unquoted strings."""
+import re
+from typing import Optional
+
+from .exception import ParseError, ZincFormatException
+from .kinds import (NA, Bool, Coord, HaystackDate, HaystackDateTime,
+                    HaystackTime, HaystackUri, Kind, Marker, Number, Ref,
+                    Remove, Str, Symbol, XStr)
+from .zinc_datetime import parse_date, parse_datetime, parse_time
+
+_DIGITS = r'\d[\d_]*'
+_STR = r'"(?:[^"\\]|\\.)*"'
+_REF_CHARS = r'[a-zA-Z0-9_:\-.~]+'
+_DATE = r'\d{4}-\d{2}-\d{2}'
+_TIME = r'\d{2}:\d{2}:\d{2}\.?\d*'
+_COORD_DEG = rf'-?{_DIGITS}(?:\.{_DIGITS})?'
+
+# same terminals as zinctype.lark, ordered so that a prefix match picks the
+# token the grammar would (DATETIME before DATE, TIME before NUMBER...)
+SCALAR_PATTERNS = (
+    ('DATETIME', rf'{_DATE}T{_TIME}(?:Z UTC|Z|[+-]{_DIGITS}:{_DIGITS} (?:GMT[+-]{_DIGITS}|[a-zA-Z_][a-zA-Z_\-]*))'),
+    ('DATE', _DATE),
+    ('TIME', _TIME),
+    ('COORD', rf'C\({_COORD_DEG},{_COORD_DEG}\)'),
+    ('XSTR', rf'[A-Z][a-zA-Z0-9_]*\({_STR}\)'),
+    ('REF', rf'@{_REF_CHARS}(?: {_STR})?'),
+    ('SYMBOL', rf'\^{_REF_CHARS}'),
+    ('STR', _STR),
+    ('URI', r'`[^\n"]*`'),
+    ('NUMBER', rf'-?{_DIGITS}(?:\.{_DIGITS})?(?:[eE][+-]?{_DIGITS})?(?:[a-zA-Z0-9%_/$]|[^\x00-\x7F])*|-?INF|NaN'),
+    ('NA', r'NA'),
+    ('BOOL', r'[TF]'),
+    ('MARKER', r'M'),
+    ('REMOVE', r'R'),
+    ('NULL', r'N'),
+)
+
+SCALAR = re.compile('|'.join(
+    f'(?P<{tokenType}>{pattern})' for tokenType, pattern in SCALAR_PATTERNS))
+
+# split of the tokens matched above, the values are not checked again
+_REF = re.compile(r"(?P<ref>^@[0-9a-zA-Z_:\-.~]+)( \"(?P<desc>.*)\")?")
+_COORD = re.compile(r"^C\((?P<lat>[+-]?\d*\.\d*)\,(?P<lng>[+-]?\d+\.\d*)\)")
+_XSTR = re.compile(r"^(?P<type>[A-Z][a-zA-Z0-9_]+)\(\"(?P<val>(?:[^\"\\]|\\.)*)\"\)")
+_NUMBER = re.compile(r"(?P<number>^-?[\d]+\.?[\d]*(?:[eE][+-]?\d+)?)(?P<unit>.*)")
+
+_ESCAPE = re.compile(r'\\(?:u(?P<code>[0-9a-fA-F]{4})|(?P<char>.))')
+_ESCAPED = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t',
+            '"': '"', '\\': '\\', '$': '$', '`': '`'}
+
+
+def unescape(text: str) -> str:
+    """Text of a Zinc string literal without its backslash escapes"""
+    if '\\' not in text:
+        return text
+    return _ESCAPE.sub(_unescapeChar, text)
+
+
+def _unescapeChar(match: 're.Match') -> str:
+    if match.group('code'):
+        return chr(int(match.group('code'), 16))
+    char = match.group('char')
+    if char not in _ESCAPED:
+        raise ParseError(f'Invalid escape \\{char}')
+    return _ESCAPED[char]
+
+
+def decodeScalar(tokenType: str, text: str) -> Optional[Kind]:
+    """Build the Kind of a scalar token from its type (REF, NUMBER...) and
+    text, None for the null N"""
+    if tokenType == "NULL":
+        value = None
+    elif tokenType == "REF":
+        _match = _REF.match(text)
+        value = Ref.trusted(_match.group('ref'), _match.group('desc'))
+    elif tokenType == "MARKER":
+        value = Marker()
+    elif tokenType == "NA":
+        value = NA()
+    elif tokenType == "REMOVE":
+        value = Remove()
+    elif tokenType == "BOOL":
+        if text == 'T':
+            value = Bool(True)
+        else:
+            value = Bool(False)
+    elif tokenType == "NUMBER":
+        value = parseNumber(text)
+
+    elif tokenType == "STR":
+        value = Str(text[1:-1])
+
+    elif tokenType == "URI":
+        value = HaystackUri(text[1:-1])
+
+    elif tokenType == "SYMBOL":
+        value = Symbol.trusted(text)
+
+    elif tokenType == "DATE":
+        value = HaystackDate(parse_date(text))
+
+    elif tokenType == "TIME":
+        value = HaystackTime(parse_time(text))
+
+    elif tokenType == "DATETIME":
+        value = HaystackDateTime(parse_datetime(text))
+
+    elif tokenType == "COORD":
+        _match = _COORD.match(text)
+        value = Coord(float(_match.group('lat')), float(_match.group('lng')))
+
+    elif tokenType == "XSTR":
+        _match = _XSTR.match(text)
+        if _match is None:
+            # the grammars accept one letter type names, XStr does not
+            raise ZincFormatException(f'type name of {text} is incorrect')
+        value = XStr.trusted(_match.group('type'), _match.group('val'))
+
+    elif tokenType == "TRIO_UNQUOTED_STR":
+        value = Str(text.strip())
+
+    else:
+        raise ParseError(f'Unknown scalar type {tokenType}: {text}')
+
+    return value
+
+
+def decodeZincScalar(tokenType: str, text: str) -> Optional[Kind]:
+    """decodeScalar for Zinc, where the strings, Ref display names and XStr
+    values are unescaped"""
+    if tokenType == "STR":
+        return Str.trusted(unescape(text[1:-1]))
+    value = decodeScalar(tokenType, text)
+    if tokenType == "REF" and value.displayname:
+        value = Ref.trusted(value.value, unescape(value.displayname))
+    elif tokenType == "XSTR":
+        value = XStr.trusted(value.type, unescape(value.value))
+    return value
+
+
+def parseNumber(nb: str):
+    if nb == "INF":
+        return Number(float('INF'))
+    elif nb == "-INF":
+        return Number(float("-INF"))
+    elif nb == "NaN":
+        return Number(float("NaN"))
+    else:
+        _match = _NUMBER.match(nb)
+        return Number(float(_match.group('number')), _match.group('unit'))
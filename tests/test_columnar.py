@@ -0,0 +1,200 @@
+import pytest
+from haystackparser import columnar
+from haystackparser.columnar import ColumnStore
+from haystackparser.exception import TagNotFound
+from haystackparser.kinds import Marker, Number, Ref, Str
+from haystackparser.ontology import Tag
+from haystackparser.trio_parser import parse
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'python'])
+class Test_ColumnStore:
+    def test_numbers(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @site
+area: 3702ft²
+---
+id: @b1
+area: 100m²
+---
+id: @b2
+area: 250square_meter
+---
+id: @ahu1
+equip
+---
+id: @ahu2
+area: 12
+"""
+        area = ColumnStore.of(parse(trio, 'scanner'))['area']
+        assert list(area.numbers()) == [3702.0, 100.0, 250.0, 12.0]
+        assert list(area.numbers('m²')) == pytest.approx([343.926906, 100.0, 250.0])
+        assert list(area.numberRowsIn('m²')) == [0, 1, 2]
+        assert list(area.numbers('square_foot')) == pytest.approx(
+            [3702.0, 1076.391042, 2690.977604])
+        assert list(area.numbers('°C')) == []
+        assert area.unitSymbols == ['ft²', 'm²', 'square_meter']
+
+    def test_markers(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @site
+site
+---
+id: @b1
+site
+---
+id: @b2
+site
+---
+id: @ahu1
+equip
+---
+id: @ahu2
+equip
+"""
+        site = ColumnStore.of(parse(trio, 'scanner'))['site']
+        assert len(site) == 3
+        assert list(site.present) == [1, 1, 1, 0, 0]
+        assert list(site.rows()) == [0, 1, 2]
+        assert isinstance(site[1], Marker)
+        assert site[3] is None
+
+    def test_dictionary(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @site "Main site"
+site
+---
+id: @b1
+dis: "Building"
+---
+id: @b2
+dis: "Building"
+---
+id: @ahu1
+siteRef: @site "Main site"
+---
+id: @ahu2
+siteRef: @site
+"""
+        store = ColumnStore.of(parse(trio, 'scanner'))
+        assert len(store['dis'].dictionary) == 1
+        assert list(store['dis'].codes) == [0, 0]
+        assert [entity.id.value for entity in store.select(
+            'dis', Str('Building'))] == ['@b1', '@b2']
+        # refs match whatever their display name
+        assert [entity.id.value for entity in store.select(
+            'siteRef', Ref('@site'))] == ['@ahu1', '@ahu2']
+        assert store['siteRef'][3].displayname == 'Main site'
+        assert store.select('siteRef', Ref('@other')) == []
+        assert [entity.id.value for entity in store.select(
+            'id', Ref('@b2'))] == ['@b2']
+
+    def test_select(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @site
+site
+area: 3702ft²
+---
+id: @b1
+site
+area: 100m²
+---
+id: @ahu1
+equip
+---
+id: @ahu2
+equip
+area: 12
+"""
+        store = ColumnStore.of(parse(trio, 'scanner'))
+        assert [entity.id.value for entity in store.select(
+            'equip')] == ['@ahu1', '@ahu2']
+        assert [entity.id.value for entity in store.select(
+            'area', Number(100.0, 'm²'))] == ['@b1']
+        assert [entity.id.value for entity in store.select(
+            'area', Number(12.0))] == ['@ahu2']
+        assert [entity.id.value for entity in store.select(
+            'site', Marker())] == ['@site', '@b1']
+        assert store.select('unknown') == []
+        with pytest.raises(TagNotFound):
+            store['unknown']
+
+    def test_other_kinds(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @b1
+site
+---
+id: @b2
+installed: 2020-07-17
+"""
+        store = ColumnStore.of(parse(trio, 'scanner'))
+        assert store['installed'][1].toZinc == '2020-07-17'
+        assert list(store['installed'].otherRows) == [1]
+
+    def test_scan(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @site "Main site"
+area: 3702ft²
+---
+id: @ahu1
+siteRef: @site "Main site"
+---
+id: @ahu2
+siteRef: @site
+area: 12
+"""
+        rows = list(ColumnStore.of(parse(trio, 'scanner')).scan('area', 'siteRef'))
+        assert [tuple(kind.toZinc if kind else None for kind in row)
+                for row in rows] == [
+            ('3702.0ft²', None), (None, '@site "Main site"'), ('12.0', '@site')]
+
+    def test_cache(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @b1
+area: 100m²
+---
+id: @ahu1
+equip
+"""
+        myOntology = parse(trio, 'scanner')
+        store = ColumnStore.of(myOntology)
+        assert ColumnStore.of(myOntology) is store
+        myOntology[Ref('@ahu1')].append(Tag('area', Number(5.0, 'm²')))
+        store = ColumnStore.of(myOntology)
+        assert list(store['area'].numbers('m²')) == [100.0, 5.0]
+        assert list(store['area'].numberRowsIn('m²')) == [0, 1]
+
+    def test_arrays(self, backend, monkeypatch):
+        if backend == 'python':
+            monkeypatch.setattr(columnar, 'numpy', None)
+        trio = """
+id: @b1
+area: 100m²
+---
+id: @b2
+area: 2.5ft²
+"""
+        area = ColumnStore.of(parse(trio, 'scanner'))['area']
+        if backend == 'numpy':
+            np = pytest.importorskip('numpy')
+            assert isinstance(area.numbers('m²'), np.ndarray)
+            assert isinstance(area.rows(), np.ndarray)
+        else:
+            assert area.numbers('m²').typecode == 'd'
+            assert area.rows().typecode == 'I'
+        assert list(area.rows(Number(2.5, 'ft²'))) == [1]
+        assert list(area.rows(Number(2.5))) == []
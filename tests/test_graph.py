@@ -0,0 +1,205 @@
+import pytest
+from haystackparser.exception import RefNotFound
+from haystackparser.graph import RefGraph
+from haystackparser.kinds import Ref
+from haystackparser.ontology import Tag
+from haystackparser.trio_parser import parse
+
+
+class Test_RefGraph:
+    def test_children(self):
+        trio = """
+id: @site
+site
+---
+id: @ahu1
+equip
+siteRef: @site
+---
+id: @vav1
+equip
+equipRef: @ahu1
+siteRef: @site
+---
+id: @temp1
+point
+siteRef: @site
+---
+id: @temp2
+point
+equipRef: @ahu1
+"""
+        graph = RefGraph.of(parse(trio, 'scanner'))
+        assert [entity.id.value for entity in graph.children(
+            Ref('@ahu1'), via='equipRef')] == ['@vav1', '@temp2']
+        assert [entity.id.value for entity in graph.children(
+            Ref('@site'))] == ['@ahu1', '@vav1', '@temp1']
+        assert graph.children(Ref('@temp1')) == []
+
+    def test_parents(self):
+        trio = """
+id: @site
+site
+---
+id: @ahu1
+equip
+---
+id: @vav1
+equip
+equipRef: @ahu1
+siteRef: @site
+---
+id: @temp2
+point
+equipRef: @ahu1
+spaceRef: @room
+"""
+        graph = RefGraph.of(parse(trio, 'scanner'))
+        assert [entity.id.value for entity in graph.parents(
+            Ref('@vav1'))] == ['@ahu1', '@site']
+        assert [entity.id.value for entity in graph.parents(
+            Ref('@vav1'), via='siteRef')] == ['@site']
+        # dangling refs are skipped
+        assert [entity.id.value for entity in graph.parents(
+            Ref('@temp2'))] == ['@ahu1']
+
+    def test_ancestors(self):
+        trio = """
+id: @site
+site
+---
+id: @ahu1
+equip
+siteRef: @site
+---
+id: @vav1
+equip
+equipRef: @ahu1
+siteRef: @site
+---
+id: @temp1
+point
+equipRef: @vav1
+siteRef: @site
+"""
+        graph = RefGraph.of(parse(trio, 'scanner'))
+        assert [entity.id.value for entity in graph.ancestors(
+            Ref('@temp1'), via='equipRef')] == ['@vav1', '@ahu1']
+        assert [entity.id.value for entity in graph.ancestors(
+            Ref('@temp1'))] == ['@vav1', '@site', '@ahu1']
+
+    def test_subtree(self):
+        trio = """
+id: @site
+site
+---
+id: @ahu1
+equip
+siteRef: @site
+---
+id: @vav1
+equip
+equipRef: @ahu1
+siteRef: @site
+---
+id: @temp1
+point
+equipRef: @vav1
+siteRef: @site
+---
+id: @temp2
+point
+equipRef: @ahu1
+"""
+        graph = RefGraph.of(parse(trio, 'scanner'))
+        assert [entity.id.value for entity in graph.subtree(
+            Ref('@ahu1'), via='equipRef')] == ['@vav1', '@temp2', '@temp1']
+        assert [entity.id.value for entity in graph.subtree(
+            Ref('@site'))] == ['@ahu1', '@vav1', '@temp1', '@temp2']
+
+    def test_cycle(self):
+        trio = """
+id: @site
+site
+equipRef: @temp1
+---
+id: @ahu1
+equip
+---
+id: @vav1
+equip
+equipRef: @ahu1
+---
+id: @temp1
+point
+equipRef: @vav1
+"""
+        graph = RefGraph.of(parse(trio, 'scanner'))
+        assert [entity.id.value for entity in graph.ancestors(
+            Ref('@temp1'), via='equipRef')] == ['@vav1', '@ahu1']
+        assert [entity.id.value for entity in graph.subtree(
+            Ref('@site'), via='equipRef')] == []
+        assert [entity.id.value for entity in graph.ancestors(
+            Ref('@site'), via='equipRef')] == ['@temp1', '@vav1', '@ahu1']
+
+    def test_unknown_ref(self):
+        trio = """
+id: @temp2
+point
+spaceRef: @room
+"""
+        graph = RefGraph.of(parse(trio, 'scanner'))
+        with pytest.raises(RefNotFound):
+            graph.children(Ref('@room'))
+
+    def test_dangling(self):
+        trio = """
+id: @ahu1
+equip
+---
+id: @temp1
+point
+equipRef: @ahu1
+---
+id: @temp2
+point
+equipRef: @ahu1
+spaceRef: @room
+"""
+        myOntology = parse(trio, 'scanner')
+        graph = RefGraph.of(myOntology)
+        assert [(entity.id.value, name, ref.value)
+                for entity, name, ref in graph.dangling()] == [
+            ('@temp2', 'spaceRef', '@room')]
+        with pytest.raises(RefNotFound):
+            graph.check()
+        del myOntology[Ref('@temp2')]
+        RefGraph.of(myOntology).check()
+
+    def test_cache(self):
+        trio = """
+id: @ahu1
+equip
+---
+id: @vav1
+equip
+equipRef: @ahu1
+---
+id: @vav2
+equip
+---
+id: @temp1
+point
+equipRef: @vav2
+---
+id: @temp2
+point
+equipRef: @ahu1
+"""
+        myOntology = parse(trio, 'scanner')
+        graph = RefGraph.of(myOntology)
+        assert RefGraph.of(myOntology) is graph
+        myOntology[Ref('@temp1')]['equipRef'] = Tag('equipRef', Ref('@ahu1'))
+        assert RefGraph.of(myOntology) is not graph
+        assert [entity.id.value for entity in RefGraph.of(myOntology).children(
+            Ref('@ahu1'), via='equipRef')] == ['@vav1', '@temp1', '@temp2']
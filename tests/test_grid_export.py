@@ -0,0 +1,207 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from haystackparser.exception import IncompatibleUnits
+from haystackparser.kinds import Number
+from haystackparser.ontology import Grid
+from haystackparser.trio_parser import parse
+
+np = pytest.importorskip('numpy')
+
+
+class Test_to_numpy:
+    def test_number(self):
+        trio = """
+id: @p1
+curVal: 21.5°C
+---
+id: @p2
+curVal: 18°C
+---
+id: @p3
+equip
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        values, mask, meta = grid.to_numpy('curVal')
+        assert values.dtype == np.float64
+        assert list(values[:2]) == [21.5, 18.0]
+        assert np.isnan(values[2])
+        assert list(mask) == [False, False, True]
+        assert meta == {'kind': 'number', 'unit': '°C'}
+
+    def test_bool_marker(self):
+        trio = """
+id: @p1
+his: T
+---
+id: @p2
+his: F
+---
+id: @p3
+equip
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        values, mask, meta = grid.to_numpy('his')
+        assert values.dtype == bool
+        assert list(values) == [True, False, False]
+        assert list(mask) == [False, False, True]
+        values, mask, meta = grid.to_numpy('equip')
+        assert list(values) == [False, False, True]
+        assert not mask.any()
+        assert meta['kind'] == 'marker'
+
+    def test_dates(self):
+        trio = """
+id: @p1
+installed: 2020-07-17
+lastUpdate: 2020-07-17T16:55:12+02:00 Paris
+---
+id: @p2
+point
+---
+id: @p3
+installed: 2021-01-01
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        values, mask, meta = grid.to_numpy('installed')
+        assert values.dtype == np.dtype('datetime64[D]')
+        assert values[0] == np.datetime64('2020-07-17')
+        assert np.isnat(values[1])
+        values, mask, meta = grid.to_numpy('lastUpdate')
+        assert values.dtype == np.dtype('datetime64[us]')
+        assert values[0] == np.datetime64('2020-07-17T14:55:12')
+        assert meta == {'kind': 'dateTime', 'tz': 'Europe/Paris'}
+
+    def test_dictionary(self):
+        trio = """
+id: @p1
+kind: "Number"
+---
+id: @p2
+kind: "Number"
+---
+id: @p3
+kind: "Bool"
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        values, mask, meta = grid.to_numpy('kind')
+        assert values.dtype == np.int32
+        assert list(values) == [0, 0, 1]
+        assert list(meta['dictionary']) == ['Number', 'Bool']
+        values, mask, meta = grid.to_numpy('id')
+        assert list(meta['dictionary']) == ['@p1', '@p2', '@p3']
+        assert meta['kind'] == 'ref'
+
+    def test_object(self):
+        trio = """
+id: @p1
+point
+---
+id: @p2
+mixed: 12
+---
+id: @p3
+mixed: "text"
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        values, mask, meta = grid.to_numpy('mixed')
+        assert meta == {'kind': 'object'}
+        assert values[0] is None
+        assert values[2].value == 'text'
+
+    def test_unknown_column(self):
+        trio = """
+id: @p1
+point
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        with pytest.raises(KeyError):
+            grid.to_numpy('unknown')
+
+    def test_convert(self):
+        trio = """
+id: @p1
+curVal: 21.5°C
+---
+id: @p2
+curVal: 18°C
+---
+id: @p3
+equip
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        values, mask, meta = grid.to_numpy('curVal', unit='°F')
+        assert values[:2] == pytest.approx([70.7, 64.4])
+        assert np.isnan(values[2])
+        assert meta == {'kind': 'number', 'unit': '°F'}
+
+    def test_convert_mixed_units(self):
+        grid = Grid()
+        grid._addColumn('energy')
+        grid._row.extend([[Number(1.0, 'MWh')], [Number(500.0, 'kWh')], [None]])
+        values, mask, meta = grid.to_numpy('energy', unit='kWh')
+        assert values[:2] == pytest.approx([1000.0, 500.0])
+        assert list(mask) == [False, False, True]
+
+    def test_convert_mismatch(self):
+        trio = """
+id: @p1
+curVal: 21.5°C
+kind: "Number"
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        with pytest.raises(IncompatibleUnits):
+            grid.to_numpy('curVal', unit='kWh')
+        with pytest.raises(IncompatibleUnits):
+            grid.to_numpy('kind', unit='kWh')
+
+
+class Test_to_arrow:
+    def test_table(self):
+        trio = """
+id: @p1 "Point 1"
+point
+curVal: 21.5°C
+his: T
+installed: 2020-07-17
+lastUpdate: 2020-07-17T16:55:12+02:00 Paris
+kind: "Number"
+color: Color("red")
+---
+id: @p2
+point
+curVal: 18°C
+his: F
+kind: "Number"
+mixed: 12
+---
+id: @p3
+equip
+kind: "Bool"
+installed: 2021-01-01
+lastUpdate: 2021-01-01T00:00:00+01:00 Paris
+mixed: "text"
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        pa = pytest.importorskip('pyarrow')
+        table = grid.to_arrow()
+        assert table.num_rows == 3
+        assert table.column_names == grid._columns
+        schema = table.schema
+        assert schema.field('curVal').type == pa.float64()
+        assert schema.field('curVal').metadata == {b'kind': b'number',
+                                                   b'unit': '°C'.encode()}
+        assert table.column('curVal').to_pylist() == [21.5, 18.0, None]
+        assert table.column('his').to_pylist() == [True, False, None]
+        assert table.column('equip').to_pylist() == [False, False, True]
+        assert table.column('installed').to_pylist() == [
+            date(2020, 7, 17), None, date(2021, 1, 1)]
+        assert schema.field('lastUpdate').type == pa.timestamp(
+            'us', tz='Europe/Paris')
+        assert table.column('lastUpdate').to_pylist()[0].astimezone(
+            timezone.utc) == datetime(2020, 7, 17, 14, 55, 12,
+                                      tzinfo=timezone.utc)
+        assert pa.types.is_dictionary(schema.field('kind').type)
+        assert table.column('kind').to_pylist() == ['Number', 'Number', 'Bool']
+        assert table.column('color').to_pylist() == ['Color("red")', None, None]
+        assert table.column('mixed').to_pylist() == [None, '12.0', '"text"']
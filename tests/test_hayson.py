@@ -0,0 +1,152 @@
+import io
+import json
+
+import pytest
+from haystackparser import hayson
+from haystackparser.exception import ParseError
+from haystackparser.hayson import decodeKind, encodeKind
+from haystackparser.kinds import (Bool, HaystackList, Marker, Number, Ref, Str,
+                                  Symbol, XStr)
+from haystackparser.ontology import Grid, Ontology
+from haystackparser.trio_parser import parse
+
+
+class Test_Kinds:
+    def test_encode(self):
+        assert encodeKind(Bool(True)) is True
+        assert encodeKind(Str('text')) == 'text'
+        assert encodeKind(Symbol('^cov')) == {'_kind': 'symbol', 'val': 'cov'}
+        assert encodeKind(XStr('Color', 'red')) == {
+            '_kind': 'xstr', 'type': 'Color', 'val': 'red'}
+        assert encodeKind(HaystackList([Number(1.0), Marker()])) == [
+            {'_kind': 'number', 'val': 1.0}, {'_kind': 'marker'}]
+
+    def test_list_toJson(self):
+        assert json.dumps(HaystackList([Str('a'), Ref('@b')]).toJson) == \
+            '[{"_kind": "str", "val": "a"}, {"_kind": "ref", "val": "b"}]'
+
+    def test_decode(self):
+        assert decodeKind('text').value == 'text'
+        assert decodeKind(True).value is True
+        assert decodeKind(12).toZinc == '12.0'
+        assert decodeKind({'_kind': 'number', 'val': '-INF'}).toZinc == '-INF'
+        assert decodeKind({'_kind': 'ref', 'val': 'a', 'dis': 'A'}).toZinc == \
+            '@a "A"'
+        assert decodeKind({'_kind': 'dict', 'site': {'_kind': 'marker'}}) \
+            .toZinc == '{site:M}'
+        with pytest.raises(ParseError):
+            decodeKind({'_kind': 'unknown'})
+
+    @pytest.mark.parametrize('backend', ['orjson', 'json'])
+    def test_round_trip(self, monkeypatch, backend):
+        trio = """
+id: @site "Main site"
+site
+dis: "Site $1"
+area: 3702ft²
+geoCoord: C(37.5458266,-77.4491888)
+---
+id: @ahu
+equip
+siteRef: @site
+his: T
+writable: F
+hisMode: ^cov
+color: Color("red")
+enum: ["off","on"]
+range: {min:0,max:40}
+installed: 2020-07-17
+occupied: 08:00:00
+lastUpdate: 2020-07-17T16:55:12.977+02:00 Paris
+doc: `http://project-haystack.org/`
+"""
+        if backend == 'json':
+            monkeypatch.setattr(hayson, 'orjson', None)
+        myOntology = parse(trio, 'scanner')
+        text = myOntology.to_json()
+        assert Ontology.from_json(text).trio_dumper() == myOntology.trio_dumper()
+
+
+class Test_Ontology:
+    def test_to_json(self):
+        trio = """
+id: @site "Main site"
+site
+dis: "Site $1"
+area: 3702ft²
+geoCoord: C(37.5458266,-77.4491888)
+---
+id: @ahu
+equip
+his: T
+"""
+        entities = json.loads(parse(trio, 'scanner').to_json())
+        assert entities[0] == {
+            'id': {'_kind': 'ref', 'val': 'site', 'dis': 'Main site'},
+            'site': {'_kind': 'marker'},
+            'dis': 'Site $1',
+            'area': {'_kind': 'number', 'val': 3702.0, 'unit': 'ft²'},
+            'geoCoord': {'_kind': 'coord', 'lat': 37.5458266,
+                         'lng': -77.4491888},
+        }
+        assert entities[1]['his'] is True
+
+    def test_write_json(self):
+        trio = """
+id: @site "Main site"
+site
+---
+id: @ahu
+equip
+siteRef: @site
+"""
+        myOntology = parse(trio, 'scanner')
+        stream = io.StringIO()
+        myOntology.write_json(stream, chunkSize=1)
+        assert stream.getvalue() == myOntology.to_json()
+        assert Ontology().to_json() == '[]'
+
+    def test_from_json_id(self):
+        with pytest.raises(ParseError):
+            Ontology.from_json('[{"id": "site"}]')
+
+
+class Test_Grid:
+    def test_round_trip(self):
+        trio = """
+id: @site "Main site"
+site
+dis: "Site $1"
+area: 3702ft²
+---
+id: @ahu
+equip
+siteRef: @site
+range: {min:0,max:40}
+lastUpdate: 2020-07-17T16:55:12.977+02:00 Paris
+"""
+        myOntology = parse(trio, 'scanner')
+        grid = Grid(myOntology)
+        text = grid.to_json()
+        obj = json.loads(text)
+        assert obj['_kind'] == 'grid'
+        assert obj['cols'][:3] == [{'name': 'id'}, {'name': 'site'},
+                                   {'name': 'dis'}]
+        assert 'site' not in obj['rows'][1]
+        assert Grid.from_json(text).to_json() == text
+        assert Ontology.from_json(text).trio_dumper() == myOntology.trio_dumper()
+
+    def test_write_json(self):
+        trio = """
+id: @site "Main site"
+site
+---
+id: @ahu
+equip
+siteRef: @site
+"""
+        grid = Grid(parse(trio, 'scanner'))
+        stream = io.StringIO()
+        grid.write_json(stream, chunkSize=1)
+        assert stream.getvalue() == grid.to_json()
+        assert json.loads(Grid(Ontology()).to_json())['rows'] == []
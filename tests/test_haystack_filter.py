@@ -0,0 +1,207 @@
+import pytest
+from haystackparser.exception import ParseError
+from haystackparser.haystack_filter import parse_filter, query
+from haystackparser.kinds import Marker, Number, Ref
+from haystackparser.ontology import Tag
+from haystackparser.trio_parser import parse
+
+
+class Test_filter:
+    def test_has(self):
+        trio = """
+id: @site
+site
+---
+id: @temp1
+point
+sensor
+temp
+---
+id: @power1
+point
+sensor
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'point and sensor and temp')] == ['@temp1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'id and site')] == ['@site']
+
+    def test_missing(self):
+        trio = """
+id: @site
+site
+---
+id: @ahu1
+equip
+siteRef: @site
+---
+id: @temp1
+point
+temp
+equipRef: @ahu1
+---
+id: @power1
+point
+equipRef: @ahu1
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'point and not temp')] == ['@power1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'not equipRef and not siteRef')] == ['@site']
+
+    def test_or(self):
+        trio = """
+id: @site
+site
+---
+id: @temp1
+point
+temp
+---
+id: @power1
+point
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'site or (point and temp)')] == ['@site', '@temp1']
+
+    def test_ref_equality(self):
+        trio = """
+id: @ahu1
+equip
+---
+id: @ahu2
+equip
+---
+id: @temp1
+point
+equipRef: @ahu1
+---
+id: @temp2
+point
+equipRef: @ahu2
+---
+id: @power1
+point
+equipRef: @ahu1
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'equipRef==@ahu1')] == ['@temp1', '@power1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'id == @ahu2')] == ['@ahu2']
+        assert [entity.id.value for entity in query(
+            myOntology, 'point and equipRef != @ahu1')] == ['@temp2']
+
+    def test_number_comparison(self):
+        trio = """
+id: @temp1
+curVal: 21.5°C
+---
+id: @temp2
+curVal: 18°C
+---
+id: @power1
+curVal: 30kW
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'curVal > 20°C')] == ['@temp1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'curVal <= 21.5°C')] == ['@temp1', '@temp2']
+        assert [entity.id.value for entity in query(
+            myOntology, 'curVal == 30kW')] == ['@power1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'curVal > 20')] == []
+
+    def test_date_comparison(self):
+        trio = """
+id: @temp1
+installed: 2020-07-17
+---
+id: @temp2
+installed: 2021-01-01
+---
+id: @power1
+point
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'installed < 2021-01-01')] == ['@temp1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'installed >= 2021-01-01')] == ['@temp2']
+
+    def test_path(self):
+        trio = """
+id: @site
+site
+geoCity: "Paris"
+---
+id: @ahu1
+equip
+ahu
+siteRef: @site
+---
+id: @ahu2
+equip
+ahu
+siteRef: @other
+---
+id: @temp1
+point
+equipRef: @ahu1
+siteRef: @site
+---
+id: @temp2
+point
+equipRef: @ahu2
+---
+id: @power1
+point
+equipRef: @ahu1
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'point and equipRef->siteRef->geoCity == "Paris"')] == [
+            '@temp1', '@power1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'equipRef->ahu and not siteRef')] == ['@temp2', '@power1']
+        assert [entity.id.value for entity in query(
+            myOntology, 'siteRef->site')] == ['@ahu1', '@temp1']
+
+    def test_index_follows_changes(self):
+        trio = """
+id: @temp1
+temp
+curVal: 21.5°C
+---
+id: @temp2
+temp
+curVal: 18°C
+---
+id: @power1
+curVal: 30kW
+"""
+        myOntology = parse(trio, 'scanner')
+        assert [entity.id.value for entity in query(
+            myOntology, 'temp')] == ['@temp1', '@temp2']
+        myOntology[Ref('@power1')].append(Tag('temp', Marker()))
+        del myOntology[Ref('@temp1')]['temp']
+        assert [entity.id.value for entity in query(
+            myOntology, 'temp')] == ['@temp2', '@power1']
+        myOntology[Ref('@temp2')]['curVal'] = Tag('curVal', Number(25.0, '°C'))
+        assert [entity.id.value for entity in query(
+            myOntology, 'curVal > 20°C')] == ['@temp1', '@temp2']
+        del myOntology[Ref('@temp2')]
+        assert [entity.id.value for entity in query(
+            myOntology, 'curVal > 20°C')] == ['@temp1']
+
+    def test_repr(self):
+        assert repr(parse_filter('a and b->c == 2 or not d')) == \
+            '((a and b->c == 2.0) or not d)'
+
+    def test_malformed(self):
+        with pytest.raises(ParseError, match='Filter point and malformed'):
+            parse_filter('point and')
@@ -1,3 +1,5 @@
+import copy
+import pickle
 
 from datetime import date, time, datetime
 from dis import dis
@@ -6,7 +8,7 @@ from math import nan
 import math
 from zoneinfo import ZoneInfo
 import pytest
-from haystackparser.exception import ZincFormatException
+from haystackparser.exception import IncompatibleUnits, ZincFormatException
 from haystackparser.kinds import Bool, Coord, HaystackDate, HaystackDateTime, HaystackDict, HaystackList, HaystackTime, Marker, NA, Number, Ref, Remove, Str, HaystackUri, Ref, Symbol, XStr
 
 
@@ -30,6 +32,14 @@ class Test_Marker:
         myMarker = Marker()
         assert myMarker.toZinc == 'M'
 
+    def test_singleton(self):
+        assert Marker() is Marker()
+        assert NA() is NA()
+        assert Remove() is Remove()
+        assert Marker() is not NA()
+        assert pickle.loads(pickle.dumps(Marker())) is Marker()
+        assert copy.deepcopy(Remove()) is Remove()
+
 
 class Test_NA:
 
@@ -78,6 +88,15 @@ class Test_Bool:
 
         assert tag.toZinc == 'F'
 
+    def test_interned(self):
+        assert Bool(True) is Bool(True)
+        assert Bool(False) is Bool(False)
+        assert Bool(True) != Bool(False)
+        assert Bool(1) is Bool(True)
+        assert pickle.loads(pickle.dumps(Bool(False))) is Bool(False)
+        with pytest.raises(AttributeError):
+            Bool(True).value = False
+
 
 class Test_Number:
     def test_number(self):
@@ -145,6 +164,91 @@ class Test_Number:
         assert tag.unit.canonical == 'square_meter'
 
 
+class Test_NumberOperators:
+    def test_eq_hash(self):
+        assert Number(1.0, 'kW') == Number(1.0, 'kW')
+        assert Number(1.0, 'kWh') == Number(1000.0, 'Wh')
+        assert hash(Number(1.0, 'kWh')) == hash(Number(1000.0, 'Wh'))
+        assert Number(1.0, 'kWh') != Number(1.0, 'kW')
+        assert Number(1.0) != Number(1.0, 'kW')
+        assert Number(1.0) == 1
+        assert hash(Number(1.0)) == hash(1.0)
+        assert Number(1.0, 'kW') != 1.0
+        assert Number(1.0, 'kW') != 1
+        assert len({Number(2.0, 'MWh'), Number(2000.0, 'kWh')}) == 1
+
+    def test_eq_rounded(self):
+        assert Number(100.0, '°C') == Number(212.0, '°F')
+        assert hash(Number(100.0, '°C')) == hash(Number(212.0, '°F'))
+        # base values closer than 12 significant digits are equal
+        assert Number(1.0, 'kW') == Number(1.0 + 1e-13, 'kW')
+        assert Number(1.0, 'kW') != Number(1.0 + 1e-11, 'kW')
+
+    def test_compare(self):
+        assert Number(1.0, 'MWh') > Number(999.0, 'kWh')
+        assert Number(0.0, '°C') < Number(40.0, '°F')
+        assert Number(1.0) < 2
+        readings = [Number(2.0, 'MWh'), Number(500.0, 'kWh'), Number(3.6e9, 'BTU')]
+        assert [number.toZinc for number in sorted(readings)] == [
+            '500.0kWh', '2.0MWh', '3600000000.0BTU']
+        with pytest.raises(IncompatibleUnits, match='Cannot compare'):
+            Number(1.0, 'kWh') < Number(1.0, '°C')
+
+    def test_compare_without_unit(self):
+        with pytest.raises(IncompatibleUnits, match='Cannot compare'):
+            Number(1.0, 'kW') < Number(2.0)
+        with pytest.raises(IncompatibleUnits, match='Cannot compare'):
+            Number(1.0, 'kW') < 2
+        with pytest.raises(IncompatibleUnits, match='Cannot compare'):
+            Number(1.0) >= Number(2.0, 'kW')
+
+    def test_add_sub(self):
+        assert (Number(1.0, 'MWh') + Number(500.0, 'kWh')).toZinc == '1.5MWh'
+        assert (Number(1.0, 'MWh') - Number(500.0, 'kWh')).toZinc == '0.5MWh'
+        assert (2 + Number(1.0)).toZinc == '3.0'
+        assert (10.0 - Number(1.0)).toZinc == '9.0'
+        assert (-Number(1.0, 'kW')).toZinc == '-1.0kW'
+        with pytest.raises(IncompatibleUnits):
+            Number(1.0, 'kWh') + Number(1.0, 'kW')
+
+    def test_add_sub_without_unit(self):
+        with pytest.raises(IncompatibleUnits, match='Cannot combine'):
+            Number(2.0) + Number(1.0, 'kW')
+        with pytest.raises(IncompatibleUnits, match='Cannot combine'):
+            2 + Number(1.0, 'kW')
+        with pytest.raises(IncompatibleUnits, match='Cannot combine'):
+            Number(1.0, 'kW') - 10.0
+
+    def test_sum(self):
+        assert sum([Number(1.0, 'kW')]).toZinc == '1.0kW'
+        assert sum([Number(1.0, 'kWh'), Number(500.0, 'Wh')]).toZinc == '1.5kWh'
+        assert sum([Number(1.0), Number(2.0)]).toZinc == '3.0'
+        with pytest.raises(IncompatibleUnits, match='Cannot combine'):
+            1 + Number(1.0, 'kW')
+        with pytest.raises(IncompatibleUnits, match='Cannot combine'):
+            0.0 + Number(1.0, 'kW')
+
+    def test_mul_div(self):
+        assert (Number(2.0, 'kW') * 3).toZinc == '6.0kW'
+        assert (3 * Number(2.0, 'kW')).toZinc == '6.0kW'
+        assert (Number(6.0, 'kW') / 3).toZinc == '2.0kW'
+        assert (Number(2.0) * Number(3.0, 'kW')).toZinc == '6.0kW'
+        assert (Number(6.0, 'kW') / Number(3.0)).toZinc == '2.0kW'
+        ratio = Number(1.0, 'MWh') / Number(500.0, 'kWh')
+        assert ratio.toZinc == '2.0'
+        assert (1 / Number(4.0)).toZinc == '0.25'
+        with pytest.raises(IncompatibleUnits):
+            Number(1.0, 'kW') * Number(1.0, 'h')
+        with pytest.raises(IncompatibleUnits):
+            1 / Number(4.0, 'kW')
+
+    def test_not_a_number(self):
+        with pytest.raises(TypeError):
+            Number(1.0, 'kW') + Str('1')
+        with pytest.raises(TypeError):
+            Number(1.0, 'kW') < '1'
+
+
 class Test_Str:
     def test_create(self):
         tag = Str('Une chaine un peu longue \$ \n')
@@ -223,6 +327,11 @@ class Test_Ref:
         assert ref.toJson == {"_kind": "ref",
                               "val": value, "dis": displayname}
 
+    def test_trusted(self):
+        ref = Ref.trusted('@reftest', 'display reftest')
+        assert ref == Ref('@reftest')
+        assert ref.toZinc == '@reftest "display reftest"'
+
 
 class Test_Symbol:
     def test_create(self):
@@ -234,6 +343,9 @@ class Test_Symbol:
         assert ref.toZinc == value
         assert ref.toJson == {"_kind": "ref", "val": "elec-meter"}
 
+    def test_trusted(self):
+        assert Symbol.trusted('^elec-meter').toZinc == '^elec-meter'
+
 
 class Test_Date:
     def test_Date(self):
@@ -321,6 +433,18 @@ class Test_Date:
         assert mydate.value == datetime(2022, 8, 3, 14, 30, 00)
 
 
+@pytest.mark.parametrize('kind', [
+    Marker(), NA(), Remove(), Bool(True), Number(1.0, 'kW'), Str('text'),
+    HaystackUri('http://x'), Ref('@a', 'A'), Symbol('^cov'),
+    HaystackDate(date(2022, 8, 3)), HaystackTime(time(8, 0)),
+    HaystackDateTime(datetime(2022, 8, 3, 14, 30, tzinfo=ZoneInfo('Europe/Paris'))),
+    Coord(23.43, 12.32), XStr('Color', 'red'), HaystackList([Number(1.0)]),
+    HaystackDict({'ref': Ref('@a')})])
+def test_slots(kind):
+    assert not hasattr(kind, '__dict__')
+    assert pickle.loads(pickle.dumps(kind)).toZinc == kind.toZinc
+
+
 class Test_Coord:
     def test_create(self):
         mycoord = Coord(23.43, 12.32)
@@ -357,6 +481,10 @@ class Test_XStr:
                            match=f'type name "{tagName}" is incorrect') as exception:
             xstr = XStr(tagName, "red")
 
+    def test_trusted(self):
+        xstr = XStr.trusted("Color", "red")
+        assert xstr.toZinc == 'Color("red")'
+
 
 class Test_HaystackList:
     def test_create(self):
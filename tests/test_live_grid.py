@@ -0,0 +1,114 @@
+import pickle
+
+import pytest
+from haystackparser.kinds import Marker, Number, Ref, Str
+from haystackparser.live_grid import LiveGrid
+from haystackparser.ontology import Entity, Grid, Ontology, Tag
+from haystackparser.zinc_parser import parse_zinc
+
+
+def rows(grid):
+    """cells of each row by column name, whatever the column order"""
+    return [{name: kind.toZinc for name, kind in zip(grid._columns, row)
+             if kind is not None} for row in grid._row]
+
+
+@pytest.fixture
+def ontology():
+    return Ontology([
+        Entity(Ref('@site'), [Tag('site', Marker()), Tag('dis', Str('Site'))]),
+        Entity(Ref('@p1'), [Tag('point', Marker()),
+                            Tag('curVal', Number(21.5, '°C'))]),
+        Entity(Ref('@p2'), [Tag('point', Marker()),
+                            Tag('curVal', Number(18.0, '°C'))]),
+    ])
+
+
+class Test_LiveGrid:
+    def test_create(self, ontology):
+        assert LiveGrid(ontology).toZinc() == Grid(ontology).toZinc()
+
+    def test_set_tag(self, ontology):
+        grid = LiveGrid(ontology)
+        ontology[Ref('@p1')]['curVal'] = Tag('curVal', Number(22.0, '°C'))
+        assert grid.toZinc() == Grid(ontology).toZinc()
+        assert '22.0°C' in grid.toZinc()
+
+    def test_add_delete_tag(self, ontology):
+        grid = LiveGrid(ontology)
+        ontology[Ref('@p2')].append(Tag('his', Marker()))
+        assert rows(grid) == rows(Grid(ontology))
+        assert 'his' in grid._columns
+        del ontology[Ref('@p2')]['his']
+        assert rows(grid) == rows(Grid(ontology))
+        assert 'his' not in grid._columns
+
+    def test_entities(self, ontology):
+        grid = LiveGrid(ontology)
+        ontology.append(Entity(Ref('@p3'), [Tag('equip', Marker())]))
+        assert grid.toZinc() == Grid(ontology).toZinc()
+        del ontology[Ref('@site')]
+        assert rows(grid) == rows(Grid(ontology))
+        assert 'site' not in grid._columns
+        ontology[0] = Entity(Ref('@p4'), [Tag('point', Marker())])
+        assert rows(grid) == rows(Grid(ontology))
+        ontology[Ref('@p2')].id = Ref('@renamed')
+        assert rows(grid) == rows(Grid(ontology))
+        assert rows(parse_zinc(grid.toZinc())) == rows(Grid(ontology))
+
+    def test_removed_after_removal(self, ontology):
+        seen = []
+
+        class Observer:
+            def _entityAdded(self, entity):
+                pass
+
+            def _entityRemoved(self, entity):
+                seen.append((entity.id.value, entity in ontology.entities,
+                             len(ontology)))
+
+        observer = Observer()
+        ontology._observers.add(observer)
+        del ontology[Ref('@site')]
+        del ontology[0:1]
+        ontology[0] = Entity(Ref('@p4'), [Tag('point', Marker())])
+        assert seen == [('@site', False, 2), ('@p1', False, 1), ('@p2', False, 1)]
+
+    def test_no_observer(self, ontology, monkeypatch):
+        events = []
+        monkeypatch.setattr(ontology, '_notify',
+                            lambda event, entity: events.append(event))
+        ontology[Ref('@p1')].append(Tag('his', Marker()))
+        assert events == []
+        # observers are weakly held
+        grid = LiveGrid(ontology)  # noqa: F841
+        ontology[Ref('@p1')].append(Tag('writable', Marker()))
+        assert events == ['_entityChanged']
+
+    def test_zinc_cache(self, ontology):
+        grid = LiveGrid(ontology)
+        grid.toZinc()
+        assert len(grid._zincOf) == 3
+        ontology[Ref('@p1')]['curVal'] = Tag('curVal', Number(22.0, '°C'))
+        assert ontology[Ref('@p1')] not in grid._zincOf
+        assert ontology[Ref('@p2')] in grid._zincOf
+        grid.toZinc()
+        assert len(grid._zincOf) == 3
+
+    def test_exports(self, ontology):
+        grid = LiveGrid(ontology)
+        del ontology[Ref('@site')]
+        assert grid.to_json() == Grid(ontology).to_json()
+        empty = LiveGrid(Ontology())
+        assert empty.toZinc() == Grid(Ontology()).toZinc()
+        assert parse_zinc(empty.toZinc())._columns == []
+
+    def test_update_grid(self, ontology):
+        with pytest.raises(NotImplementedError):
+            LiveGrid(ontology).updateGrid(ontology)
+
+    def test_pickle_ontology(self, ontology):
+        grid = LiveGrid(ontology)
+        copy = pickle.loads(pickle.dumps(ontology))
+        copy[Ref('@p1')]['curVal'] = Tag('curVal', Number(0.0, '°C'))
+        assert '21.5°C' in grid.toZinc()
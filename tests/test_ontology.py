@@ -1,10 +1,12 @@
+import io
 
+import pickle
 from datetime import date, datetime, time
 from decimal import Clamped
 from linecache import lazycache
 from re import M
 from zoneinfo import ZoneInfo
-from haystackparser.exception import DontChangeTagName, DuplicateEntity, DuplicateTag, EntityNotFound, RefNotFound, TagNotFound
+from haystackparser.exception import DontChangeTagName, DuplicateEntity, DuplicateTag, EntityNotFound, RefNotFound, TagNotFound, ZincFormatException
 from haystackparser.kinds import NA, Bool, Coord, HaystackDate, HaystackDateTime, HaystackDict, HaystackList, HaystackTime, HaystackUri, Marker, Number, Ref, Remove, Str, Symbol, XStr
 from haystackparser.ontology import Entity, Grid, Ontology, Tag
 import pytest
@@ -89,6 +91,15 @@ class Test_Ontology:
 
 
 class Test_Entity:
+    def test_slots(self):
+        myEntity = Entity(Ref('@a'), [Tag('curVal', Number(1.0, '°C'))])
+        assert not hasattr(myEntity, '__dict__')
+        assert not hasattr(myEntity['curVal'], '__dict__')
+        copy = pickle.loads(pickle.dumps(myEntity))
+        assert copy.id == Ref('@a')
+        assert copy['curVal'].kind.toZinc == '1.0°C'
+        assert len(copy._ontologies) == 0
+
     def test_create(self):
         myEntity = Entity()
         myEntity.id = Ref("@ret", "Test")
@@ -196,6 +207,42 @@ class Test_Entity:
         myEntity = Entity(Ref("@test"), [tag, tag2, tag3])
         assert myEntity['test'] == tag
 
+    def test_tag_index(self):
+        tags = [Tag(f'test{idx}', Marker()) for idx in range(5)]
+        myEntity = Entity(Ref("@test"), tags)
+        del myEntity[0]
+        del myEntity[1:3]
+        del myEntity['test4']
+        assert [tag.name for tag in myEntity] == ['test1']
+        for idx in (0, 2, 3, 4):
+            assert f'test{idx}' not in myEntity
+            with pytest.raises(TagNotFound):
+                myEntity[f'test{idx}']
+        myEntity.append(tags[4])
+        assert 'test4' in myEntity
+        assert tags[4] in myEntity
+        tag = Tag('test1', NA())
+        myEntity['test1'] = tag
+        assert myEntity['test1'] is tag
+        tag = Tag('test4', NA())
+        myEntity[1] = tag
+        assert myEntity['test4'] is tag
+        with pytest.raises(DuplicateTag):
+            myEntity.append(Tag('test4', Marker()))
+
+    def test_tag_positions(self):
+        myEntity = Entity(Ref("@test"),
+                          [Tag(f'test{idx}', Marker()) for idx in range(5)])
+        del myEntity['test1']
+        del myEntity[-2]
+        assert [tag.name for tag in myEntity] == ['test0', 'test2', 'test4']
+        tag = Tag('test4', NA())
+        myEntity['test4'] = tag
+        assert myEntity[2] is tag
+        assert myEntity._tagIndex == {'test0': 0, 'test2': 1, 'test4': 2}
+        with pytest.raises(IndexError):
+            del myEntity[3]
+
 
 class Test_Tag:
     def test_create(self):
@@ -212,6 +259,15 @@ class Test_Tag:
         assert myTag() == 34.3
         assert myTag.kind == 34.3
 
+    def test_malformed(self):
+        with pytest.raises(ZincFormatException, match='Tag name : Test is malformed'):
+            Tag('Test', NA())
+
+    def test_trusted(self):
+        myTag = Tag.trusted('test', Number(34.3))
+        assert myTag.name == 'test'
+        assert myTag.kind == 34.3
+
 
 class Test_TrioDumper:
     def test_one_entity(self):
@@ -369,4 +425,93 @@ id, number1, str1, number2, str2, marker2, list3, dict3
 @entity1 "Entity1  name", 1.0, "String\$ 1"
 @entity2 "Entity2  name", , , 2.0, "String\$ 2", M, [1.0, "two", 3.0], {x:1.0, y:"4.0"}
 """
-        pass
\ No newline at end of file
+        pass
+
+    def test_short_rows(self):
+        myOntology = Ontology([
+            Entity(Ref('@a'), [Tag('site', Marker())]),
+            Entity(Ref('@b'), [Tag('equip', Marker()),
+                               Tag('siteRef', Ref('@a'))]),
+            Entity(Ref('@c'), [Tag('site', Marker())]),
+        ])
+        myGrid = Grid(myOntology)
+        assert myGrid._columnIndex == {'id': 0, 'site': 1, 'equip': 2,
+                                       'siteRef': 3}
+        assert myGrid.toZinc() == """ver:"3.0"
+id, site, equip, siteRef
+@a, M
+@b, , M, @a
+@c, M, , 
+"""
+        assert repr(myGrid) == myGrid.toZinc()
+
+    def test_iter_zinc(self):
+        myOntology = Ontology([Entity(Ref(f'@e{idx}'), [Tag('point', Marker())])
+                               for idx in range(5)])
+        myGrid = Grid(myOntology)
+        chunks = list(myGrid.iter_zinc(chunkSize=2))
+        assert chunks == ['ver:"3.0"\nid, point\n', '@e0, M\n@e1, M\n',
+                          '@e2, M\n@e3, M\n', '@e4, M\n']
+        assert ''.join(chunks) == myGrid.toZinc()
+        assert list(Grid(Ontology()).iter_zinc()) == ['ver:"3.0"\nempty\n']
+
+    def test_write_zinc(self):
+        myOntology = Ontology([Entity(Ref(f'@e{idx}'), [Tag('point', Marker())])
+                               for idx in range(5)])
+        myGrid = Grid(myOntology)
+        stream = io.StringIO()
+        myGrid.write_zinc(stream, chunkSize=3)
+        assert stream.getvalue() == myGrid.toZinc()
+
+class Test_OntologyIndex:
+    def test_append_same_entity(self):
+        myentie = Entity(Ref("@aze"))
+        myOntology = Ontology([myentie])
+        with pytest.raises(DuplicateEntity):
+            myOntology.append(myentie)
+
+    def test_set_by_index(self):
+        myentie = Entity(Ref("@aze"))
+        myentie2 = Entity(Ref("@aze2"))
+        myOntology = Ontology([myentie, myentie2])
+        myOntology[0] = Entity(Ref("@aze3"))
+        assert myOntology[Ref("@aze3")] == myOntology[0]
+        with pytest.raises(EntityNotFound):
+            myOntology[Ref("@aze")]
+        with pytest.raises(DuplicateEntity):
+            myOntology[0] = Entity(Ref("@aze2"))
+
+    def test_del_by_index_and_slice(self):
+        entities = [Entity(Ref(f"@aze{idx}")) for idx in range(5)]
+        myOntology = Ontology(entities)
+        del myOntology[0]
+        del myOntology[1:3]
+        assert [entity.id.value for entity in myOntology] == ['@aze1', '@aze4']
+        for idx in (0, 2, 3):
+            with pytest.raises(EntityNotFound):
+                myOntology[Ref(f"@aze{idx}")]
+        myOntology.append(entities[0])
+        assert myOntology[Ref("@aze0")] == entities[0]
+
+    def test_id_change(self):
+        myentie = Entity(Ref("@aze"))
+        myentie2 = Entity(Ref("@aze2"))
+        myOntology = Ontology([myentie, myentie2])
+        mySlice = myOntology[0:1]
+        myentie.id = Ref("@renamed")
+        assert myOntology[Ref("@renamed")] == myentie
+        assert mySlice[Ref("@renamed")] == myentie
+        with pytest.raises(EntityNotFound):
+            myOntology[Ref("@aze")]
+        with pytest.raises(DuplicateEntity):
+            myentie.id = Ref("@aze2")
+        assert myentie.id == Ref("@renamed")
+        del myOntology[Ref("@renamed")]
+        myentie.id = Ref("@aze2")
+        assert mySlice[Ref("@aze2")] == myentie
+
+    def test_pickle(self):
+        myentie = Entity(Ref("@aze"), [Tag('test', Marker())])
+        myOntology = pickle.loads(pickle.dumps(Ontology([myentie])))
+        myOntology[0].id = Ref("@renamed")
+        assert myOntology[Ref("@renamed")]['test'].kind == Marker()
@@ -0,0 +1,133 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from haystackparser import snapshot
+from haystackparser.exception import EntityNotFound, ParseError
+from haystackparser.kinds import (HaystackDateTime, HaystackTime, Number,
+                                  Ref, Str)
+from haystackparser.ontology import Entity, Ontology, Tag
+from haystackparser.trio_parser import parse
+
+
+class Test_snapshot:
+    def test_round_trip(self):
+        trio = """
+id: @site "Main site"
+site
+dis: "Site $1"
+area: 3702ft²
+geoCoord: C(37.5458266,-77.4491888)
+tz: "Paris"
+---
+id: @ahu
+equip
+na: NA
+remove: R
+siteRef: @site
+his: T
+writable: F
+hisMode: ^cov
+color: Color("red")
+enum: ["off","on", 2]
+range: {min:0,max:40, dis:"Range"}
+installed: 2020-07-17
+occupied: 08:00:00.25
+lastUpdate: 2020-07-17T16:55:12.977+02:00 Paris
+winter: 2021-01-01T23:59:59-05:00 New_York
+doc: `http://project-haystack.org/`
+curVal: -INF
+vendor: Acme Corp
+"""
+        myOntology = parse(trio, 'scanner')
+        assert snapshot.loads(snapshot.dumps(myOntology)).trio_dumper() == \
+            myOntology.trio_dumper()
+
+    def test_file(self, tmp_path):
+        trio = """
+id: @site "Main site"
+site
+area: 3702ft²
+---
+id: @ahu
+equip
+siteRef: @site
+lastUpdate: 2020-07-17T16:55:12.977+02:00 Paris
+"""
+        myOntology = parse(trio, 'scanner')
+        path = tmp_path / 'site.hsnap'
+        snapshot.save(myOntology, path)
+        assert snapshot.load(path).trio_dumper() == myOntology.trio_dumper()
+
+    def test_lazy(self, tmp_path):
+        trio = """
+id: @site "Main site"
+site
+---
+id: @ahu
+equip
+siteRef: @site
+"""
+        path = tmp_path / 'site.hsnap'
+        snapshot.save(parse(trio, 'scanner'), path)
+        with snapshot.Snapshot(path) as mySnapshot:
+            assert len(mySnapshot) == 2
+            assert mySnapshot._entities == {}
+            ahu = mySnapshot[Ref('@ahu')]
+            assert list(mySnapshot._entities) == [1]
+            assert ahu['siteRef'].kind.value == '@site'
+            assert mySnapshot[1] is ahu
+            assert mySnapshot[-2].id.displayname == 'Main site'
+            with pytest.raises(EntityNotFound):
+                mySnapshot[Ref('@unknown')]
+            with pytest.raises(IndexError):
+                mySnapshot[2]
+
+    def test_interned_strings(self):
+        ontology = Ontology([Entity(Ref(f'@p{idx}'),
+                                    [Tag('curVal', Number(float(idx), '°C')),
+                                     Tag('unit', Str('°C'))])
+                             for idx in range(100)])
+        data = snapshot.dumps(ontology)
+        assert data.count('°C'.encode('utf-8')) == 1
+        assert data.count(b'curVal') == 1
+
+    def test_datetime_without_zoneinfo(self):
+        ontology = parse('id: @a\nts: 2020-07-17T16:55:12Z\n', 'scanner')
+        assert ontology[0]['ts'].kind.value.tzinfo is not None
+        copy = snapshot.loads(snapshot.dumps(ontology))
+        assert isinstance(copy[0]['ts'].kind, HaystackDateTime)
+        assert copy[0]['ts'].kind.value == ontology[0]['ts'].kind.value
+
+    def test_fixed_width_times(self):
+        offset = timezone(timedelta(hours=-5, minutes=-30))
+        values = [
+            HaystackDateTime(datetime(2020, 7, 17, 16, 55, 12, 977000, offset)),
+            HaystackDateTime(datetime(1900, 1, 1, 8)),
+            HaystackTime(time(8, 0, 0, 250000, offset)),
+            HaystackTime(time(8, 0)),
+        ]
+        ontology = Ontology([Entity(Ref('@a'), [
+            Tag(f'value{idx}', value) for idx, value in enumerate(values)])])
+        data = snapshot.dumps(ontology)
+        assert b'pickle' not in data and b'haystackparser' not in data
+        copy = snapshot.loads(data)[0]
+        for idx, value in enumerate(values):
+            assert copy[f'value{idx}'].kind.value == value.value
+            assert copy[f'value{idx}'].kind.value.utcoffset() == \
+                value.value.utcoffset()
+
+    def test_not_encodable(self):
+        value = HaystackTime(time(8, 0, tzinfo=ZoneInfo('Europe/Paris')))
+        with pytest.raises(TypeError, match='no fixed UTC offset'):
+            snapshot.dumps(Ontology([Entity(Ref('@a'), [Tag('occupied', value)])]))
+
+    def test_not_a_snapshot(self, tmp_path):
+        path = tmp_path / 'site.trio'
+        path.write_text('id: @site\nsite\n')
+        with pytest.raises(ParseError):
+            snapshot.Snapshot(path)
+        data = bytearray(snapshot.dumps(Ontology()))
+        data[8] = 9
+        with pytest.raises(ParseError):
+            snapshot.loads(bytes(data))
@@ -1,218 +1,248 @@
 
+import io
 from datetime import datetime
 from math import isinf, isnan
 from zoneinfo import ZoneInfo
+from haystackparser.exception import DuplicateEntity, ParseError
 from haystackparser.kinds import NA, Marker, Ref, Remove
-from haystackparser.trio_parser import parse
+from haystackparser.trio_parser import ENGINES, iter_parse, parse, parse_parallel
+import pytest
 
 
+@pytest.mark.parametrize('engine', ENGINES)
 class Test_trio():
-    def test_parse_ref(self):
+    def test_parse_ref(self, engine):
         trio = """
 id: @test "test"
 test: @essais
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[0].id.displayname == "test"
         assert ontology[Ref('@test')]['test'].kind == Ref('@essais')
 
-    def test_parse_marker(self):
+    def test_parse_marker(self, engine):
         trio = """
 id: @test "test"
 test: M
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == Marker()
 
-    def test_parse_NA(self):
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_parse_NULL(self, engine, lazy):
+        trio = """
+id: @test "test"
+test: N
+range: {min:0, max:N}
+empty: {max:N}
+"""
+        ontology = parse(trio, engine, lazy)
+        assert 'test' not in ontology[Ref('@test')]
+        assert ontology[Ref('@test')]['range'].kind.toZinc == '{min:0.0}'
+        assert ontology[Ref('@test')]['empty'].kind.toZinc == '{}'
+        with pytest.raises(ParseError, match='Null in list'):
+            # a lazy parse raises on first access
+            parse('id: @test\ntest: [1,N]\n', engine, lazy)[Ref('@test')]['test'].kind
+        with pytest.raises(ParseError, match='id tag is always a Ref'):
+            parse('id: N\n', engine, lazy)
+
+    def test_parse_NA(self, engine):
         trio = """
 id: @test "test"
 test: NA
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == NA()
 
-    def test_parse_REMOVE(self):
+    def test_parse_REMOVE(self, engine):
         trio = """
 id: @test "test"
 test: R
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == Remove()
 
-    def test_parse_BOOL_True(self):
+    def test_parse_BOOL_True(self, engine):
         trio = """
 id: @test "test"
 test: T
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == True
 
-    def test_parse_BOOL_False(self):
+    def test_parse_BOOL_False(self, engine):
         trio = """
 id: @test "test"
 test: F
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == False
 
-    def test_parse_NUMBER(self):
+    def test_parse_NUMBER(self, engine):
         trio = """
 id: @test "test"
 test: 23
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == 23.0
 
-    def test_parse_NUMBER_float(self):
+    def test_parse_NUMBER_float(self, engine):
         trio = """
 id: @test "test"
 test: 23.1
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == 23.1
 
-    def test_parse_NUMBER_float_m(self):
+    def test_parse_NUMBER_float_m(self, engine):
         trio = """
 id: @test "test"
 test: 23.1m
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
-        assert ontology[Ref('@test')]['test'].kind == 23.1
+        assert ontology[Ref('@test')]['test'].kind.value == 23.1
         assert ontology[Ref('@test')]['test'].kind.unit == 'm'
 
-    def test_parse_NUMBER_INF(self):
+    def test_parse_NUMBER_INF(self, engine):
         trio = """
 id: @test "test"
 test: INF
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert isinf(ontology[Ref('@test')]['test'].kind.value)
 
-    def test_parse_NUMBER_minus_INF(self):
+    def test_parse_NUMBER_minus_INF(self, engine):
         trio = """
 id: @test "test"
 test: -INF
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert isinf(ontology[Ref('@test')]['test'].kind.value)
 
-    def test_parse_NUMBER_minus_Nan(self):
+    def test_parse_NUMBER_minus_Nan(self, engine):
         trio = """
 id: @test "test"
 test: NaN
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert isnan(ontology[Ref('@test')]['test'].kind.value)
 
-    def test_parse_str(self):
+    def test_parse_str(self, engine):
         trio = """
 id: @test "test"
 test: "A long string "
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == "A long string "
 
-    def test_parse_uri(self):
+    def test_parse_uri(self, engine):
         trio = """
 id: @test "test"
 test: `http://project-haystack.org/`
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref(
             '@test')]['test'].kind == "http://project-haystack.org/"
 
-    def test_parse_Symbol(self):
+    def test_parse_Symbol(self, engine):
         trio = """
 id: @test "test"
 test: ^elec-meter
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == "^elec-meter"
 
-    def test_parse_DATE(self):
+    def test_parse_DATE(self, engine):
         trio = """
 id: @test "test"
 test: 2020-07-17
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == "2020-07-17"
 
-    def test_parse_TIME(self):
+    def test_parse_TIME(self, engine):
         trio = """
 id: @test "test"
 test: 14:30:00
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == "14:30:00"
 
-    def test_parse_DateTime(self):
+    def test_parse_DateTime(self, engine):
         trio = """
 id: @test "test"
 test: 2020-07-17T16:55:42.977-04:00 New_York 
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind.city == "New_York"
         assert ontology[Ref('@test')]['test'].kind.value == datetime(2020, 7, 17, 16,
                                                                       55, 42, 977000, ZoneInfo('America/New_York'))
 
-    def test_parse_COORD(self):
+    def test_parse_COORD(self, engine):
         trio = """
 id: @test "test"
 test: C(37.5458266,-77.4491888) 
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind.lat == 37.5458266
         assert ontology[Ref('@test')]['test'].kind.lng == -77.4491888
 
-    def test_parse_XSTR(self):
+    def test_parse_XSTR(self, engine):
         trio = """
 id: @test "test"
 test: Color("red")
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind.value == "red"
         assert ontology[Ref('@test')]['test'].kind.type == "Color"
 
-    def test_parse_unquoted_str(self):
+    def test_parse_XSTR_text(self, engine):
+        trio = """
+id: @test "test"
+test: Span("2020-07-17 today")
+"""
+        ontology = parse(trio, engine)
+        assert ontology[Ref('@test')]['test'].kind.value == "2020-07-17 today"
+
+    def test_parse_unquoted_str(self, engine):
         trio = """
 id: @test "test"
 test2:  A long string 
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test2'].kind == "A long string"
 
-    def test_parse_marker_no_comma(self):
+    def test_parse_marker_no_comma(self, engine):
         trio = """
 id: @test "test"
 test2
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test2'].kind == Marker()
 
-    def test_parse_marker_multiline(self):
+    def test_parse_marker_multiline(self, engine):
         trio = """
 id: @test "test"
 test2:
@@ -220,14 +250,14 @@ test2:
     comment allez vous
 test
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test'].kind == Marker()
         assert ontology[Ref('@test')]['test2'].kind == """bonjour le monde
 comment allez vous
 """
 
-    def test_parse_entity(self):
+    def test_parse_entity(self, engine):
         trio = """
 id: @test "test"
 test2:  A long string 
@@ -235,31 +265,221 @@ test2:  A long string
 id: @test2 "test deux"
 mark
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test2'].kind == "A long string"
         assert ontology[Ref('@test2')]['mark'].kind == Marker()
 
-    def test_parse_list(self):
+    def test_parse_list(self, engine):
         trio = """
 id: @test "test"
 test2: ["aze",2,3]
 
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[0].id == Ref('@test')
         assert ontology[Ref('@test')]['test2'].kind.value[0] == "aze"
         assert ontology[Ref('@test')]['test2'].kind.value[1] == 2
         assert ontology[Ref('@test')]['test2'].kind.value[2] == 3
 
-    def test_parse_dict(self):
+    def test_parse_dict(self, engine):
         trio = """
 id: @test "test"
 test2:{test:"test", num:2.3 }
 
 """
-        ontology = parse(trio)
+        ontology = parse(trio, engine)
         assert ontology[Ref('@test')]['test2'].kind.toJson == {
             'test': {'_kind': 'str', 'val': 'test'},
             'num': {'_kind': 'number', 'val': 2.3}
         }
+
+
+class Test_engines():
+    trio = """
+id: @site "Main site"
+site
+area: 3702ft²
+geoCoord: C(37.5458266,-77.4491888)
+---
+id: @point1 "Point 1"
+point
+his: T
+writable: F
+curVal: 21.5°C
+hisMode: ^cov
+vendor: Acme Corp
+unquoted: T, F
+occupied: 08:00:00
+installed: 2020-07-17
+lastUpdate: 2020-07-17T16:55:42.977-04:00 New_York
+doc: `http://project-haystack.org/`
+color: Color("red")
+enum: ["off","on"]
+range: {min:0,max:40}
+summary:
+    first line
+    second line
+siteRef: @site
+"""
+
+    def test_same_ontology(self):
+        expected = parse(self.trio, 'earley').trio_dumper()
+        for engine in ENGINES:
+            assert parse(self.trio, engine).trio_dumper() == expected
+
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_id_is_a_ref(self, engine):
+        with pytest.raises(ParseError, match='id tag is always a Ref'):
+            parse('id: "test"\n', engine)
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match='Unknown engine cyk'):
+            parse(self.trio, 'cyk')
+
+    @pytest.mark.parametrize('value', [
+        '[1,2]x', '[]', '{}', '[1, [2]]', '{aa:[1,2]}', '"a" // c', '[1,2] // c'])
+    def test_same_unquoted_str(self, value):
+        trio = f"""
+id: @test
+test: {value}
+"""
+        for engine in ENGINES:
+            assert parse(trio, engine)[Ref('@test')]['test'].kind == value
+
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_dash_timezone(self, engine):
+        trio = """
+id: @test
+lastUpdate: 2020-07-17T16:55:42-04:00 Port-au-Prince
+"""
+        kind = parse(trio, engine)[Ref('@test')]['lastUpdate'].kind
+        assert kind.value.tzinfo == ZoneInfo('America/Port-au-Prince')
+        assert kind.toZinc == '2020-07-17T16:55:42-04:00 Port-au-Prince'
+
+    def test_comment_lines(self):
+        trio = """// header
+id: @test
+// a comment
+  // an indented comment
+summary:
+    // not a comment
+mark
+// last line"""
+        expected = parse(trio, 'scanner').trio_dumper()
+        assert parse(trio, 'scanner')[Ref('@test')]['summary'].kind == \
+            '// not a comment\n'
+        for engine in ENGINES:
+            assert parse(trio, engine).trio_dumper() == expected
+
+    def test_lalr_list_with_spaces(self):
+        trio = """
+id: @test
+test: [1, "two" ]
+"""
+        ontology = parse(trio, 'lalr')
+        assert ontology[Ref('@test')]['test'].kind.value[0] == 1
+        assert ontology[Ref('@test')]['test'].kind.value[1] == "two"
+
+
+class Test_iter_parse():
+    trio = """
+id: @test1 "test"
+mark
+---
+id: @test2
+str: "deux"
+---
+---
+id: @test3
+multi:
+    first
+    second
+"""
+
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_file(self, engine):
+        entities = list(iter_parse(io.StringIO(self.trio), engine))
+        assert [entity.id for entity in entities] == [
+            Ref('@test1'), Ref('@test2'), Ref('@test3')]
+        assert entities[0]['mark'].kind == Marker()
+        assert entities[2]['multi'].kind == "first\nsecond\n"
+
+    def test_is_lazy(self):
+        def lines():
+            yield 'id: @test1\n'
+            yield '---\n'
+            raise RuntimeError('read too far')
+
+        entities = iter_parse(lines(), 'scanner')
+        assert next(entities).id == Ref('@test1')
+        with pytest.raises(RuntimeError):
+            next(entities)
+
+    def test_feed_ontology(self):
+        myOntology = parse('id: @test0\n', 'scanner')
+        myOntology.extend(iter_parse(self.trio, 'scanner'))
+        assert len(myOntology) == 4
+        assert myOntology[Ref('@test2')]['str'].kind == "deux"
+        with pytest.raises(DuplicateEntity):
+            myOntology.extend(iter_parse('id: @test3\n', 'scanner'))
+
+
+class Test_parse_parallel():
+    trio = Test_iter_parse.trio
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_text(self, workers):
+        myOntology = parse_parallel(self.trio, workers, 'scanner', chunkSize=1)
+        assert myOntology.trio_dumper() == parse(
+            self.trio, 'scanner').trio_dumper()
+
+    def test_directory(self, tmp_path):
+        (tmp_path / 'a.trio').write_text(self.trio, encoding='utf-8')
+        (tmp_path / 'b.trio').write_text('id: @test4\nmark\n',
+                                         encoding='utf-8')
+        myOntology = parse_parallel(tmp_path, 2, 'lalr')
+        assert [entity.id.value for entity in myOntology] == [
+            '@test1', '@test2', '@test3', '@test4']
+        assert parse_parallel(tmp_path / 'b.trio', 1)[0].id == Ref('@test4')
+
+    def test_duplicate(self, tmp_path):
+        (tmp_path / 'a.trio').write_text(self.trio, encoding='utf-8')
+        (tmp_path / 'b.trio').write_text(self.trio, encoding='utf-8')
+        with pytest.raises(DuplicateEntity,
+                           match='Entity with ref @test1 already in ontology'):
+            parse_parallel(tmp_path, 2, 'scanner')
+
+    def test_one_line_text(self):
+        # a str is always Trio text, never a path
+        assert parse_parallel('id: @one', 1)[0].id == Ref('@one')
+        with pytest.raises(TypeError):
+            parse_parallel(b'id: @one', 1)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+class Test_lazy():
+    trio = Test_engines.trio
+
+    def test_same_ontology(self, engine):
+        assert parse(self.trio, engine, lazy=True).trio_dumper() == \
+            parse(self.trio, engine).trio_dumper()
+
+    def test_decoded_on_access(self, engine):
+        point = parse(self.trio, engine, lazy=True)[Ref('@point1')]
+        assert point['curVal']._value is None
+        assert point['installed']._value is None
+        assert point['curVal'].value == 21.5
+        assert point['curVal']._value is not None
+        assert point['curVal']._raw is None
+        assert point['installed']._value is None
+        assert point.id.displayname == 'Point 1'
+
+    def test_raw_is_text(self, engine):
+        point = parse(self.trio, engine, lazy=True)[Ref('@point1')]
+        # plain strings, no lark Token with its position
+        assert all(type(raw) is str for raw in point['installed']._raw[1:])
+
+    def test_parallel(self, engine):
+        myOntology = parse_parallel(self.trio, 2, engine, lazy=True)
+        assert myOntology.trio_dumper() == parse(self.trio, engine).trio_dumper()
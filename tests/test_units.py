@@ -1,6 +1,9 @@
+import pickle
 import pytest
-from haystackparser.unitDb import Unit
-from haystackparser.exception import UnitNotFound
+from haystackparser.kinds import Number
+from haystackparser.unitDb import Unit, conversion, convert
+from haystackparser.exception import IncompatibleUnits, UnitNotFound
+from haystackparser.zinc_units import getCanonical, getHaystackUnits
 
 def test_checkUnits():
     unit = Unit('Af')
@@ -20,6 +23,64 @@ def test_errorUnits():
     with pytest.raises(UnitNotFound, match='Unit Stroumph is not in haystack database'):
         Unit('Stroumph')
 
- 
 
- 
\ No newline at end of file
+def test_interned():
+    assert Unit('°C') is Unit('°C')
+    assert Unit('°C') is not Unit('celsius')
+    assert Unit('°C').canonical == Unit('celsius').canonical
+
+
+def test_shared_by_numbers():
+    assert Number(21.5, '°C').unit is Number(19.0, '°C').unit
+
+
+def test_pickle():
+    unit = Unit('kWh')
+    assert pickle.loads(pickle.dumps(unit)) is unit
+
+
+def test_immutable():
+    with pytest.raises(AttributeError):
+        Unit('kWh').symbol = 'Wh'
+
+
+def test_zinc_units():
+    assert getCanonical('°F') == 'fahrenheit'
+    assert getHaystackUnits('°F')['alias'] == ['°F']
+
+
+def test_convert():
+    assert convert(100.0, '°C', '°F') == pytest.approx(212.0)
+    assert convert(32.0, '°F', 'K') == pytest.approx(273.15)
+    assert convert([1.0, 2.5], 'MWh', 'kWh') == pytest.approx([1000.0, 2500.0])
+    assert convert(1.0, 'MMBTU', 'kWh') == pytest.approx(293.0144)
+    assert convert(50.0, '%', 'ppm') == pytest.approx(500000.0)
+
+
+def test_convert_numpy():
+    np = pytest.importorskip('numpy')
+    values = convert(np.array([0.0, 100.0]), Unit('°C'), 'K')
+    assert list(values) == pytest.approx([273.15, 373.15])
+
+
+def test_conversion_cached():
+    assert conversion('kWh', 'Wh') is conversion('kWh', 'Wh')
+
+
+@pytest.mark.parametrize('source, target', [
+    ('kWh', '°C'),
+    ('USD', 'EUR'),
+    ('%', 'USD'),
+])
+def test_convert_mismatch(source, target):
+    with pytest.raises(IncompatibleUnits, match='Cannot convert'):
+        convert(1.0, source, target)
+
+
+def test_number_to():
+    number = Number(20.0, '°C').to('°F')
+    assert number.value == pytest.approx(68.0)
+    assert number.unit.symbol == '°F'
+    assert Number(3.0, 'MWh').to(Unit('kWh')).toZinc == '3000.0kWh'
+    with pytest.raises(IncompatibleUnits, match='no unit'):
+        Number(3.0).to('kWh')
@@ -0,0 +1,120 @@
+import pytest
+from haystackparser.exception import ParseError
+from haystackparser.kinds import NA, Marker, Ref, XStr
+from haystackparser.ontology import Grid, Ontology
+from haystackparser.trio_parser import parse
+from haystackparser.zinc_parser import parse_zinc, parseRow
+
+zinc = """ver:"3.0" database:"test" dis:"Site Energy Summary"
+siteName dis:"Sites", val metaScalar:"a,b" metaMarker, flag, id
+"Site 1", 356.214kW, T, @site1 "Site, one"
+"Site 2", 463.028kW, , @site2
+"Site 3", INF, NA
+, -12, F, N
+"""
+
+
+class Test_parse_zinc:
+    def test_grid(self):
+        grid = parse_zinc(zinc)
+        assert grid._columns == ['siteName', 'val', 'flag', 'id']
+        assert len(grid._row) == 4
+        assert [kind.toZinc for kind in grid._row[0]] == [
+            '"Site 1"', '356.214kW', 'T', '@site1 "Site, one"']
+        assert grid._row[1][2] is None
+        assert grid._row[2][1].value == float('INF')
+        assert isinstance(grid._row[2][2], NA)
+        assert grid._row[2][3] is None
+        assert grid._row[3][0] is None and grid._row[3][3] is None
+        assert grid._row[3][1] == -12
+        assert grid._row[3][2].value is False
+
+    def test_ontology(self):
+        ontology = parse_zinc(zinc).toOntology()
+        assert len(ontology) == 4
+        site = ontology[Ref('@site1')]
+        assert [tag.name for tag in site.tags] == ['siteName', 'val', 'flag']
+        assert site['val'].kind.toZinc == '356.214kW'
+        assert 'flag' not in ontology[Ref('@site2')]
+
+    def test_round_trip(self):
+        ontology = parse("""
+id: @site
+site
+dis: "Site $1"
+area: 3702ft²
+geoCoord: C(37.5458266,-77.4491888)
+---
+id: @ahu
+equip
+siteRef: @site
+color: Color("red")
+enum: ["off","on"]
+range: {min:0,max:40}
+installed: 2020-07-17
+lastUpdate: 2020-07-17T16:55:12.977+02:00 Paris
+doc: `http://project-haystack.org/`
+""", 'scanner')
+        grid = Grid(ontology)
+        assert parse_zinc(grid.toZinc()).toOntology().trio_dumper() == \
+            ontology.trio_dumper()
+        empty = parse_zinc(Grid(Ontology()).toZinc())
+        assert empty._columns == [] and empty._row == []
+        assert len(empty.toOntology()) == 0
+
+    def test_collections(self):
+        row = parseRow('[1, "two", @three], {min:1 ok, dis:"x"}, M', 3)
+        assert row[0].toZinc == '[1.0, "two", @three]'
+        assert row[1].toZinc == '{min:1.0, ok:M, dis:"x"}'
+        assert isinstance(row[2], Marker)
+        assert isinstance(parseRow('Color("red")', 1)[0], XStr)
+        assert parseRow('C(1.5,2.5)', 1)[0].toZinc == 'C(1.5,2.5)'
+
+    @pytest.mark.parametrize('cell, text', [
+        (r'"x\ny"', 'x\ny'),
+        (r'"a \"b\""', 'a "b"'),
+        (r'"c:\\temp"', 'c:\\temp'),
+        (r'"\u00e9t\u00E9"', 'été'),
+        (r'"\b\f\r\t"', '\b\f\r\t'),
+        (r'"Site \$1"', 'Site $1'),
+        (r'"\\$"', '\\$'),
+    ])
+    def test_unescape_str(self, cell, text):
+        grid = parse_zinc(f'ver:"3.0"\na,b\n{cell},1\n')
+        assert grid._row[0][0].value == text
+
+    def test_unescape_ref_xstr(self):
+        row = parseRow(r'@a "Site \"A\"\n", Color("r\u00e9d")', 2)
+        assert row[0].value == '@a'
+        assert row[0].displayname == 'Site "A"\n'
+        assert row[1].value == 'réd'
+
+    def test_invalid_escape(self):
+        with pytest.raises(ParseError):
+            parse_zinc('ver:"3.0"\na\n"\\q"\n')
+
+    def test_dash_timezone(self):
+        row = parseRow('2020-07-17T16:55:42-04:00 Port-au-Prince, '
+                       '2020-07-17T16:55:42-04:00 Blanc-Sablon', 2)
+        assert [kind.toZinc for kind in row] == [
+            '2020-07-17T16:55:42-04:00 Port-au-Prince',
+            '2020-07-17T16:55:42-04:00 Blanc-Sablon']
+
+    def test_empty_grid(self):
+        grid = parse_zinc('ver:"3.0"\nempty\n')
+        assert grid._columns == []
+        assert grid._row == []
+
+    @pytest.mark.parametrize('text', [
+        'ver:"1.0"\na\n',
+        'ver:"3.0"\na, a\n',
+        'ver:"3.0"\na, B\n',
+        'ver:"3.0"\na\n1, 2\n',
+        'ver:"3.0"\na\n[1, 2\n',
+        'ver:"3.0"\na\n{b:}\n',
+        'ver:"3.0"\na\n<<\n',
+        'ver:"3.0"\na\n1 2\n',
+    ])
+    def test_malformed(self, text):
+        with pytest.raises(ParseError):
+            parse_zinc(text)
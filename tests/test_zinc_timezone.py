@@ -1,7 +1,10 @@
+from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 import pytest
-from haystackparser.exception import TimeZoneNotFound
-from haystackparser.zinc_datetime import _loadTz, getHaystackTz
+from haystackparser.exception import ParseError, TimeZoneNotFound
+from haystackparser import zinc_datetime
+from haystackparser.kinds import HaystackDateTime
+from haystackparser.zinc_datetime import _loadTz, getHaystackTz, haystackCity, parse_date, parse_datetime, parse_time
 
 
 def test_loadTzParis():
@@ -11,4 +14,103 @@ def test_loadTzParis():
 def test_loadTzMars():
     with pytest.raises(TimeZoneNotFound, 
         match='Timezone Mars not found'):
-        getHaystackTz('Mars')
\ No newline at end of file
+        getHaystackTz('Mars')
+
+def test_loadTzRegion():
+    # the Haystack regions win over the legacy aliases
+    assert getHaystackTz('UTC') == ZoneInfo('Etc/UTC')
+    assert getHaystackTz('GMT+5') == ZoneInfo('Etc/GMT+5')
+    assert getHaystackTz('Paris') is getHaystackTz('Paris')
+
+@pytest.mark.parametrize('tz, city', [
+    (ZoneInfo('Europe/Paris'), 'Paris'),
+    (ZoneInfo('America/Argentina/Buenos_Aires'), 'Buenos_Aires'),
+    (ZoneInfo('Etc/GMT-3'), 'GMT-3'),
+    (ZoneInfo('GMT0'), 'GMT0'),
+    # links which own city is another zone
+    (ZoneInfo('US/Eastern'), 'New_York'),
+    (ZoneInfo('Brazil/West'), 'Manaus'),
+    (ZoneInfo('Canada/Eastern'), 'Eastern'),
+    (timezone.utc, 'UTC'),
+    (None, None),
+])
+def test_haystackCity(tz, city):
+    assert haystackCity(tz) == city
+
+
+@pytest.mark.parametrize('name', ['localtime', 'Factory', 'posixrules'])
+def test_loadTzNonZone(name):
+    with pytest.raises(TimeZoneNotFound):
+        getHaystackTz(name)
+
+def test_round_trip_link():
+    value = HaystackDateTime(datetime(2020, 7, 17, 16, 55, 42,
+                                      tzinfo=ZoneInfo('US/Eastern')))
+    assert value.toZinc == '2020-07-17T16:55:42-04:00 New_York'
+    parsed = parse_datetime(value.toZinc)
+    assert parsed == value.value
+    assert parsed.tzinfo == ZoneInfo('America/New_York')
+
+def test_haystackCity_missing(monkeypatch):
+    # zones of a tzdata newer than the table
+    getHaystackTz('Paris')
+    monkeypatch.delitem(zinc_datetime.tz_cities, 'US/Eastern')
+    monkeypatch.delitem(zinc_datetime.tz_cities, 'Europe/Paris')
+    zinc_datetime._linkCity.cache_clear()
+    assert haystackCity(ZoneInfo('US/Eastern')) == 'New_York'
+    assert haystackCity(ZoneInfo('Europe/Paris')) == 'Paris'
+    monkeypatch.setattr(zinc_datetime, 'tzifData', lambda zone: None)
+    with pytest.raises(TimeZoneNotFound):
+        zinc_datetime._linkCity('America/Atlantis')
+    zinc_datetime._linkCity.cache_clear()
+
+class Test_parse:
+    def test_date(self):
+        assert parse_date('2020-07-17') == date(2020, 7, 17)
+
+    @pytest.mark.parametrize('text, microsecond', [
+        ('16:55:42', 0),
+        ('16:55:42.9', 900000),
+        ('16:55:42.977', 977000),
+        ('16:55:42.977123456', 977123),
+    ])
+    def test_time(self, text, microsecond):
+        assert parse_time(text) == time(16, 55, 42, microsecond)
+
+    def test_datetime_utc(self):
+        value = parse_datetime('2020-07-17T16:55:42Z UTC')
+        assert value == datetime(2020, 7, 17, 16, 55, 42, tzinfo=timezone.utc)
+        assert value.utcoffset() == timedelta(0)
+
+    def test_datetime_offset(self):
+        value = parse_datetime('2020-07-17T16:55:42.5+02:00')
+        assert value.tzinfo == timezone(timedelta(hours=2))
+        assert value.microsecond == 500000
+
+    def test_datetime_zone(self):
+        value = parse_datetime('2020-07-17T16:55:42.977+02:00 Paris')
+        assert value.tzinfo == ZoneInfo('Europe/Paris')
+        assert value.utcoffset() == timedelta(hours=2)
+
+    def test_datetime_gmt(self):
+        # Etc/GMT+5 is five hours behind UTC
+        value = parse_datetime('2020-07-17T16:55:42-05:00 GMT+5')
+        assert value.tzinfo == ZoneInfo('Etc/GMT+5')
+        assert value.utcoffset() == timedelta(hours=-5)
+
+    def test_datetime_fold(self):
+        first = parse_datetime('2022-10-30T02:30:00+02:00 Paris')
+        second = parse_datetime('2022-10-30T02:30:00+01:00 Paris')
+        assert (first.fold, second.fold) == (0, 1)
+        assert second - first == timedelta(0)
+        assert second.astimezone(timezone.utc) - first.astimezone(timezone.utc) \
+            == timedelta(hours=1)
+
+    @pytest.mark.parametrize('parse, text', [
+        (parse_date, '2020-13-17'),
+        (parse_time, '25:00:00'),
+        (parse_datetime, 'today'),
+    ])
+    def test_malformed(self, parse, text):
+        with pytest.raises(ParseError, match=f'Malformed .* {text}'):
+            parse(text)
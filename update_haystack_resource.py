@@ -1,2 +1,60 @@
+from pathlib import Path
+from zoneinfo import available_timezones
+
+from haystackparser.zinc_datetime import tzifData
+
 UNIT_DATABASE = 'https://raw.githubusercontent.com/fantom-lang/fantom/master/etc/sys/units.txt'
+TIMEZONES = Path(__file__).parent / 'haystackparser' / 'resources' / 'timezones.txt'
+
+# regions of the Haystack timezone names, a city of one of them wins over a
+# legacy alias of the same name (Eastern of US/Eastern...)
+HAYSTACK_REGIONS = ('Africa', 'America', 'Antarctica', 'Arctic', 'Asia',
+                    'Atlantic', 'Australia', 'Etc', 'Europe', 'Indian',
+                    'Pacific')
+# files of the tz database that are not zones, or depend on the host
+NON_ZONES = ('Factory', 'localtime', 'posixrules')
+
+
+def _priority(zone: str):
+    parts = zone.split('/')
+    return (parts[0] not in HAYSTACK_REGIONS, len(parts), zone)
+
+
+def update_timezones(path: Path = TIMEZONES) -> None:
+    """Write the Haystack city name -> IANA zone table of the installed
+    tzdata, one "city,zone" per line.
+
+    The first row of a city is the zone it parses to. A zone whose own city
+    parses to other rules (US/Eastern, Eastern being Canada/Eastern) follows
+    in the rows of the city of the zone it is a link to (New_York)"""
+    zones = sorted((zone for zone in available_timezones()
+                    if zone not in NON_ZONES
+                    and not zone.startswith(('posix/', 'right/'))),
+                   key=_priority)
+    cities = {}
+    for zone in zones:
+        cities.setdefault(zone.split('/')[-1], zone)
+    # city of the zones which own city parses back to them, by TZif data
+    linkCities = {}
+    for zone in zones:
+        city = zone.split('/')[-1]
+        if cities[city] == zone:
+            linkCities.setdefault(tzifData(zone), city)
+    rows = [(city, 0, zone) for city, zone in cities.items()]
+    for zone in zones:
+        city = zone.split('/')[-1]
+        if cities[city] == zone:
+            continue
+        if tzifData(cities[city]) != tzifData(zone):
+            city = linkCities.get(tzifData(zone))
+        if city is not None:
+            rows.append((city, 1, zone))
+    with path.open('w', encoding='utf-8') as table:
+        table.write('// Haystack timezone name,IANA zone\n'
+                    '// generated by update_haystack_resource.py\n')
+        for city, _link, zone in sorted(rows):
+            table.write(f'{city},{zone}\n')
+
 
+if __name__ == '__main__':
+    update_timezones()